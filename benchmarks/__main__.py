@@ -0,0 +1,108 @@
+"""Measure pydobe against a mock panel
+
+python -m benchmarks
+python -m benchmarks item_names snapshot --items 5000 --latency 0.005
+python -m benchmarks --check benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.measure import (
+    ProjectOptions,
+    format_report,
+    make_baseline,
+    measure,
+    regressions,
+)
+from benchmarks.scenarios import SCENARIOS
+
+
+def main(arguments: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Measure pydobe against a mock panel"
+    )
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run, all by default")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--layers", type=int, default=20, help="layers per composition")
+    parser.add_argument(
+        "--properties", type=int, default=5, help="properties per layer"
+    )
+    parser.add_argument("--folders", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.001, help="seconds added to every request"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument(
+        "--check",
+        metavar="BASELINE",
+        help="fail if a scenario sends more requests than in the baseline",
+    )
+    parser.add_argument(
+        "--save", metavar="BASELINE", help="save the request counts as a baseline"
+    )
+    parser.add_argument("--list", action="store_true", help="list the scenarios")
+    options = parser.parse_args(arguments)
+
+    if options.list:
+        for scenario in SCENARIOS.values():
+            print(f"{scenario.name:<24}{scenario.description}")
+        return 0
+
+    project_options = ProjectOptions(
+        options.items,
+        options.layers,
+        options.properties,
+        options.folders,
+        options.latency,
+    )
+    names = options.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}, see --list")
+    measurements = []
+    for name in names:
+        measurements.append(measure(SCENARIOS[name], project_options, options.repeat))
+        if not options.json:
+            print(f"{name} done", file=sys.stderr)
+
+    if options.json:
+        print(
+            json.dumps(
+                {
+                    "options": project_options.as_dict(),
+                    "results": [measurement.as_dict() for measurement in measurements],
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(format_report(measurements))
+
+    if options.save:
+        with open(options.save, "w") as file:
+            json.dump(make_baseline(measurements, project_options), file, indent=2)
+            file.write("\n")
+
+    if options.check:
+        with open(options.check) as file:
+            baseline = json.load(file)
+        if baseline["project"] != project_options.project_size():
+            print(
+                f"The baseline was measured on another project: {baseline['project']}",
+                file=sys.stderr,
+            )
+            return 2
+        found = regressions(measurements, baseline)
+        if found:
+            print("More requests than in the baseline:", file=sys.stderr)
+            for description in found:
+                print(f"  {description}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
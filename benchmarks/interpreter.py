@@ -0,0 +1,289 @@
+"""Interpreter for the subset of ExtendScript sent by pydobe.
+
+Scripts are sequences of statements made of literals, variables, attribute and index lookups,
+function calls, constructors and assignments, which covers every line built by pydobe and the calls to its library.
+The value of the last expression is the result of the script"""
+
+import json
+import math
+import re
+
+
+class _Undefined(object):
+    def __repr__(self) -> str:
+        return "undefined"
+
+
+UNDEFINED = _Undefined()
+
+
+class ScriptError(Exception):
+    """Error raised within a script, returned to pydobe as an ExtendScript error"""
+
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    \s+
+    | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<name>[A-Za-z_$][\w$]*)
+    | (?P<punctuation>[.\[\](){},;:=-])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_CONSTANTS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "undefined": UNDEFINED,
+    "NaN": math.nan,
+    "Infinity": math.inf,
+}
+
+
+def tokenize(code: str) -> list:
+    tokens = []
+    position = 0
+    while position < len(code):
+        match = _TOKEN_PATTERN.match(code, position)
+        if match is None:
+            raise ScriptError(f"Unexpected character {code[position]!r} at {position}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        text = match.group(kind)
+        if kind == "string":
+            tokens.append(("value", _decode_string(text)))
+        elif kind == "number":
+            number = float(text)
+            tokens.append(("value", int(number) if number.is_integer() else number))
+        elif kind == "name" and text in _CONSTANTS:
+            tokens.append(("value", _CONSTANTS[text]))
+        else:
+            tokens.append((kind, text))
+    return tokens
+
+
+def _decode_string(text: str) -> str:
+    if text[0] == "'":
+        text = '"' + text[1:-1].replace("\\'", "'").replace('"', '\\"') + '"'
+    return json.loads(text)
+
+
+def js_string(value) -> str:
+    """The value converted to a string, as String(value) does"""
+    if value is None:
+        return "null"
+    if value is UNDEFINED:
+        return "undefined"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, (int, str)):
+        return str(value)
+    if isinstance(value, list):
+        return ",".join(
+            "" if item is None or item is UNDEFINED else js_string(item)
+            for item in value
+        )
+    return "[object Object]"
+
+
+class Scope(object):
+    """Variables of the scripts, global ones being kept from one script to the next"""
+
+    def __init__(self, variables: dict):
+        self.variables = variables
+
+
+class _Value(object):
+    """Base of a reference which is a plain value"""
+
+
+_VALUE = _Value()
+
+
+class Interpreter(object):
+    def __init__(self, variables: dict):
+        self.scope = Scope(variables)
+        self._tokens = []
+        self._position = 0
+
+    def run(self, code: str):
+        """Run the script, returning the value of its last expression"""
+        tokens, position = self._tokens, self._position
+        self._tokens, self._position = tokenize(code), 0
+        try:
+            result = UNDEFINED
+            while self._peek() is not None:
+                if self._accept("punctuation", ";"):
+                    continue
+                if self._accept("name", "var"):
+                    name = self._expect("name")
+                    value = UNDEFINED
+                    if self._accept("punctuation", "="):
+                        value = self._expression()
+                    self.scope.variables[name] = value
+                else:
+                    result = self._expression()
+            return result
+        finally:
+            self._tokens, self._position = tokens, position
+
+    # PARSING
+
+    def _peek(self):
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return None
+
+    def _accept(self, kind: str, text=None) -> bool:
+        token = self._peek()
+        if (
+            token is not None
+            and token[0] == kind
+            and (text is None or token[1] == text)
+        ):
+            self._position += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, text=None):
+        token = self._peek()
+        if token is None or token[0] != kind or (text is not None and token[1] != text):
+            raise ScriptError(f"Expected {text or kind}, found {token}")
+        self._position += 1
+        return token[1]
+
+    def _expression(self):
+        base, key = self._postfix()
+        if self._accept("punctuation", "="):
+            value = self._expression()
+            if base is _VALUE:
+                raise ScriptError("Invalid assignment")
+            set_member(base, key, value)
+            return value
+        return self._resolve(base, key)
+
+    def _postfix(self) -> tuple:
+        base, key = self._primary()
+        while True:
+            if self._accept("punctuation", "."):
+                base, key = self._resolve(base, key), self._expect("name")
+            elif self._accept("punctuation", "["):
+                owner = self._resolve(base, key)
+                base, key = owner, self._expression()
+                self._expect("punctuation", "]")
+            elif self._accept("punctuation", "("):
+                function = self._resolve(base, key)
+                arguments = self._list(")")
+                if not callable(function):
+                    raise ScriptError(f"{js_string(key)} is not a function")
+                try:
+                    base, key = _VALUE, function(*arguments)
+                except ScriptError:
+                    raise
+                except Exception as error:
+                    raise ScriptError(str(error)) from error
+            else:
+                return base, key
+
+    def _primary(self) -> tuple:
+        token = self._peek()
+        if token is None:
+            raise ScriptError("Unexpected end of script")
+        self._position += 1
+        kind, text = token
+        if kind == "value":
+            return _VALUE, text
+        if kind == "name":
+            if text == "new":
+                # constructors are Python classes, called as any function
+                return self._primary()
+            return self.scope, text
+        if text == "[":
+            return _VALUE, self._list("]")
+        if text == "{":
+            members = {}
+            while not self._accept("punctuation", "}"):
+                name_token = self._peek()
+                self._position += 1
+                self._expect("punctuation", ":")
+                members[str(name_token[1])] = self._expression()
+                self._accept("punctuation", ",")
+            return _VALUE, members
+        if text == "(":
+            value = self._expression()
+            self._expect("punctuation", ")")
+            return _VALUE, value
+        if text == "-":
+            return _VALUE, -self._resolve(*self._primary())
+        raise ScriptError(f"Unexpected {text!r}")
+
+    def _list(self, closing: str) -> list:
+        values = []
+        while not self._accept("punctuation", closing):
+            values.append(self._expression())
+            self._accept("punctuation", ",")
+        return values
+
+    @staticmethod
+    def _resolve(base, key):
+        if base is _VALUE:
+            return key
+        return get_member(base, key)
+
+
+def get_member(owner, key):
+    """The attribute or element of an ExtendScript value"""
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(owner, Scope):
+        if key not in owner.variables:
+            raise ScriptError(f"{key} is undefined")
+        return owner.variables[key]
+    if owner is None or owner is UNDEFINED:
+        raise ScriptError(f"{js_string(owner)} is not an object")
+    if isinstance(owner, (list, str)):
+        if key == "length":
+            return len(owner)
+        if isinstance(key, int) and 0 <= key < len(owner):
+            return owner[key]
+        return UNDEFINED
+    if isinstance(owner, dict):
+        return owner.get(js_string(key), UNDEFINED)
+    if hasattr(owner, "_element") and isinstance(key, int):
+        return owner._element(key)
+    if hasattr(owner, "_get"):
+        try:
+            return owner._get(js_string(key))
+        except AttributeError:
+            return UNDEFINED
+    return UNDEFINED
+
+
+def set_member(owner, key, value):
+    """Assign the attribute or element of an ExtendScript value"""
+    if isinstance(owner, Scope):
+        owner.variables[key] = value
+    elif isinstance(owner, dict):
+        owner[js_string(key)] = value
+    elif isinstance(owner, list) and isinstance(key, int):
+        owner.extend([UNDEFINED] * (key + 1 - len(owner)))
+        owner[key] = value
+    elif hasattr(owner, "_set"):
+        try:
+            owner._set(js_string(key), value)
+        except AttributeError as error:
+            raise ScriptError(str(error)) from None
+    else:
+        raise ScriptError(f"Unable to set {key} of {js_string(owner)}")
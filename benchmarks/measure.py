@@ -0,0 +1,138 @@
+"""Run scenarios against a mock panel, counting the requests sent and the time taken"""
+
+import statistics
+import time
+
+from benchmarks.mock_panel import MockPanel
+from benchmarks.model import build_project
+from pydobe.after_effects.objects.root import Root
+from pydobe.core import Connection
+
+
+class ProjectOptions(object):
+    """Size of the synthetic project and latency of the mock panel"""
+
+    __slots__ = ("items", "layers", "properties", "folders", "latency")
+
+    def __init__(
+        self,
+        items: int = 1000,
+        layers: int = 20,
+        properties: int = 5,
+        folders: int = 10,
+        latency: float = 0.001,
+    ):
+        self.items = items
+        self.layers = layers
+        self.properties = properties
+        self.folders = folders
+        self.latency = latency
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def project_size(self) -> dict:
+        """The options changing the number of requests, the latency only changing the time taken"""
+        values = self.as_dict()
+        del values["latency"]
+        return values
+
+
+class Measurement(object):
+    """Requests sent and time taken by a scenario, the time being the median of its runs"""
+
+    __slots__ = ("name", "round_trips", "bytes_sent", "bytes_received", "times")
+
+    def __init__(
+        self,
+        name: str,
+        round_trips: int,
+        bytes_sent: int,
+        bytes_received: int,
+        times: list,
+    ):
+        self.name = name
+        self.round_trips = round_trips
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.times = times
+
+    def __repr__(self) -> str:
+        return f"<Measurement {self.name} {self.round_trips} round trips in {self.wall_time * 1000:.1f}ms>"
+
+    @property
+    def wall_time(self) -> float:
+        return statistics.median(self.times)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "round_trips": self.round_trips,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "wall_time": self.wall_time,
+            "times": self.times,
+        }
+
+
+def measure(scenario, options: ProjectOptions = None, repeat: int = 3) -> Measurement:
+    """Run the scenario `repeat` times, each time on a new project and panel"""
+    options = options or ProjectOptions()
+    times = []
+    for _ in range(repeat):
+        project = build_project(
+            options.items, options.layers, options.properties, options.folders
+        )
+        with MockPanel(project, options.latency) as panel:
+            connection = Connection(port=panel.port)
+            try:
+                arguments = scenario.setup(Root(connection).app.project)
+                panel.reset_stats()
+                started = time.perf_counter()
+                scenario.run(arguments)
+                times.append(time.perf_counter() - started)
+                stats = panel.stats
+            finally:
+                connection.close()
+    return Measurement(
+        scenario.name, stats.requests, stats.bytes_received, stats.bytes_sent, times
+    )
+
+
+def regressions(measurements: list, baseline: dict) -> list:
+    """Descriptions of the scenarios sending more requests than in the baseline"""
+    expected = baseline["round_trips"]
+    found = []
+    for measurement in measurements:
+        limit = expected.get(measurement.name)
+        if limit is not None and measurement.round_trips > limit:
+            found.append(
+                f"{measurement.name}: {measurement.round_trips} round trips, {limit} expected"
+            )
+    return found
+
+
+def make_baseline(measurements: list, options: ProjectOptions) -> dict:
+    """The request counts to check later runs against, along with the size of the project"""
+    return {
+        "project": options.project_size(),
+        "round_trips": {
+            measurement.name: measurement.round_trips for measurement in measurements
+        },
+    }
+
+
+def format_report(measurements: list) -> str:
+    """Table of the measurements"""
+    lines = [
+        f"{'scenario':<24}{'round trips':>12}{'sent KB':>10}{'received KB':>13}{'wall ms':>10}"
+    ]
+    for measurement in measurements:
+        lines.append(
+            f"{measurement.name:<24}"
+            f"{measurement.round_trips:>12}"
+            f"{measurement.bytes_sent / 1024:>10.1f}"
+            f"{measurement.bytes_received / 1024:>13.1f}"
+            f"{measurement.wall_time * 1000:>10.1f}"
+        )
+    return "\n".join(lines)
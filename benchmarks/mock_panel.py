@@ -0,0 +1,555 @@
+"""Local stand-in for the pydobe panel, serving a synthetic project.
+
+The panel answers the requests sent by pydobe as the CEP panel does: scripts are run against
+the synthetic project, objects are stored in the $._pydobe registry under generated ids, and the
+functions of the library installed by pydobe are answered by Python rewrites, the lib_* methods:
+the ExtendScript sources of the library are never run.
+Every request can be delayed to reproduce the latency of After Effects"""
+
+import json
+import math
+import random
+import re
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.interpreter import (
+    UNDEFINED,
+    Interpreter,
+    ScriptError,
+    js_string,
+)
+from benchmarks.model import (
+    Application,
+    CompItem,
+    File,
+    ImportOptions,
+    Node,
+    Project,
+    PropertyGroup,
+    build_project,
+)
+from pydobe.library import LIBRARY_MISSING
+
+_TRY_PATTERN = re.compile(r"^try\{\n(?P<code>.*)\n\}catch\(e\)\{.*\}$", re.DOTALL)
+_GUARD_PATTERN = re.compile(
+    r"^if\((?P<guard>[^\n]*)\)\{\"[^\"]*\"\}else\{\n(?P<code>.*)\n\}$", re.DOTALL
+)
+_VERSION_PATTERN = re.compile(r"'(\w+)'")
+_INSTALL_PATTERN = re.compile(
+    r"^\$\._pydobe\.lib = \{\n(?P<functions>.*)\n\};", re.DOTALL
+)
+_FUNCTION_NAME_PATTERN = re.compile(r'^"(\w+)": ', re.MULTILINE)
+
+
+class PanelStats(object):
+    """Requests answered by the panel"""
+
+    __slots__ = ("requests", "pings", "bytes_received", "bytes_sent", "installs")
+
+    def __init__(self):
+        self.requests = 0
+        self.pings = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.installs = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Registry(Node):
+    """The $._pydobe object"""
+
+    type_name = "Object"
+
+    def __init__(self, panel):
+        super().__init__(None)
+        self._panel = panel
+
+    def _get(self, name: str):
+        panel = self._panel
+        if name == "lib":
+            return panel.library if panel.library_version is not None else UNDEFINED
+        if name == "generateId":
+            return panel.generate_id
+        if name == "hasOwnProperty":
+            return lambda key: key in panel.handles
+        return panel.handles.get(name, UNDEFINED)
+
+    def _set(self, name: str, value):
+        self._panel.handles[name] = value
+
+
+class _Library(Node):
+    """The $._pydobe.lib object, the functions installed by pydobe"""
+
+    def __init__(self, panel):
+        super().__init__(None)
+        self._panel = panel
+
+    def _get(self, name: str):
+        panel = self._panel
+        if name == "version":
+            return panel.library_version
+        if name not in panel.library_functions:
+            return UNDEFINED
+        return getattr(panel, f"lib_{name}", None) or UNDEFINED
+
+
+class _Dollar(Node):
+    """The $ object"""
+
+    def __init__(self, registry: _Registry):
+        super().__init__(None)
+        self._pydobe = registry
+
+    def _get(self, name: str):
+        return self._pydobe if name == "_pydobe" else UNDEFINED
+
+
+class MockPanel(object):
+    """Serve the project over HTTP as the pydobe panel does, on a free port unless given one
+
+    with MockPanel(build_project(items=500), latency=0.005) as panel:
+        root = Root(Connection(port=panel.port))
+    """
+
+    def __init__(
+        self,
+        project: Project = None,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.project = project if project is not None else build_project()
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.stats = PanelStats()
+        self.handles = {}
+        self.identities = {}
+        self.identity_keys = {}
+        self.library_version = None
+        self.library_functions = set()
+        self.library = _Library(self)
+        self.interpreter = Interpreter(
+            {
+                "app": Application(self.project),
+                "$": _Dollar(_Registry(self)),
+                "File": File,
+                "ImportOptions": ImportOptions,
+            }
+        )
+        # ExtendScript runs one script at a time
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        panel = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.panel = panel
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=f"mock-panel-{self.port}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_stats(self):
+        self.stats = PanelStats()
+
+    def open_project(self, project: Project):
+        """Replace the project, as opening a project in After Effects does"""
+        with self._lock:
+            self.project = project
+            self.interpreter.scope.variables["app"] = Application(project)
+
+    # EVALUATION
+
+    def evaluate(self, to_eval: str) -> str:
+        """Run the script sent by pydobe, returning the text the panel would send back"""
+        with self._lock:
+            if self.latency:
+                time.sleep(self.latency)
+            match = _TRY_PATTERN.match(to_eval)
+            code = match.group("code") if match else to_eval
+            try:
+                install = _INSTALL_PATTERN.match(code)
+                if install:
+                    return self._install(code, install.group("functions"))
+                guard = _GUARD_PATTERN.match(code)
+                if guard:
+                    version = _VERSION_PATTERN.search(guard.group("guard"))
+                    if version is None or version.group(1) != self.library_version:
+                        return LIBRARY_MISSING
+                    code = guard.group("code")
+                return js_string(self.interpreter.run(code))
+            except ScriptError as error:
+                return error_text(error)
+
+    def _install(self, code: str, functions: str) -> str:
+        self.stats.installs += 1
+        self.library_functions = set(_FUNCTION_NAME_PATTERN.findall(functions))
+        self.library_version = _VERSION_PATTERN.findall(code)[-1]
+        return self.library_version
+
+    def generate_id(self) -> str:
+        characters = string.ascii_letters + string.digits
+        return "".join(random.choice(characters) for _ in range(10))
+
+    # LIBRARY
+
+    def lib_isLayer(self, name: str) -> bool:
+        return "Layer" in name and name != "LayerCollection"
+
+    def lib_identity(self, value):
+        return value._identity() if isinstance(value, Node) else None
+
+    def lib_register(self, value) -> str:
+        key = self.lib_identity(value)
+        if key is not None:
+            known_id = self.identities.get(key)
+            if known_id is not None and self.handles.get(known_id) is value:
+                return known_id
+        pydobe_id = self.generate_id()
+        self.handles[pydobe_id] = value
+        if key is not None:
+            self.identities[key] = pydobe_id
+            self.identity_keys[pydobe_id] = key
+        return pydobe_id
+
+    def lib_serialise(self, value, expand, element=False):
+        if isinstance(value, (Node, list, dict)):
+            if expand and isinstance(value, list):
+                items = [self.lib_serialise(item, True, True) for item in value]
+                return '{"isArray": true, "items": [' + ",".join(items) + "]}"
+            object_type = value.type_name if isinstance(value, Node) else "Object"
+            return json.dumps(
+                {
+                    "isObject": True,
+                    "objectType": object_type,
+                    "pydobeId": self.lib_register(value),
+                }
+            )
+        return json.dumps(js_string(value)) if element else value
+
+    def lib_batch(self, codes: list, expands: list) -> str:
+        results = []
+        for code, expand in zip(codes, expands):
+            try:
+                value = self.interpreter.run(code)
+                if expand is not None:
+                    value = self.lib_serialise(value, expand, False)
+                results.append(json.dumps(js_string(value)))
+            except ScriptError as error:
+                results.append(json.dumps(error_text(error)))
+        return "[" + ",".join(results) + "]"
+
+    def lib_release(self, ids: list):
+        for pydobe_id in ids:
+            self.handles.pop(pydobe_id, None)
+            key = self.identity_keys.pop(pydobe_id, None)
+            if key is not None:
+                self.identities.pop(key, None)
+        return UNDEFINED
+
+    def lib_slice(
+        self,
+        collection,
+        length_property,
+        offset,
+        start,
+        stop,
+        step,
+        expected_length,
+        with_length,
+    ):
+        length = collection._get(length_property)
+        if expected_length is not None and length != expected_length:
+            return "changed"
+        indices = range(length)[slice(start, stop, step)]
+        elements = [collection._element(index + offset) for index in indices]
+        return [length] + elements if with_length else elements
+
+    def lib_query(self, items, object_types, name_pattern, label) -> list:
+        pattern = re.compile(name_pattern) if name_pattern is not None else None
+        result = []
+        for index in range(1, items.length + 1):
+            item = items._element(index)
+            if object_types is not None and item.type_name not in object_types:
+                continue
+            if label is not None and item.label != label:
+                continue
+            if pattern is not None and not pattern.search(item.name):
+                continue
+            result.append(item)
+        return result
+
+    def lib_projectKey(self, project: Project) -> str:
+        if not hasattr(project, "_pydobe_token"):
+            project._pydobe_token = f"{time.time()}:{random.random()}"
+        path = "" if project.file is None else project.file
+        return f"{path}|{project._pydobe_token}"
+
+    def lib_index(self, project: Project) -> str:
+        rows = [
+            [item.id, item.name, item.parentFolder.id, item.type_name]
+            for item in project._items
+        ]
+        return json.dumps(
+            {
+                "key": self.lib_projectKey(project),
+                "revision": project.revision,
+                "rootId": project.rootFolder.id,
+                "items": rows,
+            }
+        )
+
+    def lib_lookup(self, project: Project, key: str, revision: int, ids: list):
+        if self.lib_projectKey(project) != key or project.revision != revision:
+            return "stale"
+        return [project.itemByID(item_id) for item_id in ids]
+
+    def lib_addLayers(self, layers, specs: list) -> list:
+        results = []
+        created = []
+        for spec in specs:
+            layer = None
+            try:
+                kind = spec["kind"]
+                if kind == "item":
+                    layer = layers.add(spec["item"], spec["duration"])
+                elif kind == "solid":
+                    layer = layers.addSolid(
+                        spec["color"],
+                        spec["name"],
+                        spec["width"],
+                        spec["height"],
+                        spec["pixelAspect"],
+                        spec["duration"],
+                    )
+                elif kind == "null":
+                    layer = layers.addNull(spec["duration"])
+                elif kind == "text":
+                    layer = layers.addText(spec["text"])
+                else:
+                    layer = layers.addShape()
+                for name, value in spec["attributes"]:
+                    layer._set(name, value)
+                created.append(len(results))
+                results.append(layer)
+            except AttributeError as error:
+                if layer is not None:
+                    layer.remove()
+                results.append(str(error))
+        if len(created) < len(results):
+            for index in reversed(created):
+                results[index].remove()
+                results[index] = None
+        return results
+
+    def lib_keyframes(self, prop) -> str:
+        current = prop.value
+        if not isinstance(current, (int, float, list)):
+            raise ScriptError(f"{prop.name} does not hold numeric values")
+        values = []
+        for _, value in prop._keys:
+            values.extend(value if isinstance(value, list) else [value])
+        return json.dumps(
+            {
+                "dimensions": len(current) if isinstance(current, list) else 1,
+                "times": [time for time, _ in prop._keys],
+                "values": values,
+            }
+        )
+
+    def lib_setKeyframes(self, prop, times: list, values: list) -> int:
+        prop.setValuesAtTimes(times, values)
+        return prop.numKeys
+
+    def lib_sample(self, properties: list, start, step, count: int, pre_expression):
+        dimensions = []
+        for prop in properties:
+            current = prop.value if prop is not None else None
+            if isinstance(current, list):
+                dimensions.append(len(current))
+            else:
+                dimensions.append(1 if isinstance(current, (int, float)) else 0)
+        width = max(dimensions + [1])
+        values = []
+        for index in range(count):
+            time = start + index * step
+            for prop, size in zip(properties, dimensions):
+                value = prop.valueAtTime(time, pre_expression) if size else []
+                if not isinstance(value, list):
+                    value = [value]
+                values.extend(value + [math.nan] * (width - len(value)))
+        return json.dumps({"dimensions": dimensions, "values": values})
+
+    def lib_compProperties(self, comp, names: list) -> list:
+        properties = []
+        for layer in comp._layers:
+            for name in names:
+                try:
+                    properties.append(layer._get(name))
+                except AttributeError:
+                    properties.append(None)
+        return properties
+
+    def lib_propertyTree(self, group, depth: int, include_values: bool) -> str:
+        rows = []
+
+        def visit(prop, parent: int, level: int):
+            row = len(rows)
+            is_group = isinstance(prop, PropertyGroup)
+            rows.append(
+                [
+                    parent,
+                    prop.propertyIndex,
+                    is_group,
+                    prop.matchName,
+                    prop.name,
+                    prop.enabled,
+                    0 if is_group else prop.numKeys,
+                    None if is_group else prop.expression,
+                    False if is_group else prop.expressionEnabled,
+                    None if is_group or not include_values else prop.value,
+                ]
+            )
+            if is_group and (depth < 0 or level < depth):
+                for child in prop._properties:
+                    visit(child, row, level + 1)
+
+        visit(group, -1, 0)
+        return json.dumps(rows)
+
+    def lib_propertyAt(self, group, names: list):
+        prop = group
+        for position, name in enumerate(names):
+            match = re.match(r"^(.*)#(\d+)$", name)
+            if match:
+                matching = [
+                    child
+                    for child in prop._properties
+                    if child.matchName == match.group(1)
+                ]
+                occurrence = int(match.group(2))
+                found = (
+                    matching[occurrence - 1] if occurrence <= len(matching) else None
+                )
+            else:
+                found = prop.property(name)
+            if found is None:
+                return "missing:" + "/".join(names[: position + 1])
+            prop = found
+        return prop
+
+    def lib_importFiles(self, project: Project, entries: list, folder):
+        results = []
+        for entry in entries:
+            if not entry["path"]:
+                results.append("File not found")
+            else:
+                results.append(project._import_file(entry["path"], folder))
+        return results
+
+    def lib_snapshot(self, project: Project, item_fields, layer_fields, include_layers):
+        items = []
+        layers = []
+        for item in project._items:
+            values = [item.id, item.type_name, item.name, item.parentFolder.id]
+            items.append(
+                values + [snapshot_value(item, field) for field in item_fields]
+            )
+            if include_layers and isinstance(item, CompItem):
+                for index, layer in enumerate(item._layers):
+                    values = [item.id, index + 1, layer.type_name, layer.name]
+                    layers.append(
+                        values
+                        + [snapshot_value(layer, field) for field in layer_fields]
+                    )
+        return json.dumps(
+            {
+                "revision": project.revision,
+                "rootId": project.rootFolder.id,
+                "items": items,
+                "layers": layers,
+            }
+        )
+
+
+def snapshot_value(node: Node, field: str):
+    """The value of the field as written by the snapshot function"""
+    try:
+        value = node._get(field)
+    except AttributeError:
+        return None
+    if isinstance(value, Node):
+        return getattr(value, "id", None)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def error_text(error: Exception) -> str:
+    """The error as the panel returns it"""
+    return json.dumps({"error": True, "name": "Error", "message": str(error)})
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, do not hold the body back
+    disable_nagle_algorithm = True
+    panel = None
+
+    def do_GET(self):
+        self.panel.stats.pings += 1
+        self._respond("AfterEffects is alive")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        stats = self.panel.stats
+        stats.requests += 1
+        stats.bytes_received += len(body)
+        try:
+            to_eval = json.loads(body)["to_eval"]
+        except (ValueError, KeyError):
+            self.send_error(400)
+            return
+        text = self.panel.evaluate(to_eval)
+        stats.bytes_sent += self._respond(text)
+
+    def _respond(self, text: str) -> int:
+        data = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def log_message(self, format, *args):
+        pass
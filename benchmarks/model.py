@@ -0,0 +1,542 @@
+"""Synthetic After Effects project served by the mock panel.
+
+Objects expose their ExtendScript attributes and functions under their ExtendScript names,
+attributes starting with an underscore are internal to the model"""
+
+
+class Reflect(object):
+    def __init__(self, name: str):
+        self.name = name
+
+
+class Node(object):
+    """An ExtendScript object of the synthetic project"""
+
+    type_name = "Object"
+
+    def __init__(self, project):
+        self._project = project
+
+    @property
+    def reflect(self) -> Reflect:
+        return Reflect(self.type_name)
+
+    def _get(self, name: str):
+        """The attribute read by a script, or the function called by it"""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self, name)
+
+    def _set(self, name: str, value):
+        """Assign the attribute from a script, every change of the project bumping its revision"""
+        if name.startswith("_") or not hasattr(self, name):
+            raise AttributeError(f"{self.type_name}.{name} does not exist")
+        if callable(getattr(self, name)):
+            raise AttributeError(f"{self.type_name}.{name} is a function")
+        setattr(self, name, value)
+        if self._project is not None:
+            self._project._touch()
+
+    def _element(self, index: int):
+        raise TypeError(f"{self.type_name} has no elements")
+
+    def _identity(self):
+        """The key identifying the object across handles, None for objects without one"""
+        return None
+
+
+class File(Node):
+    """A file created by a script, outside of the project"""
+
+    type_name = "File"
+
+    def __init__(self, path: str):
+        super().__init__(None)
+        self.fsName = path
+
+
+class ImportOptions(Node):
+    """Options created by a script, outside of the project"""
+
+    type_name = "ImportOptions"
+
+    def __init__(self):
+        super().__init__(None)
+        self.file = None
+        self.sequence = False
+        self.forceAlphabetical = False
+
+
+class Collection(Node):
+    """A 1-based collection of objects"""
+
+    def __init__(self, project, elements: list):
+        super().__init__(project)
+        self._elements = elements
+
+    @property
+    def length(self) -> int:
+        return len(self._elements)
+
+    def _element(self, index: int):
+        if 1 <= index <= len(self._elements):
+            return self._elements[index - 1]
+        return None
+
+
+class ItemCollection(Collection):
+    type_name = "ItemCollection"
+
+    def addFolder(self, name: str):
+        folder = FolderItem(self._project, name, self._project.rootFolder)
+        self._project._add_item(folder)
+        return folder
+
+
+class LayerCollection(Collection):
+    type_name = "LayerCollection"
+
+    def __init__(self, project, elements: list, comp=None):
+        super().__init__(project, elements)
+        self._comp = comp
+
+    def add(self, item, duration=None):
+        return self._add_layer(item.name, source=item)
+
+    def addSolid(self, color, name, width, height, pixelAspect, duration=None):
+        return self._add_layer(name)
+
+    def addNull(self, duration=None):
+        return self._add_layer("Null 1")
+
+    def addText(self, text=""):
+        return self._add_layer(text or "Text", "TextLayer")
+
+    def addShape(self):
+        return self._add_layer("Shape Layer 1", "ShapeLayer")
+
+    def _add_layer(self, name: str, type_name: str = "AVLayer", source=None):
+        """Add a layer at the top of the composition, as After Effects does"""
+        layer = Layer(self._project, self._comp, name, 0, False)
+        layer.type_name = type_name
+        layer.source = source
+        self._elements.insert(0, layer)
+        self._project._touch()
+        return layer
+
+    def byName(self, name: str):
+        for layer in self._elements:
+            if layer.name == name:
+                return layer
+        return None
+
+
+class Item(Node):
+    def __init__(self, project, name: str, parent):
+        super().__init__(project)
+        self.id = project._next_id()
+        self.name = name
+        self.parentFolder = parent
+        self.comment = ""
+        self.label = 1
+        self.selected = False
+
+    def _identity(self):
+        return f"item:{self.id}"
+
+
+class FolderItem(Item):
+    type_name = "FolderItem"
+
+    def __init__(self, project, name: str, parent):
+        super().__init__(project, name, parent)
+        self._children = []
+        if parent is not None:
+            parent._children.append(self)
+
+    @property
+    def items(self) -> ItemCollection:
+        return ItemCollection(self._project, self._children)
+
+    @property
+    def numItems(self) -> int:
+        return len(self._children)
+
+    def item(self, index: int):
+        return self.items._element(index)
+
+
+class AVItem(Item):
+    def __init__(self, project, name: str, parent):
+        super().__init__(project, name, parent)
+        parent._children.append(self)
+        self.width = 1920
+        self.height = 1080
+        self.duration = 10
+        self.frameRate = 25
+        self.pixelAspect = 1
+        self.time = 0
+
+
+class FootageItem(AVItem):
+    type_name = "FootageItem"
+
+
+class CompItem(AVItem):
+    type_name = "CompItem"
+
+    def __init__(self, project, name: str, parent, layers: int, properties: int):
+        super().__init__(project, name, parent)
+        self._layers = [
+            Layer(project, self, f"Layer {index + 1:03d}", properties, index % 3 == 0)
+            for index in range(layers)
+        ]
+        self.bgColor = [0, 0, 0]
+        self.workAreaStart = 0
+        self.workAreaDuration = 10
+
+    @property
+    def layers(self) -> LayerCollection:
+        return LayerCollection(self._project, self._layers, self)
+
+    @property
+    def numLayers(self) -> int:
+        return len(self._layers)
+
+    @property
+    def selectedLayers(self) -> list:
+        return [layer for layer in self._layers if layer.selected]
+
+    def layer(self, index: int):
+        return self.layers._element(index)
+
+
+class PropertyGroup(Node):
+    """A group of properties, found by index, name or match name"""
+
+    type_name = "PropertyGroup"
+
+    def __init__(self, project, parent, index: int, name: str, match_name: str):
+        super().__init__(project)
+        self.parentProperty = parent
+        self.propertyIndex = index
+        self.name = name
+        self.matchName = match_name
+        self.enabled = True
+        self._properties = []
+
+    @property
+    def numProperties(self) -> int:
+        return len(self._properties)
+
+    @property
+    def propertyDepth(self) -> int:
+        return self.parentProperty.propertyDepth + 1
+
+    def property(self, key):
+        if isinstance(key, str):
+            for prop in self._properties:
+                if key in (prop.name, prop.matchName):
+                    return prop
+            return None
+        return self._properties[key - 1] if 1 <= key <= len(self._properties) else None
+
+    def _add(self, node_class, name: str, match_name: str, *args):
+        node = node_class(
+            self._project, self, len(self._properties) + 1, name, match_name, *args
+        )
+        self._properties.append(node)
+        return node
+
+    def _identity(self):
+        return f"{self.parentProperty._identity()}:{self.propertyIndex}"
+
+
+class Layer(PropertyGroup):
+    """A layer with a transform group, and an effect holding the given number of properties"""
+
+    type_name = "AVLayer"
+
+    def __init__(
+        self, project, comp: CompItem, name: str, properties: int, selected: bool
+    ):
+        super().__init__(project, None, 0, name, "ADBE AV Layer")
+        self.id = project._next_id()
+        self.containingComp = comp
+        self.comment = ""
+        self.label = 1
+        self.selected = selected
+        self.locked = False
+        self.shy = False
+        self.solo = False
+        self.inPoint = 0
+        self.outPoint = 10
+        self._start_time = 0
+        self._stretch = 100
+        self.blendingMode = 5212
+        self.adjustmentLayer = False
+        self.guideLayer = False
+        self.motionBlur = False
+        self.threeDLayer = False
+        self.parent = None
+        self.source = None
+        transform = self._add(PropertyGroup, "Transform", "ADBE Transform Group")
+        for name, match_name, value in (
+            ("Anchor Point", "ADBE Anchor Point", [0.0, 0.0, 0.0]),
+            ("Position", "ADBE Position", [960.0, 540.0, 0.0]),
+            ("Scale", "ADBE Scale", [100.0, 100.0, 100.0]),
+            ("Rotation", "ADBE Rotate Z", 0.0),
+            ("Opacity", "ADBE Opacity", 100.0),
+        ):
+            transform._add(Property, name, match_name, value)
+        effects = self._add(PropertyGroup, "Effects", "ADBE Effect Parade")
+        if properties:
+            blur = effects._add(PropertyGroup, "Gaussian Blur", "ADBE Gaussian Blur 2")
+            for index in range(properties):
+                blur._add(
+                    Property,
+                    f"Property {index + 1}",
+                    f"ADBE Gaussian Blur 2-{index + 1:04d}",
+                    float(index + 1),
+                )
+
+    @property
+    def index(self) -> int:
+        return self.containingComp._layers.index(self) + 1
+
+    @property
+    def startTime(self) -> float:
+        return self._start_time
+
+    @startTime.setter
+    def startTime(self, value: float):
+        # moving a layer in time moves its in and out points along, as After Effects does
+        delta = value - self._start_time
+        self._start_time = value
+        self.inPoint += delta
+        self.outPoint += delta
+
+    @property
+    def stretch(self) -> float:
+        return self._stretch
+
+    @stretch.setter
+    def stretch(self, value: float):
+        # stretching a layer scales its in and out points from its start time
+        ratio = value / self._stretch
+        self._stretch = value
+        self.inPoint = self._start_time + (self.inPoint - self._start_time) * ratio
+        self.outPoint = self._start_time + (self.outPoint - self._start_time) * ratio
+
+    def remove(self):
+        self.containingComp._layers.remove(self)
+        self._project._touch()
+
+    @property
+    def propertyDepth(self) -> int:
+        return 0
+
+    @property
+    def transform(self) -> PropertyGroup:
+        return self._properties[0]
+
+    @property
+    def effects(self) -> PropertyGroup:
+        return self._properties[1]
+
+    @property
+    def Effects(self) -> PropertyGroup:
+        return self.effects
+
+    @property
+    def anchorPoint(self):
+        return self.transform._properties[0]
+
+    @property
+    def position(self):
+        return self.transform._properties[1]
+
+    @property
+    def scale(self):
+        return self.transform._properties[2]
+
+    @property
+    def rotation(self):
+        return self.transform._properties[3]
+
+    @property
+    def opacity(self):
+        return self.transform._properties[4]
+
+    def _identity(self):
+        return f"layer:{self.containingComp.id}:{self.id}"
+
+
+class Property(Node):
+    type_name = "Property"
+
+    def __init__(self, project, parent, index: int, name: str, match_name: str, value):
+        super().__init__(project)
+        self.parentProperty = parent
+        self.propertyIndex = index
+        self.name = name
+        self.matchName = match_name
+        self.value = value
+        self.enabled = True
+        self.expression = ""
+        self.expressionEnabled = False
+        self._keys = []
+
+    @property
+    def numKeys(self) -> int:
+        return len(self._keys)
+
+    @property
+    def propertyDepth(self) -> int:
+        return self.parentProperty.propertyDepth + 1
+
+    def setValue(self, value):
+        self._set("value", value)
+
+    def keyTime(self, index: int):
+        return self._keys[index - 1][0]
+
+    def keyValue(self, index: int):
+        return self._keys[index - 1][1]
+
+    def setValuesAtTimes(self, times: list, values: list):
+        keys = dict(self._keys)
+        keys.update(zip(times, values))
+        self._keys = sorted(keys.items())
+        self._project._touch()
+
+    def valueAtTime(self, time: float, pre_expression: bool = False):
+        """The value at the time, linearly interpolated between keyframes"""
+        if not self._keys:
+            return self.value
+        if time <= self._keys[0][0]:
+            return self._keys[0][1]
+        for (start, before), (end, after) in zip(self._keys, self._keys[1:]):
+            if start <= time <= end:
+                ratio = (time - start) / (end - start)
+                if isinstance(before, list):
+                    return [a + (b - a) * ratio for a, b in zip(before, after)]
+                return before + (after - before) * ratio
+        return self._keys[-1][1]
+
+    def _identity(self):
+        return f"{self.parentProperty._identity()}:{self.propertyIndex}"
+
+
+class Project(Node):
+    type_name = "Project"
+
+    def __init__(self):
+        super().__init__(self)
+        self._last_id = 0
+        self._items = []
+        self.revision = 1
+        self.file = None
+        self.rootFolder = FolderItem(self, "Root", None)
+        self.activeItem = None
+        self.bitsPerChannel = 8
+        self.gpuAccelType = 1816
+        self.xmpPacket = ""
+        self._undo_steps = []
+        self._undo_group = None
+        self._undo_group_changed = False
+
+    @property
+    def items(self) -> ItemCollection:
+        return ItemCollection(self, self._items)
+
+    @property
+    def numItems(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int):
+        return self.items._element(index)
+
+    def itemByID(self, item_id: int):
+        for item in self._items:
+            if item.id == item_id:
+                return item
+        raise ValueError(f"There is no item with the id {item_id}")
+
+    def importFile(self, options: ImportOptions):
+        if options.file is None:
+            raise ValueError("The import options have no file")
+        return self._import_file(options.file.fsName)
+
+    def _import_file(self, path: str, folder: FolderItem = None):
+        """Import the file as a footage item, the file being assumed to exist"""
+        item = FootageItem(self, path.rsplit("/", 1)[-1], folder or self.rootFolder)
+        self._add_item(item)
+        return item
+
+    def _next_id(self) -> int:
+        self._last_id += 1
+        return self._last_id
+
+    def _add_item(self, item: Item):
+        self._items.append(item)
+        self._touch()
+
+    def _touch(self):
+        """Record a change, as its own undo step unless an undo group is open"""
+        self.revision += 1
+        if self._undo_group is None:
+            self._undo_steps.append("change")
+        elif not self._undo_group_changed:
+            self._undo_group_changed = True
+            self._undo_steps.append(self._undo_group)
+
+
+class Application(Node):
+    type_name = "Application"
+
+    def __init__(self, project: Project):
+        super().__init__(project)
+        self.project = project
+        self.version = "23.0x53"
+        self.buildName = "mock"
+        self.availableGPUAccelTypes = [1816]
+
+    def beginUndoGroup(self, name: str):
+        self._project._undo_group = name
+        self._project._undo_group_changed = False
+
+    def endUndoGroup(self):
+        self._project._undo_group = None
+
+
+def build_project(
+    items: int = 1000, layers: int = 10, properties: int = 5, folders: int = 10
+) -> Project:
+    """A project with the given number of items, spread across folders, half of the others being
+    compositions with the given number of layers, each with the given number of properties
+    """
+    project = Project()
+    folder_items = [
+        FolderItem(project, f"Folder {index + 1:02d}", project.rootFolder)
+        for index in range(min(folders, items))
+    ]
+    others = []
+    for index in range(items - len(folder_items)):
+        parent = (
+            folder_items[index % len(folder_items)]
+            if folder_items
+            else project.rootFolder
+        )
+        if index % 2 == 0:
+            others.append(
+                CompItem(
+                    project, f"Comp {index // 2 + 1:04d}", parent, layers, properties
+                )
+            )
+        else:
+            others.append(FootageItem(project, f"Footage {index // 2 + 1:04d}", parent))
+    project._items = folder_items + others
+    comps = [item for item in others if isinstance(item, CompItem)]
+    project.activeItem = comps[0] if comps else None
+    return project
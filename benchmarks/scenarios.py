@@ -0,0 +1,167 @@
+"""Common operations measured by the benchmarks.
+
+A scenario prepares what it needs from the project first, which is not measured,
+then runs the operation measured"""
+
+from pydobe.batch import Batch
+
+
+class Scenario(object):
+    """An operation measured by the benchmarks"""
+
+    def __init__(self, name: str, description: str, setup, run):
+        self.name = name
+        self.description = description
+        self.setup = setup
+        self.run = run
+
+    def __repr__(self) -> str:
+        return f"<Scenario {self.name}>"
+
+
+SCENARIOS = {}
+
+
+def scenario(description: str, setup=None):
+    """Register the decorated function as a scenario, run with what the setup returns,
+    or with the project if there is no setup"""
+
+    def register(run):
+        name = run.__name__
+        SCENARIOS[name] = Scenario(
+            name, description, setup or (lambda project: project), run
+        )
+        return run
+
+    return register
+
+
+# SETUP
+
+
+def _comps(project, count: int = 20) -> list:
+    return project.query(type="CompItem")[:count]
+
+
+def _names(project, count: int = 20) -> list:
+    items = project.items
+    step = max(len(items) // count, 1)
+    return [item.name for item in items[::step][:count]]
+
+
+def _layers(project) -> tuple:
+    comp = _comps(project, 1)[0]
+    return comp.connection, list(comp.layers)
+
+
+# SCENARIOS
+
+
+@scenario("Iterate over every item of the project")
+def items_iteration(project):
+    for _ in project.items:
+        pass
+
+
+@scenario("Read the name of every item of the project")
+def item_names(project):
+    return [item.name for item in project.items]
+
+
+@scenario("Read the name of every item of the project within a Batch")
+def item_names_batch(project):
+    items = list(project.items)
+    with Batch(project.connection) as batch:
+        futures = [batch.get(item, "name") for item in items]
+    return [future.result() for future in futures]
+
+
+@scenario("Find 20 items by name", setup=lambda project: (project, _names(project)))
+def item_by_name(arguments):
+    project, names = arguments
+    return [project.item_by_name(name) for name in names]
+
+
+@scenario("Read the selected layers of 20 compositions", setup=_comps)
+def selected_layers(comps):
+    return [comp.selected_layers for comp in comps]
+
+
+@scenario("Snapshot every item and layer of the project")
+def snapshot(project):
+    return project.snapshot()
+
+
+@scenario("Rename every layer of a composition", setup=_layers)
+def bulk_setters(arguments):
+    _, layers = arguments
+    for index, layer in enumerate(layers):
+        layer.name = f"Renamed {index}"
+
+
+@scenario("Rename every layer of a composition within a Batch", setup=_layers)
+def bulk_setters_batch(arguments):
+    connection, layers = arguments
+    with Batch(connection) as batch:
+        for index, layer in enumerate(layers):
+            batch.set(layer, "name", f"Renamed {index}")
+
+
+@scenario(
+    "Rename every layer of a composition within a transaction",
+    setup=lambda project: (project, _layers(project)[1]),
+)
+def bulk_setters_transaction(arguments):
+    project, layers = arguments
+    with project.transaction("Rename layers"):
+        for index, layer in enumerate(layers):
+            layer.name = f"Renamed {index}"
+
+
+@scenario(
+    "Add and name 50 layers to a composition",
+    setup=lambda project: (_comps(project, 1)[0], project.query(type="FootageItem")[0]),
+)
+def add_many_layers(arguments):
+    comp, footage = arguments
+    specs = [
+        {"item": footage, "name": f"Plate {index}", "start_time": index}
+        for index in range(50)
+    ]
+    return comp.layers.add_many(specs)
+
+
+@scenario(
+    "Write then read 1000 position keyframes",
+    setup=lambda project: _layers(project)[1][0].position,
+)
+def keyframes(position):
+    times = [frame / 25 for frame in range(1000)]
+    position.set_keyframes(times, [[frame, frame, 0] for frame in range(1000)])
+    return position.get_keyframes()
+
+
+@scenario(
+    "Sample the transform of every layer of a composition at every frame",
+    setup=lambda project: _comps(project, 1)[0],
+)
+def sample_comp(comp):
+    return comp.sample(0, 10, 1 / 25)
+
+
+@scenario("Dump the properties of every layer of a composition", setup=_layers)
+def dump_layers(arguments):
+    _, layers = arguments
+    return [layer.dump() for layer in layers]
+
+
+@scenario(
+    "Read an effect parameter of every layer of a composition 10 times",
+    setup=_layers,
+)
+def property_paths(arguments):
+    _, layers = arguments
+    path = "ADBE Effect Parade/ADBE Gaussian Blur 2/ADBE Gaussian Blur 2-0001"
+    for _ in range(10):
+        for layer in layers:
+            layer.property_at(path)
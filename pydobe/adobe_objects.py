@@ -2,8 +2,8 @@ from pydobe.core import PydobeBaseObject
 
 
 class File(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     def __str__(self):
         return self.full_name
@@ -30,8 +30,8 @@ class File(PydobeBaseObject):
 
 
 class Folder(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     """The name of the folder"""
 
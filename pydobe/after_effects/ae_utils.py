@@ -1,12 +1,14 @@
 # AE GLOBAL FUNCTIONS
-from pydobe.core import eval_script_returning_object
+from pydobe.core import eval_script_returning_object, format_to_extend
 
 
-def time_to_current_format(time, fps):
-    return eval_script_returning_object(f"timeToCurrentFormat({time}, {fps})")
+def time_to_current_format(time, fps, connection=None):
+    return eval_script_returning_object(
+        f"timeToCurrentFormat({time}, {fps})", connection
+    )
 
 
-def current_format_to_time(time, fps):
-    if type(time) == int:
-        return eval_script_returning_object(f"currentFormatToTime({time}, {fps})")
-    return eval_script_returning_object(f'currentFormatToTime("{time}", {fps})')
+def current_format_to_time(time, fps, connection=None):
+    return eval_script_returning_object(
+        f"currentFormatToTime({format_to_extend(time)}, {fps})", connection
+    )
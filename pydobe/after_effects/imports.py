@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import json
+import os
+import re
+
+from pydobe.core import Connection, eval_script_returning_object
+from pydobe.library import library
+
+# ExtendScript importing every file, returning the imported item or the error message of each one
+IMPORT_FUNCTION = """(function(project, entries, folder){
+    var results = [];
+    for(var i = 0; i < entries.length; i++){
+        try{
+            var options = new ImportOptions(new File(entries[i].path));
+            options.sequence = entries[i].sequence;
+            options.forceAlphabetical = entries[i].forceAlphabetical;
+            var item = project.importFile(options);
+            if(folder !== null){item.parentFolder = folder}
+            results.push(item);
+        }
+        catch(e){results.push(String(e.message || e))}
+    }
+    return results;
+})"""
+library.register("importFiles", IMPORT_FUNCTION)
+
+# The frame number of an image sequence, right before the extension
+_FRAME_PATTERN = re.compile(r"^(.*?)(\d+)(\.[^.\d]+)$")
+
+
+class ImportResult(object):
+    """Outcome of importing one file"""
+
+    __slots__ = ("path", "sequence", "item", "error")
+
+    def __init__(self, path: str, sequence: bool = False, item=None, error: str = None):
+        self.path = path
+        self.sequence = sequence
+        self.item = item
+        self.error = error
+
+    def __repr__(self) -> str:
+        outcome = "ok" if self.ok else f"failed: {self.error}"
+        return f"<ImportResult '{self.path}' {outcome}>"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _frame_key(name: str) -> tuple | None:
+    """(prefix, number of digits, extension) of a frame of an image sequence, None without a frame number"""
+    match = _FRAME_PATTERN.match(name)
+    if not match:
+        return None
+    prefix, frame, extension = match.groups()
+    return prefix, len(frame), extension
+
+
+def frame_counts(names: list) -> collections.Counter:
+    """Number of files of a folder sharing the name, number of digits and extension of each frame"""
+    return collections.Counter(key for key in map(_frame_key, names) if key is not None)
+
+
+def is_sequence(path: str, names: list = None) -> bool:
+    """True if the file is a frame of an image sequence, another frame with the same name,
+    number of digits and extension being in the same folder"""
+    directory, name = os.path.split(path)
+    key = _frame_key(name)
+    if key is None:
+        return False
+    if names is None:
+        names = os.listdir(directory or ".")
+    return frame_counts(names)[key] - (name in names) > 0
+
+
+def check_import_paths(
+    paths: list, sequence: bool = None, max_workers: int = 16
+) -> list[ImportResult]:
+    """Check every path exists, in a thread pool, detecting image sequences when `sequence` is None.
+    Returns an ImportResult for every path, in order, with an error for the missing ones
+    """
+
+    def check(path: str) -> ImportResult:
+        if not os.path.isfile(path):
+            return ImportResult(path, error=f"'{path}' does not exist")
+        return ImportResult(path, bool(sequence))
+
+    def count_frames(directory: str) -> collections.Counter | OSError:
+        try:
+            return frame_counts(os.listdir(directory or "."))
+        except OSError as error:
+            return error
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        results = list(executor.map(check, paths))
+        if sequence is not None:
+            return results
+        # every frame of a sequence shares the listing of its folder, read once
+        directories = list(
+            {os.path.dirname(result.path) for result in results if result.ok}
+        )
+        counts = dict(zip(directories, executor.map(count_frames, directories)))
+    for result in results:
+        if not result.ok:
+            continue
+        directory, name = os.path.split(result.path)
+        frames = counts[directory]
+        if isinstance(frames, OSError):
+            result.error = str(frames)
+        else:
+            # the listing holds the file itself
+            result.sequence = frames[_frame_key(name)] > 1
+    return results
+
+
+def import_checked_files(
+    project_line: str,
+    results: list[ImportResult],
+    force_alphabetical: bool = False,
+    folder_line: str = None,
+    connection: Connection = None,
+) -> list[ImportResult]:
+    """Import the files of the results without an error in a single request,
+    filling in the keyword arguments of the imported item, or the error, of each result
+    """
+    pending = [result for result in results if result.ok]
+    if not pending:
+        return results
+    entries = [
+        {
+            "path": os.path.abspath(result.path).replace("\\", "/"),
+            "sequence": result.sequence,
+            "forceAlphabetical": force_alphabetical,
+        }
+        for result in pending
+    ]
+    imported = eval_script_returning_object(
+        library.call(
+            "importFiles", project_line, json.dumps(entries), folder_line or "null"
+        )
+        + ";",
+        connection,
+    )
+    if not isinstance(imported, list):
+        raise RuntimeError(f"The files could not be imported: {imported}")
+    for result, value in zip(pending, imported):
+        if isinstance(value, dict):
+            result.item = value
+        else:
+            result.error = str(value)
+    return results
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import array
+import json
+
+from pydobe.buffers import float_buffer, to_list
+from pydobe.core import Connection, eval_script
+from pydobe.library import library
+
+# ExtendScript returning the time and value of every keyframe of a property, as flat arrays of numbers
+KEYFRAMES_FUNCTION = """(function(property){
+    var current = property.value;
+    if(typeof current !== "number" && !(current instanceof Array)){
+        throw new Error(property.name + " does not hold numeric values");
+    }
+    var dimensions = current instanceof Array ? current.length : 1;
+    var times = [];
+    var values = [];
+    for(var i = 1; i <= property.numKeys; i++){
+        times.push(property.keyTime(i));
+        var value = property.keyValue(i);
+        values.push(value instanceof Array ? value.join(",") : value);
+    }
+    return '{"dimensions": ' + dimensions + ', "times": [' + times.join(",") + '], "values": [' + values.join(",") + ']}';
+})"""
+library.register("keyframes", KEYFRAMES_FUNCTION)
+
+# ExtendScript setting keyframes at every time, returning the number of keyframes of the property
+SET_KEYFRAMES_FUNCTION = """(function(property, times, values){
+    property.setValuesAtTimes(times, values);
+    return property.numKeys;
+})"""
+library.register("setKeyframes", SET_KEYFRAMES_FUNCTION)
+
+
+class Keyframes(object):
+    """Times and values of the keyframes of a property, held in compact buffers.
+
+    With NumPy, `times` is an array and `values` an array with a row per keyframe for
+    multi-dimensional properties. Without it, both are array.array, the values of a keyframe
+    being `dimensions` consecutive numbers"""
+
+    __slots__ = ("times", "values", "dimensions")
+
+    def __init__(self, times, values, dimensions: int):
+        self.times = times
+        self.values = values
+        self.dimensions = dimensions
+
+    def __repr__(self) -> str:
+        return f"<Keyframes {len(self)} keyframes of {self.dimensions} dimensions>"
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.times[index], self.value(index)
+
+    def value(self, index: int) -> float | tuple:
+        """Value of a keyframe, a tuple for multi-dimensional properties"""
+        if self.dimensions == 1:
+            return self.values[index]
+        if isinstance(self.values, array.array):
+            start = index * self.dimensions
+            return tuple(self.values[start : start + self.dimensions])
+        return tuple(self.values[index])
+
+
+def read_keyframes(property_line: str, connection: Connection = None) -> Keyframes:
+    """Read the time and value of every keyframe of a property in a single request"""
+    result = eval_script(library.call("keyframes", property_line), connection)
+    if not isinstance(result, dict) or result.get("error"):
+        raise RuntimeError(f"Unable to read the keyframes: {result}")
+    dimensions = result["dimensions"]
+    shape = (-1, dimensions) if dimensions > 1 else None
+    return Keyframes(
+        float_buffer(result["times"]),
+        float_buffer(result["values"], shape),
+        dimensions,
+    )
+
+
+def write_keyframes(
+    property_line: str, times, values, connection: Connection = None
+) -> int:
+    """Set keyframes at every time, in seconds, with the values in a single request.
+    Values are numbers, or sequences of numbers for multi-dimensional properties,
+    given as lists, array.array or NumPy arrays. The values of multi-dimensional properties can also be
+    flat, one row after the other, as in Keyframes read without NumPy.
+    Returns the number of keyframes of the property"""
+    times = to_list(times)
+    values = to_list(values)
+    if (
+        times
+        and len(values) > len(times)
+        and len(values) % len(times) == 0
+        and not isinstance(values[0], list)
+    ):
+        dimensions = len(values) // len(times)
+        values = [
+            values[start : start + dimensions]
+            for start in range(0, len(values), dimensions)
+        ]
+    if len(times) != len(values):
+        raise ValueError(f"{len(times)} times given for {len(values)} values")
+    result = eval_script(
+        library.call(
+            "setKeyframes", property_line, json.dumps(times), json.dumps(values)
+        ),
+        connection,
+    )
+    if isinstance(result, dict) and result.get("error"):
+        raise RuntimeError(f"Unable to set the keyframes: {result}")
+    return result
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from pydobe.core import (
+    Connection,
+    PydobeBaseObject,
+    eval_script_returning_object,
+    format_to_extend,
+)
+from pydobe.library import library
+from pydobe.utils import hex_to_rgb
+from pydobe.after_effects.data import (
+    blending_modes_dictionary,
+    frame_blending_dictionary,
+    label_dictionary,
+)
+
+# ExtendScript creating a layer for every spec and setting its attributes,
+# returning the new layer or the error message of each spec.
+# If any spec fails, every layer created is removed again and null is returned in its place
+ADD_LAYERS_FUNCTION = """(function(layers, specs){
+    var results = [];
+    var created = [];
+    for(var i = 0; i < specs.length; i++){
+        var spec = specs[i];
+        var layer = null;
+        try{
+            if(spec.kind === "item"){
+                layer = spec.duration === null ? layers.add(spec.item) : layers.add(spec.item, spec.duration);
+            } else if(spec.kind === "solid"){
+                layer = spec.duration === null
+                    ? layers.addSolid(spec.color, spec.name, spec.width, spec.height, spec.pixelAspect)
+                    : layers.addSolid(spec.color, spec.name, spec.width, spec.height, spec.pixelAspect, spec.duration);
+            } else if(spec.kind === "null"){
+                layer = spec.duration === null ? layers.addNull() : layers.addNull(spec.duration);
+            } else if(spec.kind === "text"){
+                layer = layers.addText(spec.text);
+            } else {
+                layer = layers.addShape();
+            }
+            for(var j = 0; j < spec.attributes.length; j++){
+                layer[spec.attributes[j][0]] = spec.attributes[j][1];
+            }
+            created.push(results.length);
+            results.push(layer);
+        }
+        catch(e){
+            if(layer !== null){try{layer.remove()}catch(ignored){}}
+            results.push(String(e.message || e));
+        }
+    }
+    if(created.length < results.length){
+        for(var k = created.length - 1; k >= 0; k--){
+            results[created[k]].remove();
+            results[created[k]] = null;
+        }
+    }
+    return results;
+})"""
+library.register("addLayers", ADD_LAYERS_FUNCTION)
+
+# Kinds of layer a spec can create, named by the key holding its source
+LAYER_KINDS = ("item", "solid", "null", "text", "shape")
+
+# Attributes a spec can set on its layer, named as the attributes of Layer and AVLayer, in the order
+# they are set. Setting the start time or stretch moves the in and out points, so they come first
+LAYER_ATTRIBUTES = {
+    "start_time": "startTime",
+    "stretch": "stretch",
+    "name": "name",
+    "comment": "comment",
+    "label": "label",
+    "enabled": "enabled",
+    "selected": "selected",
+    "locked": "locked",
+    "shy": "shy",
+    "solo": "solo",
+    "in_point": "inPoint",
+    "out_point": "outPoint",
+    "parent": "parent",
+    "adjustment_layer": "adjustmentLayer",
+    "audio_enabled": "audioEnabled",
+    "blending_mode": "blendingMode",
+    "collapse_transformation": "collapseTransformation",
+    "effects_active": "effectsActive",
+    "environment_layer": "environmentLayer",
+    "frame_blending_type": "frameBlendingType",
+    "guide_layer": "guideLayer",
+    "motion_blur": "motionBlur",
+    "preserve_transparency": "preserveTransparency",
+    "three_d_layer": "threeDLayer",
+}
+
+# Keys configuring the source of a spec, besides its kind
+_SOURCE_KEYS = {"duration", "color", "width", "height", "pixel_aspect"}
+
+# Attributes set by name, converted to the values ExtendScript expects
+_ATTRIBUTE_VALUES = {
+    "label": label_dictionary,
+    "blending_mode": blending_modes_dictionary,
+    "frame_blending_type": frame_blending_dictionary,
+}
+
+
+def layer_spec_entry(spec: dict) -> dict:
+    """The spec as handed to ExtendScript, checking its keys and converting its values.
+
+    A spec holds a single source key: `item` with the Item to add, `solid` with the name of the solid,
+    `null` or `shape` with True, or `text` with the source text. Solids also take `color`, `width`,
+    `height` and `pixel_aspect`, and items, solids and nulls an optional `duration` in seconds.
+    Every other key is an attribute of the new layer, see LAYER_ATTRIBUTES, times being in seconds
+    """
+    kinds = [kind for kind in LAYER_KINDS if kind in spec]
+    if len(kinds) != 1:
+        raise ValueError(
+            f"A layer spec needs exactly one of {', '.join(LAYER_KINDS)}, got {spec}"
+        )
+    kind = kinds[0]
+    unknown = set(spec) - set(LAYER_KINDS) - _SOURCE_KEYS - set(LAYER_ATTRIBUTES)
+    if unknown:
+        raise ValueError(f"Unknown layer spec keys: {', '.join(sorted(unknown))}")
+
+    entry = {"kind": kind, "duration": spec.get("duration")}
+    if kind == "item":
+        if not isinstance(spec["item"], PydobeBaseObject):
+            raise TypeError("The item of a layer spec must be a pydobe Item")
+        entry["item"] = spec["item"]
+    elif kind == "solid":
+        color = spec.get("color", [0, 0, 0])
+        entry.update(
+            color=hex_to_rgb(color) if isinstance(color, str) else color,
+            name=spec["solid"],
+            width=spec.get("width", 1920),
+            height=spec.get("height", 1080),
+            pixelAspect=spec.get("pixel_aspect", 1),
+        )
+    elif kind == "text":
+        entry["text"] = spec["text"]
+
+    attributes = []
+    for name, extend_name in LAYER_ATTRIBUTES.items():
+        if name not in spec:
+            continue
+        value = spec[name]
+        if name in _ATTRIBUTE_VALUES and isinstance(value, str):
+            value = _ATTRIBUTE_VALUES[name][value]
+        attributes.append([extend_name, value])
+    entry["attributes"] = attributes
+    return entry
+
+
+def add_layers(
+    layers_line: str, specs: list[dict], connection: Connection = None
+) -> list[dict]:
+    """Create and configure a layer for every spec in a single request.
+    Returns the keyword arguments of the new layers, in the order of the specs.
+    If any spec fails, no layer is left in the composition and a RuntimeError lists the failed specs
+    """
+    entries = [layer_spec_entry(spec) for spec in specs]
+    if not entries:
+        return []
+    results = eval_script_returning_object(
+        library.call("addLayers", layers_line, format_to_extend(entries)) + ";",
+        connection,
+    )
+    if not isinstance(results, list):
+        raise RuntimeError(f"The layers could not be added: {results}")
+    errors = [
+        f"spec {index}: {result}"
+        for index, result in enumerate(results)
+        if result is not None and not isinstance(result, dict)
+    ]
+    if errors:
+        raise RuntimeError(
+            "No layer was added, as some could not be:\n" + "\n".join(errors)
+        )
+    return results
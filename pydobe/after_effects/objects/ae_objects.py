@@ -1,24 +1,59 @@
 from __future__ import annotations
 
-import pydobe
+import collections
+
 from pydobe.core import (
     PydobeBaseObject,
     PydobeBaseCollection,
     format_to_extend,
     create_python_object,
+    register_object_type,
 )
 from pydobe.adobe_objects import File, Folder
+from pydobe.batch import Transaction
 from pydobe.utils import hex_to_rgb
 from pydobe.after_effects.data import *
 from pydobe.after_effects.ae_utils import *
+from pydobe.after_effects.imports import (
+    ImportResult,
+    check_import_paths,
+    import_checked_files,
+)
+from pydobe.after_effects.keyframes import Keyframes, read_keyframes, write_keyframes
+from pydobe.after_effects.layer_specs import add_layers
+from pydobe.after_effects.property_tree import (
+    PropertyTree,
+    read_property_tree,
+    resolve_property_path,
+)
+from pydobe.after_effects.queries import (
+    ItemIndex,
+    build_item_index,
+    item_indexes,
+    lookup_items,
+    query_items,
+)
+from pydobe.after_effects.sampling import (
+    DEFAULT_SAMPLED_PROPERTIES,
+    Samples,
+    comp_properties_line,
+    sample_properties,
+)
+from pydobe.after_effects.snapshot import (
+    DEFAULT_ITEM_FIELDS,
+    DEFAULT_LAYER_FIELDS,
+    ProjectSnapshot,
+    take_snapshot,
+    to_extend_name,
+)
 
 
 # BASE OBJECTS
 
 
 class Application(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -57,17 +92,22 @@ class Application(PydobeBaseObject):
         else:
             self.project.close(save=False)
         if path:
-            file = File(**eval_script_returning_object(f'File("{path}")'))
-            extend_file_object = format_to_extend(file)
-            kwargs = self._eval_on_object(f"open({extend_file_object})")
+            file = File(
+                **eval_script_returning_object(
+                    f"File({format_to_extend(path)})", self.connection
+                )
+            )
+            kwargs = self._call_method("open", file)
         else:
             kwargs = self._eval_on_object(f"open()")
         return Project(**kwargs) if kwargs else None
 
 
 class Project(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    transaction_setters = True
+
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -96,7 +136,7 @@ class Project(PydobeBaseObject):
                 "Unable to set 'bits_per_channel', value must be 8, 16, or 32"
             )
         else:
-            self._eval_on_object(f"bitsPerChannel = {value}")
+            self._set_property("bitsPerChannel", value)
 
     """Compensate for scene referred profiles"""
 
@@ -106,8 +146,7 @@ class Project(PydobeBaseObject):
 
     @compensate_for_scene_referred_profiles.setter
     def compensate_for_scene_referred_profiles(self, value):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"compensateForSceneReferredProfiles = {extend_value}")
+        self._set_property("compensateForSceneReferredProfiles", value)
 
     """Returns True if file has been modified since last save. False if it has not"""
 
@@ -125,7 +164,7 @@ class Project(PydobeBaseObject):
     def display_start_frame(self, value: int):
         if value > 1:
             raise ValueError("Display start frame must be set to either 0 or 1")
-        self._eval_on_object(f"displayStartFrame = {value}")
+        self._set_property("displayStartFrame", value)
 
     """The expression engine setting in the Project Settings dialog box"""
 
@@ -137,7 +176,7 @@ class Project(PydobeBaseObject):
     def expression_engine(self, value: str):
         if value != "javascript-1.0" and value != "extendscript":
             raise ValueError("No engine exists by this name")
-        self._eval_on_object(f'expressionEngine = "{value}"')
+        self._set_property("expressionEngine", value)
 
     """The Use Feet + Frames menu setting"""
 
@@ -151,7 +190,7 @@ class Project(PydobeBaseObject):
     def feet_frames_film_type(self, value: int or str):
         if type(value) == str:
             value = feet_and_frames_dictionary[value]
-        self._eval_on_object(f"feetFramesFilmType = {value}")
+        self._set_property("feetFramesFilmType", value)
 
     """"Identifies the file object containing the project"""
 
@@ -172,7 +211,7 @@ class Project(PydobeBaseObject):
     def footage_timecode_display_start_type(self, value: int):
         if type(value) == str:
             value = footage_start_time_dictionary[value]
-        self._eval_on_object(f"footageTimecodeDisplayStartType = {value}")
+        self._set_property("footageTimecodeDisplayStartType", value)
 
     """The frame count menu setting"""
 
@@ -187,7 +226,7 @@ class Project(PydobeBaseObject):
     def frames_count_type(self, value: int):
         if type(value) == str:
             value = frames_count_dictionary[value]
-        self._eval_on_object(f"framesCountType = {value}")
+        self._set_property("framesCountType", value)
 
     """The Use Feet + Frames menu setting - 16mm or 35mm"""
 
@@ -197,8 +236,7 @@ class Project(PydobeBaseObject):
 
     @frames_use_feet_frames.setter
     def frames_use_feet_frames(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"framesUseFeetFrames = {extend_value}")
+        self._set_property("framesUseFeetFrames", value)
 
     """The frame count menu setting"""
 
@@ -212,9 +250,11 @@ class Project(PydobeBaseObject):
     def gpu_accel_type(self, value: int):
         if type(value) == str:
             value = gpu_accel_type_dictionary[value]
-        if value not in pydobe.objects.app.available_gpu_accel_types:
+        # checked against the application of this project, not the default connection
+        app = Application(**eval_script_returning_object("app", self.connection))
+        if value not in app.available_gpu_accel_types:
             raise ValueError("This GPU Acceleration is not available")
-        self._eval_on_object(f"gpuAccelType = {value}")
+        self._set_property("gpuAccelType", value)
 
     """All of the items in the project"""
 
@@ -231,8 +271,7 @@ class Project(PydobeBaseObject):
 
     @linear_blending.setter
     def linear_blending(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"linearBlending = {extend_value}")
+        self._set_property("linearBlending", value)
 
     """True if linearize working space should be enabled for this project"""
 
@@ -242,8 +281,7 @@ class Project(PydobeBaseObject):
 
     @linearize_working_space.setter
     def linearize_working_space(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"linearizeWorkingSpace = {extend_value}")
+        self._set_property("linearizeWorkingSpace", value)
 
     """The number of items within the project"""
 
@@ -296,7 +334,7 @@ class Project(PydobeBaseObject):
     def time_display_type(self, value: int or str):
         if type(value) == str:
             value = time_display_dictionary[value]
-        self._eval_on_object(f"timeDisplayType = {value}")
+        self._set_property("timeDisplayType", value)
 
     """The active tool in the tools panel"""
 
@@ -310,7 +348,7 @@ class Project(PydobeBaseObject):
     def tool_type(self, value: int or str):
         if type(value) == str:
             value = tool_dictionary[value]
-        self._eval_on_object(f"toolType = {value}")
+        self._set_property("toolType", value)
 
     """When true, thumbnail views use the transparency checkerboard pattern."""
 
@@ -320,8 +358,7 @@ class Project(PydobeBaseObject):
 
     @transparency_grid_thumbnails.setter
     def transparency_grid_thumbnails(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"transparencyGridThumbnails = {extend_value}")
+        self._set_property("transparencyGridThumbnails", value)
 
     """Working gamma value. Only used when color working space is set to none"""
 
@@ -334,7 +371,7 @@ class Project(PydobeBaseObject):
         if value not in [2.2, 2.4]:
             raise ValueError("Unable to set 'working_gamma', value must be 2.2 or 2.4")
         else:
-            self._eval_on_object(f'workingGamma = "{value}"')
+            self._set_property("workingGamma", value)
 
     """Color profile description"""
 
@@ -345,7 +382,7 @@ class Project(PydobeBaseObject):
     @working_space.setter
     def working_space(self, value: str):
         if value in self.list_color_profiles():
-            self._eval_on_object(f'workingSpace = "{value}"')
+            self._set_property("workingSpace", value)
         else:
             raise ValueError(
                 "Unable to set 'workingSpace', value must be an accepted color profile"
@@ -359,7 +396,7 @@ class Project(PydobeBaseObject):
 
     @xmp_packet.setter
     def xmp_packet(self, value: str):
-        self._eval_on_object(f'xmpPacket = "{value}"')
+        self._set_property("xmpPacket", value)
 
     # CUSTOM PROPERTIES
 
@@ -367,37 +404,25 @@ class Project(PydobeBaseObject):
 
     @property
     def compositions(self) -> list:
-        composition_items = []
-        for item in self.items:
-            if item.object_type == "CompItem":
-                composition_items.append(item)
-        return composition_items
+        return self.query(type="CompItem")
 
     """All of the footage items within the project"""
 
     @property
     def footages(self) -> list:
-        footage_items = []
-        for item in self.items:
-            if item.object_type == "FootageItem":
-                footage_items.append(item)
-        return footage_items
+        return self.query(type="FootageItem")
 
     """All of the folder items within the project"""
 
     @property
     def folders(self) -> list:
-        folder_items = []
-        for item in self.items:
-            if item.object_type == "FolderItem":
-                folder_items.append(item)
-        return folder_items
+        return self.query(type="FolderItem")
 
     # FUNCTIONS
 
     def auto_fix_expressions(self, old_text, new_text):
         """Automatically replaces text found in broken expressions in the project"""
-        self._eval_on_object(f'autoFixExpressions("{old_text}", "{new_text})')
+        self._call_method("autoFixExpressions", old_text, new_text)
 
     def close(self, save: bool = None) -> bool:
         """This will close the current project with an option to save changes or not"""
@@ -417,16 +442,44 @@ class Project(PydobeBaseObject):
     ):
         """This will import a file"""
         import_options = ImportOptions(
-            **eval_script_returning_object("new ImportOptions()")
+            **eval_script_returning_object("new ImportOptions()", self.connection)
+        )
+        file = File(
+            **eval_script_returning_object(
+                f"File({format_to_extend(path)})", self.connection
+            )
         )
-        file = File(**eval_script_returning_object(f'File("{path}")'))
         import_options.file = file
         import_options.sequence = sequence
         import_options.force_alphabetical = force_alphabetical
-        extend_import_options = format_to_extend(import_options)
-        kwargs = self._eval_on_object(f"importFile({extend_import_options})")
+        kwargs = self._call_method("importFile", import_options)
         return FootageItem(**kwargs) if kwargs else None
 
+    def import_files(
+            self,
+            paths: list,
+            sequence: bool = None,
+            folder: FolderItem = None,
+            force_alphabetical: bool = False,
+    ) -> list[ImportResult]:
+        """Import several files in a single request, once their paths are checked in a thread pool.
+        Image sequences are detected when `sequence` is None, imported items are moved to the folder if given.
+        Returns an ImportResult for every path, in order, holding the imported item or the error"""
+        results = check_import_paths([str(path) for path in paths], sequence)
+        import_checked_files(
+            f"$._pydobe['{self.pydobe_id}']",
+            results,
+            force_alphabetical,
+            format_to_extend(folder) if folder is not None else None,
+            self.connection,
+        )
+        for result in results:
+            if result.item is not None:
+                result.item = create_python_object(result.item["object_type"])(
+                    **result.item
+                )
+        return results
+
     def import_file_with_dialog(self) -> list:
         """Shows an import file dialog box"""
         return self._eval_on_object("importFileWithDialog()")
@@ -442,9 +495,9 @@ class Project(PydobeBaseObject):
     ) -> object:
         """Shows an import file dialog box"""
         if duration_in_current_format:
-            duration = time_to_current_format(duration, frame_rate)
-        kwargs = self._eval_on_object(
-            f'importPlaceholder("{name}", {width}, {height}, {frame_rate}, {duration})'
+            duration = time_to_current_format(duration, frame_rate, self.connection)
+        kwargs = self._call_method(
+            "importPlaceholder", name, width, height, frame_rate, duration
         )
         return FootageItem(**kwargs) if kwargs else None
 
@@ -459,6 +512,8 @@ class Project(PydobeBaseObject):
     def item_by_id(self, item_id: int) -> Item:
         """Retrieves an item by its ID"""
         kwargs = self._eval_on_object(f"itemByID({item_id})")
+        if not kwargs or kwargs.get("error"):
+            raise LookupError(f"There is no item with the id {item_id} in your project")
         object_type = kwargs["object_type"]
         item = create_python_object(object_type)(**kwargs)
         return item
@@ -472,8 +527,7 @@ class Project(PydobeBaseObject):
 
     def reduce_project(self, items: list[Item]) -> int:
         """Removes all items from the project except those specified"""
-        extend_items = format_to_extend(items)
-        return self._eval_on_object(f"reduceProject({extend_items})")
+        return self._call_method("reduceProject", items)
 
     def remove_unused_footage(self) -> int:
         """Removes unused footage from the project"""
@@ -481,16 +535,22 @@ class Project(PydobeBaseObject):
 
     def set_default_import_folder(self, path: str) -> bool:
         """Sets the folder that will be shown in the file import dialog"""
-        folder = Folder(**eval_script_returning_object(f'Folder("{path}")'))
-        extend_folder = format_to_extend(folder)
-        return self._eval_on_object(f"setDefaultImportFolder({extend_folder})")
+        folder = Folder(
+            **eval_script_returning_object(
+                f"Folder({format_to_extend(path)})", self.connection
+            )
+        )
+        return self._call_method("setDefaultImportFolder", folder)
 
     def save(self, path: str = None) -> bool:
         """This will save the current scene"""
         if path:
-            file = File(**eval_script_returning_object(f'File("{path}")'))
-            extend_file_object = format_to_extend(file)
-            return self._eval_on_object(f"save({extend_file_object})")
+            file = File(
+                **eval_script_returning_object(
+                    f"File({format_to_extend(path)})", self.connection
+                )
+            )
+            return self._call_method("save", file)
         else:
             return self._eval_on_object("save()")
 
@@ -500,8 +560,7 @@ class Project(PydobeBaseObject):
 
     def show_window(self, show: bool):
         """Shows or hides the Project panel."""
-        extend_show = format_to_extend(show)
-        return self._eval_on_object(f"showWindow({extend_show})")
+        return self._call_method("showWindow", show)
 
     def list_color_profiles(self) -> list[list]:
         """List of available color profile descriptions"""
@@ -509,24 +568,133 @@ class Project(PydobeBaseObject):
 
     # CUSTOM FUNCTIONS
 
-    def item_by_name(self, name: str) -> Item:
-        """Get an item by its name from within this project"""
-        for item in self.items:
-            if item.name == name:
-                return item
-        raise LookupError("There is no item by this name in your project")
+    def item_by_name(self, name: str, folder: FolderItem or str = None) -> Item:
+        """Get an item by its name from within this project.
+        If a folder, or the path of a folder, is given only the items directly inside it are considered"""
+        items = self.items_by_name(name, folder)
+        if not items:
+            raise LookupError("There is no item by this name in your project")
+        return items[0]
+
+    def items_by_name(self, name: str, folder: FolderItem or str = None) -> list[Item]:
+        """Get every item with this name from within this project.
+        If a folder, or the path of a folder, is given only the items directly inside it are considered"""
+
+        def lookup(index):
+            if folder is None:
+                return index.ids_by_name(name)
+            if isinstance(folder, str):
+                folder_id = index.id_by_path(folder) if folder.strip("/") else index.root_id
+                if folder_id is None:
+                    return []
+            else:
+                folder_id = folder.id
+            return index.ids_by_name(name, folder_id)
+
+        return self._items_from_index(lookup)
+
+    def item_by_path(self, path: str) -> Item:
+        """Get an item by its path from the root folder, such as "Footage/Plates/shot_010" """
+
+        def lookup(index):
+            item_id = index.id_by_path(path)
+            return [] if item_id is None else [item_id]
+
+        items = self._items_from_index(lookup)
+        if not items:
+            raise LookupError(f"There is no item at '{path}' in your project")
+        return items[0]
+
+    def query(
+            self,
+            type=None,
+            name_glob: str = None,
+            label: int or str = None,
+            parent: FolderItem = None,
+    ) -> list[Item]:
+        """Items matching every given filter, filtered by After Effects in a single request.
+        The type can be a type name, a class such as AVItem, or a list of them.
+        When a parent folder is given, only the items directly inside it are considered"""
+        owner = parent if parent is not None else self
+        return _query(owner, type, name_glob, label)
+
+    def item_index(self, refresh: bool = False) -> ItemIndex:
+        """Index of the names, parent folders and types of every item, built in a single request.
+        The index is shared by the Project objects of a connection,
+        and kept until the project revision changes or another project is opened"""
+        index = item_indexes.get(self.connection)
+        if index is None or refresh:
+            project_line = f"$._pydobe['{self.pydobe_id}']"
+            index = item_indexes[self.connection] = build_item_index(
+                project_line, self.connection
+            )
+        return index
+
+    def _items_from_index(self, lookup) -> list[Item]:
+        """Items with the ids found by the lookup in the index, checking the index is up to date
+        in the same request, and rebuilding it if it is not"""
+        project_line = f"$._pydobe['{self.pydobe_id}']"
+        index = self.item_index()
+        kwargs_list = lookup_items(project_line, index, lookup(index), self.connection)
+        if kwargs_list is None:
+            index = self.item_index(refresh=True)
+            kwargs_list = lookup_items(
+                project_line, index, lookup(index), self.connection
+            )
+        return [
+            create_python_object(kwargs["object_type"])(**kwargs)
+            for kwargs in kwargs_list or []
+        ]
 
     def save_incremental(self):
         """Save incremental"""
         self._execute_command("app.executeCommand(3088)")
 
+    def snapshot(
+            self,
+            fields: tuple = DEFAULT_ITEM_FIELDS,
+            layer_fields: tuple = DEFAULT_LAYER_FIELDS,
+            include_layers: bool = True,
+    ) -> ProjectSnapshot:
+        """Read-only tree of every item and layer in the project, with the given fields, read in a single request.
+        Fields are named as the attributes of Item and Layer objects, items are referenced by their id"""
+        return take_snapshot(
+            f"$._pydobe['{self.pydobe_id}']",
+            fields,
+            layer_fields,
+            include_layers,
+            self.connection,
+        )
+
+    def transaction(self, name: str = "pydobe") -> Transaction:
+        """Queue the setters called within the block and apply them in a single request when leaving it,
+        as a single undo step with the given name. The errors of the setters are listed in `errors`"""
+        return Transaction(name, self.connection)
+
+
+def _query(
+        owner: Project or FolderItem, object_type, name_glob: str, label: int or str
+) -> list[Item]:
+    """Items of the project or folder matching the filters"""
+    if isinstance(label, str):
+        label = label_dictionary[label]
+    items_line = f"$._pydobe['{owner.pydobe_id}'].items"
+    kwargs_list = query_items(
+        items_line, object_type, name_glob, label, owner.connection
+    )
+    return [
+        create_python_object(kwargs["object_type"])(**kwargs) for kwargs in kwargs_list
+    ]
+
 
 # ITEMS
 
 
 class Item(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    transaction_setters = True
+
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     def __str__(self):
         return self.name
@@ -541,7 +709,7 @@ class Item(PydobeBaseObject):
 
     @comment.setter
     def comment(self, value: str):
-        self._eval_on_object(f'comment = "{value}"')
+        self._set_property("comment", value)
 
     """A unique and persistent identification number used for the dynamic link"""
 
@@ -581,7 +749,7 @@ class Item(PydobeBaseObject):
                     "Cannot set label, value is not an available label color"
                 )
             int_value = label_dictionary[value]
-        self._eval_on_object(f"label = {int_value};")
+        self._set_property("label", int_value)
 
     """The name of the item as displayed in the Project panel"""
 
@@ -591,7 +759,7 @@ class Item(PydobeBaseObject):
 
     @name.setter
     def name(self, value: str):
-        self._eval_on_object(f'name = "{value}"')
+        self._set_property("name", value)
 
     """The folder object that the item is parented to"""
 
@@ -603,8 +771,7 @@ class Item(PydobeBaseObject):
     @parent_folder.setter
     def parent_folder(self, value: FolderItem):
         if value.object_type == "FolderItem":
-            extend_value = format_to_extend(value)
-            self._eval_on_object(f"parentFolder = {extend_value}")
+            self._set_property("parentFolder", value)
         else:
             raise TypeError("Unable to set 'parent_folder', type must be 'Folder'")
 
@@ -616,8 +783,7 @@ class Item(PydobeBaseObject):
 
     @selected.setter
     def selected(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"selected = {extend_value}")
+        self._set_property("selected", value)
 
     """User readable name for Item type"""
 
@@ -629,7 +795,7 @@ class Item(PydobeBaseObject):
 
     def add_guide(self, orientation: int, position: int):
         """Creates a new guide and adds it to the guides object of the Item."""
-        self._eval_on_object(f"addGuide({orientation},{position})")
+        self._call_method("addGuide", orientation, position)
 
     def duplicate(self):
         """Duplicates the Item"""
@@ -651,12 +817,12 @@ class Item(PydobeBaseObject):
         """Modifies the position of an existing guide"""
         if index not in range(len(self.guides)):
             raise ValueError("The index provided is outside of the range of guides")
-        self._eval_on_object(f"setGuide({position}, {index})")
+        self._call_method("setGuide", position, index)
 
 
 class AVItem(Item):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     """Duration of the item in seconds"""
 
@@ -666,7 +832,7 @@ class AVItem(Item):
 
     @duration.setter
     def duration(self, value: float):
-        self._eval_on_object(f"duration = {value}")
+        self._set_property("duration", value)
 
     """When true the item is a placeholder"""
 
@@ -682,7 +848,7 @@ class AVItem(Item):
 
     @frame_duration.setter
     def frame_duration(self, value: float):
-        self._eval_on_object(f"frameDuration = {value}")
+        self._set_property("frameDuration", value)
 
     """The fps of the item, when set the frame duration is automatically set"""
 
@@ -692,7 +858,7 @@ class AVItem(Item):
 
     @frame_rate.setter
     def frame_rate(self, value: float):
-        self._eval_on_object(f"frameRate = {value}")
+        self._set_property("frameRate", value)
 
     """Returns True if the item has an audio component"""
 
@@ -714,7 +880,7 @@ class AVItem(Item):
 
     @height.setter
     def height(self, value: int):
-        self._eval_on_object(f"height = {value}")
+        self._set_property("height", value)
 
     """Test whether the AVItem can be used as an alternate source when calling Property.set_alternate_source()."""
 
@@ -730,7 +896,7 @@ class AVItem(Item):
 
     @pixel_aspect.setter
     def pixel_aspect(self, value: float):
-        self._eval_on_object(f"pixelAspect = {value}")
+        self._set_property("pixelAspect", value)
 
     """The Footage Source being used as a proxy"""
 
@@ -747,7 +913,7 @@ class AVItem(Item):
 
     @time.setter
     def time(self, value: float):
-        self._eval_on_object(f'time = "{value}"')
+        self._set_property("time", value)
 
     """A list of compositions that use this item"""
 
@@ -768,8 +934,7 @@ class AVItem(Item):
 
     @use_proxy.setter
     def use_proxy(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f'useProxy = "{extend_value}"')
+        self._set_property("useProxy", value)
 
     """The width of the item in pixels"""
 
@@ -779,35 +944,38 @@ class AVItem(Item):
 
     @width.setter
     def width(self, value: int):
-        self._eval_on_object(f"width = {value}")
+        self._set_property("width", value)
 
     # CUSTOM PROPERTIES
 
     @property
     def time_in_current_format(self) -> str:
-        return time_to_current_format(self.time, self.frame_rate)
+        return time_to_current_format(self.time, self.frame_rate, self.connection)
 
     @time_in_current_format.setter
     def time_in_current_format(self, value: str):
-        value = current_format_to_time(value, self.frame_rate)
-        self._eval_on_object(f'time = "{value}"')
+        value = current_format_to_time(value, self.frame_rate, self.connection)
+        self._set_property("time", value)
 
     @property
     def duration_in_current_format(self) -> str:
-        return time_to_current_format(self.duration, self.frame_rate)
+        return time_to_current_format(self.duration, self.frame_rate, self.connection)
 
     @duration_in_current_format.setter
     def duration_in_current_format(self, value: str):
-        value = current_format_to_time(value, self.frame_rate)
-        self._eval_on_object(f'duration = "{value}"')
+        value = current_format_to_time(value, self.frame_rate, self.connection)
+        self._set_property("duration", value)
 
     # FUNCTIONS
 
     def set_proxy(self, file_path: str):
         """Sets a file as the proxy of this AVItem."""
-        file = File(**eval_script_returning_object(f'File("{file_path}")'))
-        extend_file_object = format_to_extend(file)
-        self._eval_on_object(f"setProxy({extend_file_object})")
+        file = File(
+            **eval_script_returning_object(
+                f"File({format_to_extend(file_path)})", self.connection
+            )
+        )
+        self._call_method("setProxy", file)
 
     def set_proxy_to_none(self):
         """Removes the proxy from this AVItem"""
@@ -818,31 +986,31 @@ class AVItem(Item):
     ):
         """Creates a PlaceholderSource object with specified values, sets this as the value of the proxySource
         attribute"""
-        self._eval_on_object(
-            f'setProxyWithPlaceholder("{name}", {width}, {height}, {frame_rate}, {duration})'
+        self._call_method(
+            "setProxyWithPlaceholder", name, width, height, frame_rate, duration
         )
 
     def set_proxy_with_sequence(self, file_path: str, force_alphabetical: bool = False):
         """Sets a sequence of files as the proxy of this AVItem"""
-        file = File(**eval_script_returning_object(f'File("{file_path}")'))
-        extend_file_object = format_to_extend(file)
-        extend_force_alphabetical = format_to_extend(force_alphabetical)
-        self._eval_on_object(
-            f"setProxyWithSequence({extend_file_object}, {extend_force_alphabetical})"
+        file = File(
+            **eval_script_returning_object(
+                f"File({format_to_extend(file_path)})", self.connection
+            )
         )
+        self._call_method("setProxyWithSequence", file, force_alphabetical)
 
     def set_proxy_with_solid(
             self, color: list, name: str, width: int, height: int, pixel_aspect: float
     ):
         """Creates a SolidSource object with specified values, sets this as the value of the proxySource attribute"""
-        self._eval_on_object(
-            f'setProxyWithSolid({color}, "{name}", {width}, {height}, {pixel_aspect})'
+        self._call_method(
+            "setProxyWithSolid", color, name, width, height, pixel_aspect
         )
 
 
 class CompItem(AVItem):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -863,7 +1031,7 @@ class CompItem(AVItem):
     def bg_color(self, value: list or str):
         if type(value) == str:
             value = hex_to_rgb(value)
-        self._eval_on_object(f"bgColor = {value}")
+        self._set_property("bgColor", value)
 
     """The time set as the beginning of the composition in frames"""
 
@@ -873,7 +1041,7 @@ class CompItem(AVItem):
 
     @display_start_frame.setter
     def display_start_frame(self, value: int):
-        self._eval_on_object(f"displayStartFrame = {value}")
+        self._set_property("displayStartFrame", value)
 
     """The time set as the beginning of the composition in seconds"""
 
@@ -883,7 +1051,7 @@ class CompItem(AVItem):
 
     @display_start_time.setter
     def display_start_time(self, value: float):
-        self._eval_on_object(f"displayStartTime = {value}")
+        self._set_property("displayStartTime", value)
 
     """When true, Draft 3D mode is enabled for the Composition panel."""
 
@@ -893,8 +1061,7 @@ class CompItem(AVItem):
 
     @draft_3d.setter
     def draft_3d(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"draft3d = {extend_value}")
+        self._set_property("draft3d", value)
 
     """When true, indicates that the composition uses drop-frame timecode."""
 
@@ -904,8 +1071,7 @@ class CompItem(AVItem):
 
     @drop_frame.setter
     def drop_frame(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"dropFrame = {extend_value}")
+        self._set_property("dropFrame", value)
 
     """When true, frame blending is enabled for this Composition."""
 
@@ -915,8 +1081,7 @@ class CompItem(AVItem):
 
     @frame_blending.setter
     def frame_blending(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"frameBlending = {extend_value}")
+        self._set_property("frameBlending", value)
 
     """The duration of a frame, in seconds. This is the inverse of the frameRate value"""
 
@@ -926,7 +1091,7 @@ class CompItem(AVItem):
 
     @frame_duration.setter
     def frame_duration(self, value: float):
-        self._eval_on_object(f"frameDuration = {value}")
+        self._set_property("frameDuration", value)
 
     """When true, only layers with shy set to false are shown in the Timeline panel"""
 
@@ -936,8 +1101,7 @@ class CompItem(AVItem):
 
     @hide_shy_layers.setter
     def hide_shy_layers(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"hideShyLayers = {extend_value}")
+        self._set_property("hideShyLayers", value)
 
     """All of the layers in the composition"""
 
@@ -961,8 +1125,7 @@ class CompItem(AVItem):
 
     @motion_blur.setter
     def motion_blur(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"motionBlur = {extend_value}")
+        self._set_property("motionBlur", value)
 
     """The maximum number of motion blur samples of 2D layer motion."""
 
@@ -976,7 +1139,7 @@ class CompItem(AVItem):
             raise ValueError(
                 "Cannot set motion blur adaptive sample limit, value must be between 16 and 256"
             )
-        self._eval_on_object(f"motionBlurAdaptiveSampleLimit = {value}")
+        self._set_property("motionBlurAdaptiveSampleLimit", value)
 
     """The minimum number of motion blur samples per frame for Classic 3D layers, shape layers, and certain effects"""
 
@@ -990,7 +1153,7 @@ class CompItem(AVItem):
             raise ValueError(
                 "Cannot set motion blur adaptive sample limit, value must be between 2 and 64"
             )
-        self._eval_on_object(f"motionBlurSamplesPerFrame = {value}")
+        self._set_property("motionBlurSamplesPerFrame", value)
 
     """The number of properties in the Essential Graphics panel for the composition"""
 
@@ -1006,7 +1169,7 @@ class CompItem(AVItem):
 
     @motion_graphics_template_name.setter
     def motion_graphics_template_name(self, value: str):
-        self._eval_on_object(f'motionGraphicsTemplateName = "{value}"')
+        self._set_property("motionGraphicsTemplateName", value)
 
     """The number of Layers in the Composition"""
 
@@ -1022,8 +1185,7 @@ class CompItem(AVItem):
 
     @preserve_nested_frame_rate.setter
     def preserve_nested_frame_rate(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"preserveNestedFrameRate = {extend_value}")
+        self._set_property("preserveNestedFrameRate", value)
 
     """When true, the resolution of nested compositions is preserved in the current composition."""
 
@@ -1033,8 +1195,7 @@ class CompItem(AVItem):
 
     @preserve_nested_resolution.setter
     def preserve_nested_resolution(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"preserveNestedResolution = {extend_value}")
+        self._set_property("preserveNestedResolution", value)
 
     """The current rendering plug-in module to be used to render this composition"""
 
@@ -1046,8 +1207,7 @@ class CompItem(AVItem):
     def renderer(self, value: str):
         if value not in self.renderers:
             raise ValueError(f"{value} is not a valid renderer")
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"renderer = {extend_value}")
+        self._set_property("renderer", value)
 
     """The available rendering plugin modules"""
 
@@ -1063,7 +1223,7 @@ class CompItem(AVItem):
 
     @resolution_factor.setter
     def resolution_factor(self, value: list[int]):
-        self._eval_on_object(f"resolutionFactor = {value}")
+        self._set_property("resolutionFactor", value)
 
     """All of the selected layers in this composition."""
 
@@ -1104,7 +1264,7 @@ class CompItem(AVItem):
             raise ValueError(
                 "Cannot set shutter angle, value must be between 0 and 720"
             )
-        self._eval_on_object(f"shutterAngle = {value}")
+        self._set_property("shutterAngle", value)
 
     """The shutter phase setting for the composition."""
 
@@ -1118,7 +1278,7 @@ class CompItem(AVItem):
             raise ValueError(
                 "Cannot set shutter phase, value must be between -360 and 360"
             )
-        self._eval_on_object(f"shutterPhase = {value}")
+        self._set_property("shutterPhase", value)
 
     """The duration of the work area in seconds"""
 
@@ -1128,7 +1288,7 @@ class CompItem(AVItem):
 
     @work_area_duration.setter
     def work_area_duration(self, value: float):
-        self._eval_on_object(f"workAreaDuration = {value}")
+        self._set_property("workAreaDuration", value)
 
     """The time when the Composition work area begins, in seconds."""
 
@@ -1138,31 +1298,35 @@ class CompItem(AVItem):
 
     @work_area_start.setter
     def work_area_start(self, value: float):
-        self._eval_on_object(f"workAreaStart = {value}")
+        self._set_property("workAreaStart", value)
 
     # CUSTOM PROPERTIES
 
     @property
     def work_area_duration_in_current_format(self) -> str:
         duration = self._eval_on_object("workAreaDuration")
-        formatted_duration = time_to_current_format(duration, self.frame_rate)
+        formatted_duration = time_to_current_format(
+            duration, self.frame_rate, self.connection
+        )
         return formatted_duration
 
     @work_area_duration_in_current_format.setter
     def work_area_duration_in_current_format(self, value: str or int):
-        value = current_format_to_time(value, self.frame_rate)
-        self._eval_on_object(f"workAreaDuration = {value}")
+        value = current_format_to_time(value, self.frame_rate, self.connection)
+        self._set_property("workAreaDuration", value)
 
     @property
     def work_area_start_in_current_format(self) -> str:
         duration = self._eval_on_object("workAreaStart")
-        formatted_duration = time_to_current_format(duration, self.frame_rate)
+        formatted_duration = time_to_current_format(
+            duration, self.frame_rate, self.connection
+        )
         return formatted_duration
 
     @work_area_start_in_current_format.setter
     def work_area_start_in_current_format(self, value: str or int):
-        value = current_format_to_time(value, self.frame_rate)
-        self._eval_on_object(f"workAreaStart = {value}")
+        value = current_format_to_time(value, self.frame_rate, self.connection)
+        self._set_property("workAreaStart", value)
 
     # FUNCTIONS
 
@@ -1170,15 +1334,10 @@ class CompItem(AVItem):
             self, overwrite: bool = True, path: str = None
     ) -> bool:
         """Exports the composition as a Motion Graphics template."""
-        extend_overwrite = format_to_extend(overwrite)
         if path:
-            return self._eval_on_object(
-                f'exportAsMotionGraphicsTemplate({extend_overwrite},"{path}")'
-            )
+            return self._call_method("exportAsMotionGraphicsTemplate", overwrite, path)
         else:
-            return self._eval_on_object(
-                f"exportAsMotionGraphicsTemplate({extend_overwrite})"
-            )
+            return self._call_method("exportAsMotionGraphicsTemplate", overwrite)
 
     def get_motion_graphics_template_controller_name(self, index: int) -> str:
         """Gets the name of a single property in the Essential Graphics panel."""
@@ -1188,21 +1347,20 @@ class CompItem(AVItem):
     def set_get_motion_graphics_controller_name(self, index: int, name: str) -> str:
         """Sets the name of a single property in the Essential Graphics panel."""
         index += 1
-        return self._eval_on_object(
-            f'getMotionGraphicsTemplateControllerName({index}, "{name}")'
+        return self._call_method(
+            "getMotionGraphicsTemplateControllerName", index, name
         )
 
     def layer(self, layer, relative_index=None):
         """Returns a Layer object, which can be specified by name, an index position in this layer,
         or an index position relative to another layer."""
         if relative_index:
-            layer = format_to_extend(layer)
-            kwargs = self._eval_on_object(f"layer({layer}, {relative_index})")
+            kwargs = self._call_method("layer", layer, relative_index)
             if not kwargs.get("pydobe_id"):
                 raise ValueError("The value for the relative index is out of range")
         else:
             if type(layer) == str:
-                kwargs = self._eval_on_object(f'layer("{layer}")')
+                kwargs = self._call_method("layer", layer)
             else:
                 layer += 1
                 kwargs = self._eval_on_object(f"layer({layer})")
@@ -1219,10 +1377,33 @@ class CompItem(AVItem):
         kwargs = self._eval_on_object("openInViewer()")
         return Viewer(**kwargs) if kwargs else None
 
+    def sample(
+            self,
+            start: float,
+            end: float,
+            step: float,
+            properties: tuple = DEFAULT_SAMPLED_PROPERTIES,
+            pre_expression: bool = False,
+    ) -> Samples:
+        """Samples the properties of every layer from start to end, in seconds, every step, in a single request.
+        Properties are named as the attributes of AVLayer, and labelled (layer index, name) in the samples,
+        the first layer having the index 1 as in After Effects.
+        Layers without a property, such as cameras without opacity, are sampled as NaN"""
+        return sample_properties(
+            comp_properties_line(f"$._pydobe['{self.pydobe_id}']", properties),
+            list(properties),
+            start,
+            end,
+            step,
+            pre_expression,
+            per_layer=True,
+            connection=self.connection,
+        )
+
 
 class FolderItem(Item):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1245,34 +1426,29 @@ class FolderItem(Item):
 
     @property
     def compositions(self) -> list:
-        composition_items = []
-        for item in self.items:
-            if item.object_type == "CompItem":
-                composition_items.append(item)
-        return composition_items
+        return self.query(type="CompItem")
 
     """The footage items found in the folder"""
 
     @property
     def footages(self) -> list:
-        footage_items = []
-        for item in self.items:
-            if item.object_type == "FootageItem":
-                footage_items.append(item)
-        return footage_items
+        return self.query(type="FootageItem")
 
     """The folder items found in the folder"""
 
     @property
     def folders(self) -> list:
-        folder_items = []
-        for item in self.items:
-            if item.object_type == "FolderItem":
-                folder_items.append(item)
-        return folder_items
+        return self.query(type="FolderItem")
 
     # FUNCTIONS
 
+    def query(
+            self, type=None, name_glob: str = None, label: int or str = None
+    ) -> list[Item]:
+        """Items directly inside this folder matching every given filter, filtered in a single request.
+        The type can be a type name, a class such as AVItem, or a list of them."""
+        return _query(self, type, name_glob, label)
+
     def item(self, sub_index: int) -> Item:
         """Returns the top-level item in this folder at the specified index position."""
         sub_index += 1
@@ -1283,8 +1459,8 @@ class FolderItem(Item):
 
 
 class FootageItem(AVItem):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1328,7 +1504,7 @@ class FootageItem(AVItem):
     @AVItem.height.setter
     def height(self, value: int):
         if self.main_source.object_type == "SolidSource":
-            self._eval_on_object(f"height = {value}")
+            self._set_property("height", value)
         else:
             raise AttributeError(
                 "Attribute 'height' cannot be set, as the item is neither a comp, nor a solid"
@@ -1337,7 +1513,7 @@ class FootageItem(AVItem):
     @AVItem.width.setter
     def width(self, value: int):
         if self.main_source.object_type == "SolidSource":
-            self._eval_on_object(f"width = {value}")
+            self._set_property("width", value)
         else:
             raise AttributeError(
                 "Attribute 'width' cannot be set, as the item is neither a comp, nor a solid"
@@ -1347,9 +1523,12 @@ class FootageItem(AVItem):
 
     def replace(self, path: str):
         """Changes the source of this Footage Item to the specified file"""
-        file = File(**eval_script_returning_object(f'File("{path}")'))
-        extend_file_object = format_to_extend(file)
-        self._eval_on_object(f"replace({extend_file_object})")
+        file = File(
+            **eval_script_returning_object(
+                f"File({format_to_extend(path)})", self.connection
+            )
+        )
+        self._call_method("replace", file)
 
     def replace_with_placeholder(
             self,
@@ -1362,26 +1541,26 @@ class FootageItem(AVItem):
     ):
         """Changes the source of this FootageItem to the specified placeholder"""
         if duration_in_current_format:
-            duration = current_format_to_time(duration, frame_rate)
-        self._eval_on_object(
-            f'replaceWithPlaceholder("{name}", {width}, {height}, {frame_rate}, {duration})'
+            duration = current_format_to_time(duration, frame_rate, self.connection)
+        self._call_method(
+            "replaceWithPlaceholder", name, width, height, frame_rate, duration
         )
 
     def replace_with_sequence(self, path: str, force_alphabetical: bool = False):
         """Changes the source of this Footage Item to the specified image sequence."""
-        file = File(**eval_script_returning_object(f'File("{path}")'))
-        extend_file_object = format_to_extend(file)
-        force_alphabetical = format_to_extend(force_alphabetical)
-        self._eval_on_object(
-            f"replaceWithSequence({extend_file_object}, {force_alphabetical})"
+        file = File(
+            **eval_script_returning_object(
+                f"File({format_to_extend(path)})", self.connection
+            )
         )
+        self._call_method("replaceWithSequence", file, force_alphabetical)
 
     def replace_with_solid(
             self, color: list, name: str, width: int, height: int, pixel_aspect: float
     ):
         """Changes the source of this FootageItem to the specified solid"""
-        self._eval_on_object(
-            f'replaceWithSolid({color},"{name}", {width}, {height}, {pixel_aspect})'
+        self._call_method(
+            "replaceWithSolid", color, name, width, height, pixel_aspect
         )
 
 
@@ -1389,8 +1568,8 @@ class FootageItem(AVItem):
 
 
 class FootageSource(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1406,7 +1585,7 @@ class FootageSource(PydobeBaseObject):
     def alpha_mode(self, value: str or int):
         if type(value) == str:
             value = alpha_dictionary[value]
-        self._eval_on_object(f"alphaMode = {value}")
+        self._set_property("alphaMode", value)
 
     """A frame rate to use instead of the native frame rate value."""
 
@@ -1416,7 +1595,7 @@ class FootageSource(PydobeBaseObject):
 
     @conform_frame_rate.setter
     def conform_frame_rate(self, value: float):
-        self._eval_on_object(f'conformFrameRate = "{value}"')
+        self._set_property("conformFrameRate", value)
 
     """The effective frame rate as displayed and rendered in compositions by After Effects."""
 
@@ -1436,7 +1615,7 @@ class FootageSource(PydobeBaseObject):
     def field_separation_type(self, value: int or str):
         if type(value) == str:
             value = field_separation_dictionary[value]
-        self._eval_on_object(f"fieldSeparationType = {value}")
+        self._set_property("fieldSeparationType", value)
 
     """When true, the footage has an alpha component."""
 
@@ -1452,8 +1631,7 @@ class FootageSource(PydobeBaseObject):
 
     @high_quality_field_separation.setter
     def high_quality_field_separation(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"highQualityFieldSeparation = {extend_value}")
+        self._set_property("highQualityFieldSeparation", value)
 
     """When true, the footage has an alpha component."""
 
@@ -1463,8 +1641,7 @@ class FootageSource(PydobeBaseObject):
 
     @invert_alpha.setter
     def invert_alpha(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"invertAlpha = {extend_value}")
+        self._set_property("invertAlpha", value)
 
     """When true the footage is still; when false, it has a time-based component."""
 
@@ -1480,7 +1657,7 @@ class FootageSource(PydobeBaseObject):
 
     @loop.setter
     def loop(self, value: int):
-        self._eval_on_object(f"loop = {value}")
+        self._set_property("loop", value)
 
     """The native frame rate of the footage."""
 
@@ -1498,7 +1675,7 @@ class FootageSource(PydobeBaseObject):
     def premul_color(self, value: list or str):
         if type(value) == str:
             value = hex_to_rgb(value)
-        self._eval_on_object(f"premulColor = {value}")
+        self._set_property("premulColor", value)
 
     """How the pulldowns are to be removed when field separation is used"""
 
@@ -1512,7 +1689,7 @@ class FootageSource(PydobeBaseObject):
     def remove_pulldown(self, value: int or str):
         if type(value) == str:
             value = pulldown_dictionary[value]
-        self._eval_on_object(f"removePulldown = {value}")
+        self._set_property("removePulldown", value)
 
     # FUNCTIONS
 
@@ -1529,8 +1706,8 @@ class FootageSource(PydobeBaseObject):
 
 
 class FileSource(FootageSource):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1555,8 +1732,8 @@ class FileSource(FootageSource):
 
 
 class SolidSource(FootageSource):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1570,20 +1747,20 @@ class SolidSource(FootageSource):
     def color(self, value: list or str):
         if type(value) == str:
             value = hex_to_rgb(value)
-        self._eval_on_object(f"color = {value}")
+        self._set_property("color", value)
 
 
 class PlaceholderSource(FootageSource):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
 
 # PROPERTIES
 
 
 class PropertyBase(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1608,8 +1785,7 @@ class PropertyBase(PydobeBaseObject):
 
     @enabled.setter
     def enabled(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"enabled = {extend_value}")
+        self._set_property("enabled", value)
 
     """When true, this property is an effect property group"""
 
@@ -1644,7 +1820,7 @@ class PropertyBase(PydobeBaseObject):
 
     @name.setter
     def name(self, value: str):
-        self._eval_on_object(f'name = "{value}"')
+        self._set_property("name", value)
 
     """The property group that is the parent of this property. Null if this is a layer"""
 
@@ -1661,13 +1837,12 @@ class PropertyBase(PydobeBaseObject):
 
     @selected.setter
     def selected(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"selected = {extend_value}")
+        self._set_property("selected", value)
 
 
 class Property(PropertyBase):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1682,26 +1857,73 @@ class Property(PropertyBase):
     def set_value(self, value):
         value_type = type(self.value)
         if type(value) == value_type:
-            self._eval_on_object(f'setValue ({value})')
+            self._call_method("setValue", value)
         else:
             raise ValueError(f"Unable to set '{self.name}', value must be of type '{value_type.__name__}'")
 
+    def get_keyframes(self) -> Keyframes:
+        """The time, in seconds, and value of every keyframe, read in a single request.
+        Held in NumPy arrays when NumPy is installed, in array.array otherwise"""
+        return read_keyframes(f"$._pydobe['{self.pydobe_id}']", self.connection)
+
+    def set_keyframes(self, times, values) -> int:
+        """Sets keyframes at the times, in seconds, with the values in a single request.
+        Values are numbers, or sequences of numbers for multi-dimensional properties,
+        as lists, array.array or NumPy arrays, flat or not, so the keyframes read by get_keyframes can be
+        written back. Returns the number of keyframes of the property"""
+        return write_keyframes(
+            f"$._pydobe['{self.pydobe_id}']", times, values, self.connection
+        )
+
+    def sample(
+            self, start: float, end: float, step: float, pre_expression: bool = False
+    ) -> Samples:
+        """Samples the value from start to end, in seconds, every step, in a single request.
+        The property is labelled "value" in the samples"""
+        return sample_properties(
+            f"[$._pydobe['{self.pydobe_id}']]",
+            ["value"],
+            start,
+            end,
+            step,
+            pre_expression,
+            connection=self.connection,
+        )
+
 
 class PropertyGroup(PropertyBase):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     @property
     def num_properties(self) -> object:
         return self._eval_on_object('numProperties')
 
+    # FUNCTIONS
+
+    def dump(self, depth: int = None, include_values: bool = True) -> PropertyTree:
+        """Reads this group and every property below it in a single request, down to the depth if given,
+        1 being the direct children. Match names, names, values, expressions and keyframe counts are
+        returned as a tree of records indexed by match name path, such as
+        "ADBE Effect Parade/ADBE Gaussian Blur 2/ADBE Gaussian Blur 2-0001" for a layer"""
+        return read_property_tree(
+            f"$._pydobe['{self.pydobe_id}']", depth, include_values, self.connection
+        )
+
+
+register_object_type("MaskPropertyGroup", PropertyGroup)
+
 
 # LAYERS
 
 
 class Layer(PropertyGroup):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    # Number of properties kept by property_at for each layer, the least recently used being dropped
+    property_path_cache_size = 128
+    transaction_setters = True
+
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -1720,8 +1942,7 @@ class Layer(PropertyGroup):
 
     @locked.setter
     def locked(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"locked = {extend_value}")
+        self._set_property("locked", value)
 
     """If the layer is shy, it will be hidden when hide shy layers is toggled"""
 
@@ -1731,8 +1952,7 @@ class Layer(PropertyGroup):
 
     @shy.setter
     def shy(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"shy = {extend_value}")
+        self._set_property("shy", value)
 
     """When true, the layer is soloed"""
 
@@ -1742,19 +1962,46 @@ class Layer(PropertyGroup):
 
     @solo.setter
     def solo(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"solo = {extend_value}")
+        self._set_property("solo", value)
 
     # FUNCTION
 
+    def clear_property_paths(self):
+        """Forget the properties found by property_at, to be called once effects are added, removed or moved"""
+        self._property_paths = collections.OrderedDict()
+
+    def property_at(self, path: str, refresh: bool = False) -> PropertyBase:
+        """Returns the property at a path of match names or display names separated by '/',
+        such as "ADBE Effect Parade/ADBE Gaussian Blur 2/ADBE Gaussian Blur 2-0001", resolved in a single request.
+        The second effect with a match name is reached with "ADBE Gaussian Blur 2#2", as in a PropertyTree.
+        Properties found are kept for the next calls with the same path, unless refresh is true"""
+        paths = getattr(self, "_property_paths", None)
+        if paths is None:
+            paths = self._property_paths = collections.OrderedDict()
+        key = path.strip("/")
+        prop = paths.get(key)
+        if prop is not None and not refresh:
+            paths.move_to_end(key)
+            return prop
+        kwargs = resolve_property_path(
+            f"$._pydobe['{self.pydobe_id}']", key, self.connection
+        )
+        prop = create_python_object(kwargs["object_type"], PropertyBase)(**kwargs)
+        paths[key] = prop
+        paths.move_to_end(key)
+        while len(paths) > self.property_path_cache_size:
+            paths.popitem(last=False)
+        return prop
+
     def remove(self):
         """Remove a layer from a composition"""
+        self.clear_property_paths()
         self._eval_on_object("remove()")
 
 
 class AVLayer(Layer):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # AE PROPERTIES
 
@@ -1825,8 +2072,7 @@ class AVLayer(Layer):
 
     @adjustment_layer.setter
     def adjustment_layer(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f'adjustmentLayer = {extend_value}')
+        self._set_property("adjustmentLayer", value)
 
     """True if the audio, is active
        Will return False if other layers are solo, or if time is not between layers in and out point"""
@@ -1843,8 +2089,7 @@ class AVLayer(Layer):
 
     @audio_enabled.setter
     def audio_enabled(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f'audioEnabled = {extend_value}')
+        self._set_property("audioEnabled", value)
 
     """The Blending Mode of the Layer"""
 
@@ -1858,7 +2103,7 @@ class AVLayer(Layer):
     def blending_mode(self, value: str or int):
         if type(value) == str:
             value = blending_modes_dictionary[value]
-        self._eval_on_object(f'blendingMode = {value}')
+        self._set_property("blendingMode", value)
 
     """True if it is legal to change the value of collapse transformation"""
 
@@ -1880,8 +2125,7 @@ class AVLayer(Layer):
 
     @collapse_transformation.setter
     def collapse_transformation(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f'collapseTransformation = {extend_value}')
+        self._set_property("collapseTransformation", value)
 
     """True if the layers effects are active"""
 
@@ -1891,8 +2135,7 @@ class AVLayer(Layer):
 
     @effects_active.setter
     def effects_active(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f'effectsActive = {extend_value}')
+        self._set_property("effectsActive", value)
 
     """True if this is an environment layer in a Ray-traced 3D composition"""
 
@@ -1902,8 +2145,7 @@ class AVLayer(Layer):
 
     @environment_layer.setter
     def environment_layer(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f'environmentLayer = {extend_value}')
+        self._set_property("environmentLayer", value)
 
     """True if frame blending is enabled for the layer."""
 
@@ -1923,7 +2165,7 @@ class AVLayer(Layer):
     def frame_blending_type(self, value: int or str):
         if type(value) == str:
             value = frame_blending_dictionary[value]
-        self._eval_on_object(f"frameBlendingType = {value}")
+        self._set_property("frameBlendingType", value)
 
     """True if the layer is a guide layer"""
 
@@ -1969,8 +2211,7 @@ class AVLayer(Layer):
 
     @motion_blur.setter
     def motion_blur(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"motionBlur = {extend_value}")
+        self._set_property("motionBlur", value)
 
     """True if preserve transparency is enabled for the layer"""
 
@@ -1980,8 +2221,7 @@ class AVLayer(Layer):
 
     @preserve_transparency.setter
     def preserve_transparency(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"preserveTransparency = {extend_value}")
+        self._set_property("preserveTransparency", value)
 
     """The source AVItem for this layer"""
 
@@ -1997,45 +2237,74 @@ class AVLayer(Layer):
     def width(self) -> float:
         return self._eval_on_object('width')
 
+    # FUNCTIONS
+
+    def sample(
+            self,
+            start: float,
+            end: float,
+            step: float,
+            properties: tuple = DEFAULT_SAMPLED_PROPERTIES,
+            pre_expression: bool = False,
+    ) -> Samples:
+        """Samples the properties from start to end, in seconds, every step, in a single request.
+        Properties are named as the attributes of AVLayer, such as "anchor_point", or given as Property objects,
+        and labelled as given in the samples"""
+        lines = [
+            format_to_extend(prop)
+            if isinstance(prop, PydobeBaseObject)
+            else f"$._pydobe['{self.pydobe_id}'].{to_extend_name(prop)}"
+            for prop in properties
+        ]
+        return sample_properties(
+            f"[{', '.join(lines)}]",
+            list(properties),
+            start,
+            end,
+            step,
+            pre_expression,
+            connection=self.connection,
+        )
+
 
 class CameraLayer(Layer):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
 
 class LightLayer(Layer):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
 
 class ShapeLayer(AVLayer):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
 
 class TextLayer(AVLayer):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
 
 # RENDER
 
 
 class RenderQueue(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
 
 # COLLECTIONS
 
 
 class ItemCollection(PydobeBaseCollection):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type, "length")
+    index_offset = 1
 
-    def __getitem__(self, index: int):
-        index = index + 1
-        kwargs = super(ItemCollection, self).__getitem__(index)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, "length", connection)
+
+    def _create_element(self, kwargs: dict):
         object_type = kwargs["object_type"]
         item = create_python_object(object_type)(**kwargs)
         return item
@@ -2054,69 +2323,80 @@ class ItemCollection(PydobeBaseCollection):
     ) -> CompItem:
         """Add a new Composition to the project"""
         if duration_in_current_format:
-            duration = current_format_to_time(duration, frame_rate)
-        kwargs = self._eval_on_object(
-            f'addComp("{name}", {width}, {height}, {aspect_ratio}, {duration}, {frame_rate})'
+            duration = current_format_to_time(duration, frame_rate, self.connection)
+        kwargs = self._call_method(
+            "addComp", name, width, height, aspect_ratio, duration, frame_rate
         )
         return CompItem(**kwargs) if kwargs else None
 
     def add_folder(self, name: str) -> FolderItem:
         """Add a new Folder to the project"""
-        kwargs = self._eval_on_object(f'addFolder("{name}")')
+        kwargs = self._call_method("addFolder", name)
         return FolderItem(**kwargs) if kwargs else None
 
 
 class LayerCollection(PydobeBaseCollection):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type, "length")
+    index_offset = 1
 
-    def __getitem__(self, index: int):
-        index = index + 1
-        kwargs = super(LayerCollection, self).__getitem__(index)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, "length", connection)
+
+    def _create_element(self, kwargs: dict):
         object_type = kwargs["object_type"]
         layer = create_python_object(object_type)(**kwargs)
         return layer
 
-    def __iter__(self):
-        value = iter([self.__getitem__(i) for i in range(len(self))])
-        return value
-
     # FUNCTIONS
 
     def add(self, item: Item, duration: float = None) -> Layer:
         """Creates a new layer containing a specified Item"""
-        extend_item_object = format_to_extend(item)
         if duration:
-            kwargs = self._eval_on_object(f"add({extend_item_object}, {duration})")
+            kwargs = self._call_method("add", item, duration)
         else:
-            kwargs = self._eval_on_object(f"add({extend_item_object})")
+            kwargs = self._call_method("add", item)
         object_type = kwargs["object_type"]
         layer = create_python_object(object_type)(**kwargs)
         return layer
 
     def add_box_text(self, width: int, height: int) -> TextLayer:
         """Creates a new paragraph text layer"""
-        kwargs = self._eval_on_object(f"addBoxText([{width},{height}])")
+        kwargs = self._call_method("addBoxText", [width, height])
         return TextLayer(**kwargs) if kwargs else None
 
     def add_camera(self, name: str, center_point: list) -> CameraLayer:
         """Creates a new camera layer"""
-        kwargs = self._eval_on_object(f'addCamera("{name}", {center_point})')
+        kwargs = self._call_method("addCamera", name, center_point)
         return CameraLayer(**kwargs) if kwargs else None
 
     def add_light(self, name: str, center_point: list):
         """Creates a new light layer"""
-        kwargs = self._eval_on_object(f'addLight("{name}", {center_point})')
+        kwargs = self._call_method("addLight", name, center_point)
         return LightLayer(**kwargs) if kwargs else None
 
+    def add_many(self, specs: list[dict]) -> list[Layer]:
+        """Creates and configures a layer for every spec in a single request, returning them in order.
+
+        A spec is a dictionary holding its source, one of `item`, `solid` (the solid name), `null`, `text`
+        (the source text) or `shape`, and the attributes of the new layer named as pydobe attributes, such as
+        {"item": footage, "name": "plate", "in_point": 1.5, "blending_mode": "Screen"}.
+        Times are in seconds, see layer_spec_entry for every key.
+        If any spec fails, no layer is added and a RuntimeError lists the failed specs"""
+        kwargs_list = add_layers(
+            f"$._pydobe['{self.pydobe_id}']", specs, self.connection
+        )
+        return [
+            create_python_object(kwargs["object_type"], AVLayer)(**kwargs)
+            for kwargs in kwargs_list
+        ]
+
     def add_null(
             self, duration: float or str, duration_in_current_format: bool = True
     ) -> AVLayer:
         """Creates a new Null layer"""
         if duration_in_current_format:
             frame_rate = self[0].containing_comp.frame_rate
-            duration = time_to_current_format(duration, frame_rate)
-        kwargs = self._eval_on_object(f"addNull({duration})")
+            duration = time_to_current_format(duration, frame_rate, self.connection)
+        kwargs = self._call_method("addNull", duration)
         return AVLayer(**kwargs) if kwargs else None
 
     def add_shape(self) -> ShapeLayer:
@@ -2135,20 +2415,20 @@ class LayerCollection(PydobeBaseCollection):
         """Creates a new Solid layer"""
         if type(color) == str:
             color = hex_to_rgb(color)
-        kwargs = self._eval_on_object(
-            f'addSolid({color}, "{name}", {width}, {height}, {pixel_aspect})'
+        kwargs = self._call_method(
+            "addSolid", color, name, width, height, pixel_aspect
         )
         return LightLayer(**kwargs) if kwargs else None
 
     def add_text(self, source_text: str = "") -> TextLayer:
         """Creates a new Text layer"""
-        kwargs = self._eval_on_object(f'addText("{source_text}")')
+        kwargs = self._call_method("addText", source_text)
         return TextLayer(**kwargs) if kwargs else None
 
     def by_name(self, name: str) -> Layer:
         """Returns the first (topmost) layer found in this collection with the specified name,
         or null if no layer with the given name is found."""
-        kwargs = self._eval_on_object(f'byName("{name}")')
+        kwargs = self._call_method("byName", name)
         object_type = kwargs["object_type"]
         layer = create_python_object(object_type)(**kwargs)
         return layer
@@ -2164,12 +2444,9 @@ class LayerCollection(PydobeBaseCollection):
             )
         indices = [index + 1 for index in indices]
         if not move_attributes:
-            extend_move_attributes = format_to_extend(move_attributes)
-            kwargs = self._eval_on_object(
-                f'precompose({indices}, "{name}", "{extend_move_attributes}")'
-            )
+            kwargs = self._call_method("precompose", indices, name, move_attributes)
         else:
-            kwargs = self._eval_on_object(f'precompose({indices}, "{name}")')
+            kwargs = self._call_method("precompose", indices, name)
         return CompItem(**kwargs) if kwargs else None
 
 
@@ -2177,8 +2454,8 @@ class LayerCollection(PydobeBaseCollection):
 
 
 class ImportOptions(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     """The file object to be imported"""
 
@@ -2189,8 +2466,7 @@ class ImportOptions(PydobeBaseObject):
 
     @file.setter
     def file(self, value: File):
-        extend_object = format_to_extend(value)
-        self._eval_on_object(f"file = {extend_object}")
+        self._set_property("file", value)
 
     """Creates sequence from available files in alphabetical order with no gaps"""
 
@@ -2200,8 +2476,7 @@ class ImportOptions(PydobeBaseObject):
 
     @force_alphabetical.setter
     def force_alphabetical(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"forceAlphabetical = {extend_value}")
+        self._set_property("forceAlphabetical", value)
 
     """Import as sequence"""
 
@@ -2211,13 +2486,12 @@ class ImportOptions(PydobeBaseObject):
 
     @sequence.setter
     def sequence(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"sequence = {extend_value}")
+        self._set_property("sequence", value)
 
 
 class Viewer(PydobeBaseObject):
-    def __init__(self, pydobe_id=None, object_type=None):
-        super().__init__(pydobe_id, object_type)
+    def __init__(self, pydobe_id=None, object_type=None, connection=None):
+        super().__init__(pydobe_id, object_type, connection)
 
     # PROPERTIES
 
@@ -2235,8 +2509,7 @@ class Viewer(PydobeBaseObject):
 
     @maximised.setter
     def maximised(self, value: bool):
-        extend_value = format_to_extend(value)
-        self._eval_on_object(f"maximized = {extend_value}")
+        self._set_property("maximized", value)
 
     # FUNCTIONS
 
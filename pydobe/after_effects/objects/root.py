@@ -1,14 +1,16 @@
 from pydobe.after_effects.objects.ae_objects import Application
-from pydobe.core import eval_script_returning_object, is_port_open
+from pydobe.core import Connection, eval_script_returning_object, get_connection
 
 
 class Root(object):
-    def __init__(self):
+    def __init__(self, connection: Connection = None):
         super(Root, self).__init__()
-        is_port_open()
+        # the panel is only checked for once the application is first used
+        self.connection = get_connection(connection)
 
     """ The application object """
 
     @property
     def app(self):
-        return Application(**eval_script_returning_object("app"))
+        self.connection.check()
+        return Application(**eval_script_returning_object("app", self.connection))
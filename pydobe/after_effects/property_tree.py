@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+
+from pydobe.core import Connection, eval_script, eval_script_returning_object
+from pydobe.library import library
+
+# ExtendScript traversal of a property group, returning a row for the group and every property below it.
+# A row holds the row of its parent, its index, whether it is a group, its match name, name, enabled state,
+# number of keyframes, expression, expression state and value, values being written as JSON
+PROPERTY_TREE_FUNCTION = """(function(group, depth, includeValues){
+    var value = function(v){
+        if(v === undefined || v === null){return 'null'}
+        if(typeof v === 'number'){return isFinite(v) ? String(v) : 'null'}
+        if(typeof v === 'boolean'){return String(v)}
+        if(typeof v === 'string'){return ExtendJSON.stringify(v)}
+        if(v instanceof Array){
+            var parts = [];
+            for(var i = 0; i < v.length; i++){parts.push(value(v[i]))}
+            return '[' + parts.join(',') + ']';
+        }
+        return 'null';
+    };
+    var read = function(property, name){
+        try{return value(property[name])}catch(e){return 'null'}
+    };
+    var rows = [];
+    var visit = function(property, parent, level){
+        var row = rows.length;
+        var isGroup = property.propertyType !== PropertyType.PROPERTY;
+        rows.push('[' + [
+            parent,
+            value(property.propertyIndex),
+            isGroup,
+            value(property.matchName),
+            value(property.name),
+            read(property, 'enabled'),
+            isGroup ? 0 : property.numKeys,
+            isGroup ? 'null' : read(property, 'expression'),
+            isGroup ? 'false' : read(property, 'expressionEnabled'),
+            isGroup || !includeValues ? 'null' : read(property, 'value')
+        ].join(',') + ']');
+        if(isGroup && (depth < 0 || level < depth)){
+            for(var i = 1; i <= property.numProperties; i++){visit(property.property(i), row, level + 1)}
+        }
+    };
+    visit(group, -1, 0);
+    return '[' + rows.join(',') + ']';
+})"""
+library.register("propertyTree", PROPERTY_TREE_FUNCTION)
+
+# ExtendScript resolving a path of match names or display names from a property group,
+# returning the property, or "missing:" followed by the part of the path which could not be found
+PROPERTY_AT_FUNCTION = """(function(group, names){
+    var property = group;
+    for(var i = 0; i < names.length; i++){
+        var name = names[i];
+        var occurrence = 1;
+        var match = /^(.*)#(\\d+)$/.exec(name);
+        if(match){
+            name = match[1];
+            occurrence = parseInt(match[2], 10);
+        }
+        var found = null;
+        if(occurrence === 1){
+            found = property.property(name);
+        } else {
+            for(var j = 1; j <= property.numProperties; j++){
+                var child = property.property(j);
+                if(child.matchName === name && --occurrence === 0){
+                    found = child;
+                    break;
+                }
+            }
+        }
+        if(!found){return "missing:" + names.slice(0, i + 1).join("/")}
+        property = found;
+    }
+    return property;
+})"""
+library.register("propertyAt", PROPERTY_AT_FUNCTION)
+
+
+class PropertyRecord(object):
+    """A property or property group, as it was when the tree was read.
+
+    `path` is the match names from the group the tree was read from, separated by '/'.
+    Match names repeated within a group, such as an effect applied twice, are followed by
+    '#2', '#3'... from their second occurrence"""
+
+    __slots__ = (
+        "path",
+        "index",
+        "is_group",
+        "match_name",
+        "name",
+        "enabled",
+        "num_keys",
+        "expression",
+        "expression_enabled",
+        "value",
+        "parent",
+        "children",
+    )
+
+    def __init__(self, path: str, row: list, parent: PropertyRecord = None):
+        self.path = path
+        (
+            _,
+            self.index,
+            self.is_group,
+            self.match_name,
+            self.name,
+            self.enabled,
+            self.num_keys,
+            self.expression,
+            self.expression_enabled,
+            self.value,
+        ) = row
+        self.parent = parent
+        self.children = ()
+
+    def __repr__(self) -> str:
+        kind = "PropertyGroup" if self.is_group else "Property"
+        return f"<{kind}Record '{self.path or self.match_name}'>"
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def walk(self):
+        """This record and every record below it, depth first"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class PropertyTree(object):
+    """Tree of a property group and the properties below it, as it was when read in a single request.
+    Records are indexed by their match name path"""
+
+    __slots__ = ("root", "paths")
+
+    def __init__(self, root: PropertyRecord, paths: dict):
+        self.root = root
+        self.paths = paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self):
+        return self.root.walk()
+
+    def __contains__(self, path: str) -> bool:
+        return path.strip("/") in self.paths
+
+    def __getitem__(self, path: str) -> PropertyRecord:
+        return self.paths[path.strip("/")]
+
+    def __repr__(self) -> str:
+        return f"<PropertyTree '{self.root.match_name}', {len(self)} records>"
+
+    def properties(self) -> list[PropertyRecord]:
+        """Every property record, leaving out groups"""
+        return [record for record in self if not record.is_group]
+
+
+def read_property_tree(
+    group_line: str,
+    depth: int = None,
+    include_values: bool = True,
+    connection: Connection = None,
+) -> PropertyTree:
+    """Read the group and the properties below it, down to the depth if given, in a single request"""
+    result = eval_script(
+        library.call(
+            "propertyTree",
+            group_line,
+            str(-1 if depth is None else depth),
+            json.dumps(include_values),
+        ),
+        connection,
+    )
+    if not isinstance(result, list):
+        raise RuntimeError(f"Unable to read the property tree: {result}")
+    return build_property_tree(result)
+
+
+def build_property_tree(rows: list) -> PropertyTree:
+    """Build the tree of records from the rows returned by PROPERTY_TREE_FUNCTION"""
+    records = []
+    children = {}
+    paths = {}
+    occurrences = {}
+    for row in rows:
+        parent_row, match_name = row[0], row[3]
+        if parent_row < 0:
+            record = PropertyRecord("", row)
+        else:
+            parent = records[parent_row]
+            key = (parent_row, match_name)
+            occurrences[key] = occurrences.get(key, 0) + 1
+            if occurrences[key] > 1:
+                match_name = f"{match_name}#{occurrences[key]}"
+            path = f"{parent.path}/{match_name}" if parent.path else match_name
+            record = PropertyRecord(path, row, parent)
+            children.setdefault(parent_row, []).append(record)
+        records.append(record)
+        paths[record.path] = record
+    for row, records_below in children.items():
+        records[row].children = tuple(records_below)
+    return PropertyTree(records[0], paths)
+
+
+def resolve_property_path(
+    group_line: str, path: str, connection: Connection = None
+) -> dict:
+    """Keyword arguments of the property at the path from the group, resolved in a single request.
+    The path is made of match names or display names separated by '/', as in a PropertyTree
+    """
+    names = [name for name in path.split("/") if name]
+    result = eval_script_returning_object(
+        library.call("propertyAt", group_line, json.dumps(names)) + ";", connection
+    )
+    if isinstance(result, str) and result.startswith("missing:"):
+        raise LookupError(f"There is no property at '{result[len('missing:'):]}'")
+    if not isinstance(result, dict) or result.get("error"):
+        raise RuntimeError(f"Unable to resolve the property path '{path}': {result}")
+    return result
@@ -2,7 +2,10 @@
 function SetupConnection() {
     var http = require('http');
     var hostname = '127.0.0.1';
-    var port = 2000;
+    // the port can be set with the PYDOBE_PORT environment variable of After Effects,
+    // further instances use the next free port so that several of them can run side by side
+    var port = Number(process.env.PYDOBE_PORT) || 2000;
+    var lastPort = port + 9;
 
     function handleConnection(req, res){
         res.statusCode = 200;
@@ -19,7 +22,7 @@ function SetupConnection() {
             })
             req.on('end', function(){
                 // when everything is downloaded, send it to extend script, sending back the response
-                var parsed_data = JSON.parse(data);
+                var parsed_data = JSON.parse(Buffer.concat(data).toString('utf8'));
                 console.log("\nExtendScript code to be executed :")
                 console.log(parsed_data["to_eval"]);
                 var cs = new CSInterface;
@@ -36,6 +39,16 @@ function SetupConnection() {
 
     var server = http.createServer(handleConnection);
 
+    server.on('error', function(error){
+        if(error.code === 'EADDRINUSE' && port < lastPort){
+            console.log('Port ' + String(port) + ' is in use, trying the next one');
+            port += 1;
+            server.listen(port, hostname);
+        } else {
+            console.log('Server could not start: ' + String(error));
+        }
+    });
+
     server.listen(port, hostname, function(){
       console.log('Server running at http://' + String(hostname) + ':' + String(port));
     });
@@ -15,16 +15,16 @@ if($.hasOwnProperty('_pydobe') === false){
 }
 
 // register function to generate new object id for pydobe
+// ids are released by deleting them from $._pydobe, so look them up there instead of in a growing list
 $._pydobe.generateId = function(){
 	var result = '';
 	var characters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789';
 	for (var i = 0; i < 10; i++ ) {
 		result += characters.charAt(Math.floor(Math.random() * characters.length));
 	}
-	if($._pydobe.generatedIds.indexOf(result) >= 0) {
+	if($._pydobe.hasOwnProperty(result)) {
 		result = $._pydobe.generateId();
 	}
-	$._pydobe.generatedIds.push(result);
 	return result;
 }
 
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import weakref
+
+from pydobe.core import (
+    Connection,
+    eval_script,
+    eval_script_returning_object,
+    get_all_subclasses,
+)
+from pydobe.library import library
+from pydobe.utils import glob_to_regex
+
+# ExtendScript filtering the items of an ItemCollection, returning an array of the matching ones
+QUERY_FUNCTION = """(function(items, objectTypes, namePattern, label){
+    var result = [];
+    var pattern = namePattern === null ? null : new RegExp(namePattern);
+    for(var i = 1; i <= items.length; i++){
+        var item = items[i];
+        if(objectTypes !== null && objectTypes.indexOf(item.reflect.name) < 0){continue}
+        if(label !== null && item.label !== label){continue}
+        if(pattern !== null && !pattern.test(item.name)){continue}
+        result.push(item);
+    }
+    return result;
+})"""
+library.register("query", QUERY_FUNCTION)
+
+
+def type_names(object_type) -> list | None:
+    """Names of the ExtendScript types matching a type name, a pydobe class, or several of them"""
+    if object_type is None:
+        return None
+    if isinstance(object_type, (str, type)):
+        object_type = [object_type]
+    names = []
+    for value in object_type:
+        if isinstance(value, str):
+            names.append(value)
+        else:
+            names.append(value.__name__)
+            names.extend(subclass.__name__ for subclass in get_all_subclasses(value))
+    return names
+
+
+def query_items(
+    items_line: str,
+    object_type=None,
+    name_glob: str = None,
+    label: int = None,
+    connection: Connection = None,
+) -> list[dict]:
+    """Filter the items of an ItemCollection in After Effects, in a single request.
+    Returns the keyword arguments of the matching items"""
+    object_types = json.dumps(type_names(object_type))
+    name_pattern = json.dumps(glob_to_regex(name_glob) if name_glob else None)
+    return eval_script_returning_object(
+        library.call("query", items_line, object_types, name_pattern, json.dumps(label))
+        + ";",
+        connection,
+    )
+
+
+# ExtendScript identifying a project: its file, and a token stamped on it as projects opened
+# in the same instance can share a file, when unsaved, and a revision
+PROJECT_KEY_FUNCTION = """(function(project){
+    if(project.pydobeToken === undefined){
+        try{project.pydobeToken = new Date().getTime() + ':' + Math.random()}catch(error){}
+    }
+    return (project.file === null ? '' : project.file.fsName) + '|' + project.pydobeToken;
+})"""
+library.register("projectKey", PROJECT_KEY_FUNCTION)
+
+# ExtendScript returning the id, name, parent folder id and type of every item in one pass
+INDEX_FUNCTION = """(function(project){
+    var rows = [];
+    for(var i = 1; i <= project.numItems; i++){
+        var item = project.item(i);
+        rows.push('[' + item.id + ',' + ExtendJSON.stringify(item.name) + ',' + item.parentFolder.id + ',' + ExtendJSON.stringify(item.reflect.name) + ']');
+    }
+    return '{"key": ' + ExtendJSON.stringify($._pydobe.lib.projectKey(project)) + ', "revision": ' + project.revision + ', "rootId": ' + project.rootFolder.id + ', "items": [' + rows.join(',') + ']}';
+})"""
+library.register("index", INDEX_FUNCTION)
+
+# ExtendScript returning the items with the given ids,
+# or "stale" if another project was opened or the project changed since the index was built
+LOOKUP_FUNCTION = """(function(project, key, revision, ids){
+    if($._pydobe.lib.projectKey(project) !== key || project.revision !== revision){return 'stale'}
+    var result = [];
+    for(var i = 0; i < ids.length; i++){result.push(project.itemByID(ids[i]))}
+    return result;
+})"""
+library.register("lookup", LOOKUP_FUNCTION)
+
+
+class ItemIndex(object):
+    """Names, parent folders and types of every item in a project, as they were at a project revision.
+    The key identifies the project, among the projects opened in an instance"""
+
+    __slots__ = (
+        "key",
+        "revision",
+        "root_id",
+        "names",
+        "parents",
+        "types",
+        "_by_name",
+        "_by_path",
+    )
+
+    def __init__(self, revision: int, root_id: int, rows: list, key: str = None):
+        self.key = key
+        self.revision = revision
+        self.root_id = root_id
+        self.names = {}
+        self.parents = {}
+        self.types = {}
+        self._by_name = {}
+        for item_id, name, parent_id, object_type in rows:
+            self.names[item_id] = name
+            self.parents[item_id] = parent_id
+            self.types[item_id] = object_type
+            self._by_name.setdefault(name, []).append(item_id)
+        self._by_path = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self.names
+
+    def ids_by_name(self, name: str, parent_id: int = None) -> list[int]:
+        """Ids of the items with this name, in project order.
+        If a parent folder id is given, only the items directly inside it"""
+        ids = self._by_name.get(name, [])
+        if parent_id is not None:
+            ids = [item_id for item_id in ids if self.parents[item_id] == parent_id]
+        return ids
+
+    def path(self, item_id: int) -> str:
+        """Path of the item from the root folder, folder names separated by '/'"""
+        names = []
+        while item_id != self.root_id:
+            names.append(self.names[item_id])
+            item_id = self.parents[item_id]
+        return "/".join(reversed(names))
+
+    def id_by_path(self, path: str) -> int | None:
+        """Id of the item at this path from the root folder, the first one if several items share the path"""
+        if self._by_path is None:
+            self._by_path = {}
+            for item_id in self.names:
+                self._by_path.setdefault(self.path(item_id), item_id)
+        return self._by_path.get(path.strip("/"))
+
+
+# Index of the project opened in each instance, by connection, as every Project object of an instance
+# refers to the project opened in it. As another project can be opened, an index is checked against
+# the key and the revision of the project before it is used
+item_indexes = weakref.WeakKeyDictionary()
+
+
+def build_item_index(project_line: str, connection: Connection = None) -> ItemIndex:
+    """Read the name, parent folder and type of every item in a single request"""
+    result = eval_script(library.call("index", project_line), connection)
+    if not isinstance(result, dict) or result.get("error"):
+        raise RuntimeError(f"Unable to index the items of the project: {result}")
+    return ItemIndex(
+        result["revision"], result["rootId"], result["items"], result["key"]
+    )
+
+
+def lookup_items(
+    project_line: str, index: ItemIndex, ids: list, connection: Connection = None
+) -> list[dict] | None:
+    """Keyword arguments of the items with the given ids, in a single request.
+    Returns None if another project was opened, or the project changed, since the index was built
+    """
+    result = eval_script_returning_object(
+        library.call(
+            "lookup",
+            project_line,
+            json.dumps(index.key),
+            str(index.revision),
+            json.dumps(ids),
+        )
+        + ";",
+        connection,
+    )
+    if result == "stale":
+        return None
+    return result
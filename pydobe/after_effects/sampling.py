@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import array
+import json
+import math
+
+from pydobe.buffers import float_buffer
+from pydobe.core import Connection, eval_script
+from pydobe.library import library
+from pydobe.after_effects.snapshot import to_extend_name
+
+# ExtendScript sampling the value of every property at every time, returning a flat table of numbers
+# with a row per time and property, padded with NaN to the largest number of dimensions.
+# Missing and non-numeric properties are sampled as NaN, with 0 dimensions
+SAMPLE_FUNCTION = """(function(properties, start, step, count, preExpression){
+    var dimensions = [];
+    var width = 1;
+    for(var p = 0; p < properties.length; p++){
+        var current = properties[p] ? properties[p].value : null;
+        var size = current instanceof Array ? current.length : (typeof current === "number" ? 1 : 0);
+        dimensions.push(size);
+        if(size > width){width = size}
+    }
+    var values = [];
+    for(var i = 0; i < count; i++){
+        var time = start + i * step;
+        for(var p = 0; p < properties.length; p++){
+            var value = dimensions[p] ? properties[p].valueAtTime(time, preExpression) : [];
+            if(!(value instanceof Array)){value = [value]}
+            for(var d = 0; d < width; d++){values.push(d < value.length ? value[d] : NaN)}
+        }
+    }
+    return '{"dimensions": [' + dimensions.join(",") + '], "values": [' + values.join(",") + ']}';
+})"""
+library.register("sample", SAMPLE_FUNCTION)
+
+# ExtendScript returning the named properties of every layer of a composition, null where a layer lacks one
+COMP_PROPERTIES_FUNCTION = """(function(comp, names){
+    var properties = [];
+    for(var i = 1; i <= comp.numLayers; i++){
+        var layer = comp.layer(i);
+        for(var j = 0; j < names.length; j++){
+            var property = null;
+            try{property = layer[names[j]] || null}catch(e){}
+            properties.push(property);
+        }
+    }
+    return properties;
+})"""
+library.register("compProperties", COMP_PROPERTIES_FUNCTION)
+
+# Properties sampled by default, named as the attributes of AVLayer
+DEFAULT_SAMPLED_PROPERTIES = ("position", "scale", "rotation", "opacity")
+
+
+class Samples(object):
+    """Values of properties sampled over time, in a dense table of time × property × dimension.
+
+    With NumPy, `values` is an array of that shape. Without it, `values` is a flat array.array,
+    the row of a time and property being `width` consecutive numbers. Properties with fewer dimensions
+    than `width` are padded with NaN, `dimensions` holding the number of dimensions of each property
+    """
+
+    __slots__ = ("times", "values", "properties", "dimensions", "width")
+
+    def __init__(self, times, values, properties: list, dimensions: list, width: int):
+        self.times = times
+        self.values = values
+        self.properties = properties
+        self.dimensions = dimensions
+        self.width = width
+
+    def __repr__(self) -> str:
+        return f"<Samples {len(self.times)} times of {len(self.properties)} properties>"
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.times), len(self.properties), self.width
+
+    def value(self, time_index: int, prop) -> float | tuple:
+        """Value of a property, given by index or as labelled in `properties`, at the time of the index.
+        A tuple for multi-dimensional properties"""
+        index = prop if isinstance(prop, int) else self.properties.index(prop)
+        size = self.dimensions[index]
+        if isinstance(self.values, array.array):
+            start = (time_index * len(self.properties) + index) * self.width
+            row = self.values[start : start + self.width]
+        else:
+            row = self.values[time_index, index]
+        if size == 1:
+            return row[0]
+        return tuple(row[:size])
+
+
+def sample_count(start: float, end: float, step: float) -> int:
+    """Number of times from start to end, both included, separated by step"""
+    if step <= 0:
+        raise ValueError("The step must be greater than 0")
+    if end < start:
+        return 0
+    # tolerate the rounding of frame durations such as 1 / 23.976
+    return int(math.floor((end - start) / step + 1e-9)) + 1
+
+
+def sample_properties(
+    properties_line: str,
+    labels: list,
+    start: float,
+    end: float,
+    step: float,
+    pre_expression: bool = False,
+    per_layer: bool = False,
+    connection: Connection = None,
+) -> Samples:
+    """Sample the value of the properties returned by the ExtendScript line at every time, in a single request.
+    `labels` name the properties, or name the properties of every layer of a composition if `per_layer`,
+    the properties then being labelled (layer index, label), layers being indexed from 1 as in After Effects
+    """
+    if not labels:
+        raise ValueError("At least one property must be sampled")
+    count = sample_count(start, end, step)
+    result = eval_script(
+        library.call(
+            "sample",
+            properties_line,
+            json.dumps(start),
+            json.dumps(step),
+            str(count),
+            json.dumps(pre_expression),
+        ),
+        connection,
+    )
+    if not isinstance(result, dict) or result.get("error"):
+        raise RuntimeError(f"Unable to sample the properties: {result}")
+    dimensions = result["dimensions"]
+    width = max(dimensions + [1])
+    if per_layer:
+        labels = [
+            (layer, name)
+            for layer in range(1, len(dimensions) // len(labels) + 1)
+            for name in labels
+        ]
+    times = float_buffer([start + index * step for index in range(count)])
+    values = float_buffer(result["values"], (count, len(dimensions), width))
+    return Samples(times, values, labels, dimensions, width)
+
+
+def comp_properties_line(comp_line: str, names: list) -> str:
+    """ExtendScript returning the properties of every layer of the composition, named as pydobe attributes"""
+    return library.call(
+        "compProperties",
+        comp_line,
+        json.dumps([to_extend_name(name) for name in names]),
+    )
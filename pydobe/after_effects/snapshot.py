@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+
+from pydobe.core import Connection, eval_script
+from pydobe.library import library
+
+DEFAULT_ITEM_FIELDS = ("comment", "label", "width", "height", "duration", "frame_rate")
+DEFAULT_LAYER_FIELDS = (
+    "enabled",
+    "locked",
+    "shy",
+    "solo",
+    "in_point",
+    "out_point",
+    "start_time",
+    "source",
+)
+
+# Fields read on every item and layer
+ITEM_BASE_FIELDS = ("id", "object_type", "name", "parent_id")
+LAYER_BASE_FIELDS = ("comp_id", "index", "object_type", "name")
+
+# ExtendScript traversal of every item and layer of the project, returning a single JSON payload.
+# Values are written as JSON, items are written as their id and files as their path
+SNAPSHOT_FUNCTION = """(function(project, itemFields, layerFields, includeLayers){
+    var value = function(v){
+        if(v === undefined || v === null){return 'null'}
+        if(typeof v === 'number'){return isFinite(v) ? String(v) : 'null'}
+        if(typeof v === 'boolean'){return String(v)}
+        if(typeof v === 'string'){return ExtendJSON.stringify(v)}
+        if(v instanceof Array){
+            var parts = [];
+            for(var i = 0; i < v.length; i++){parts.push(value(v[i]))}
+            return '[' + parts.join(',') + ']';
+        }
+        if(v instanceof File || v instanceof Folder){return ExtendJSON.stringify(v.fsName)}
+        if(v.id !== undefined){return String(v.id)}
+        return 'null';
+    };
+    var read = function(object, fields, values){
+        for(var i = 0; i < fields.length; i++){
+            var v = null;
+            try{v = object[fields[i]]}catch(e){}
+            values.push(value(v));
+        }
+        return '[' + values.join(',') + ']';
+    };
+    var items = [];
+    var layers = [];
+    for(var i = 1; i <= project.numItems; i++){
+        var item = project.item(i);
+        items.push(read(item, itemFields, [item.id, value(item.reflect.name), value(item.name), item.parentFolder.id]));
+        if(includeLayers && item instanceof CompItem){
+            for(var j = 1; j <= item.numLayers; j++){
+                var layer = item.layer(j);
+                layers.push(read(layer, layerFields, [item.id, j, value(layer.reflect.name), value(layer.name)]));
+            }
+        }
+    }
+    return '{"revision": ' + project.revision + ', "rootId": ' + project.rootFolder.id +
+        ', "items": [' + items.join(',') + '], "layers": [' + layers.join(',') + ']}';
+})"""
+library.register("snapshot", SNAPSHOT_FUNCTION)
+
+
+def to_extend_name(name: str) -> str:
+    """Convert a pydobe attribute name to the ExtendScript one, frame_rate to frameRate"""
+    first, *others = name.split("_")
+    return first + "".join(other[:1].upper() + other[1:] for other in others)
+
+
+class SnapshotRecord(object):
+    """Read-only values of an object, as they were when the snapshot was taken.
+    Values are accessed as attributes, using pydobe attribute names"""
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema: dict, values: list):
+        object.__setattr__(self, "_schema", schema)
+        object.__setattr__(self, "_values", tuple(values))
+
+    def __getattr__(self, name: str):
+        try:
+            return self._values[self._schema[name]]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' has no field '{name}'"
+            ) from None
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError("Snapshot records are read-only")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.object_type} '{self.name}'>"
+
+    def as_dict(self) -> dict:
+        """All the values of the record, by field name"""
+        return dict(zip(self._schema, self._values))
+
+
+class ItemRecord(SnapshotRecord):
+    """Snapshot of an item"""
+
+    __slots__ = ("parent",)
+
+
+class FolderRecord(ItemRecord):
+    """Snapshot of a folder item, with the records of the items it contains"""
+
+    __slots__ = ("children",)
+
+
+class CompRecord(ItemRecord):
+    """Snapshot of a composition, with the records of its layers"""
+
+    __slots__ = ("layers",)
+
+
+class LayerRecord(SnapshotRecord):
+    """Snapshot of a layer"""
+
+    __slots__ = ("comp",)
+
+
+class ProjectSnapshot(object):
+    """Read-only tree of every item and layer in the project, taken in a single request"""
+
+    __slots__ = ("revision", "root", "items", "layers")
+
+    def __init__(self, revision: int, root: FolderRecord, items: dict, layers: dict):
+        self.revision = revision
+        self.root = root
+        self.items = items
+        self.layers = layers
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __repr__(self) -> str:
+        return f"<ProjectSnapshot revision {self.revision}, {len(self.items)} items, {len(self.layers)} layers>"
+
+    # CUSTOM PROPERTIES
+
+    """All of the composition records"""
+
+    @property
+    def compositions(self) -> list[CompRecord]:
+        return self.of_type("CompItem")
+
+    """All of the footage records"""
+
+    @property
+    def footages(self) -> list[ItemRecord]:
+        return self.of_type("FootageItem")
+
+    """All of the folder records, except the root folder"""
+
+    @property
+    def folders(self) -> list[FolderRecord]:
+        return self.of_type("FolderItem")
+
+    # FUNCTIONS
+
+    def of_type(self, object_type: str) -> list:
+        """All the item records of a type, CompItem, FolderItem or FootageItem"""
+        return [item for item in self.items.values() if item.object_type == object_type]
+
+    def items_by_name(self, name: str) -> list:
+        """All the item records with this name"""
+        return [item for item in self.items.values() if item.name == name]
+
+
+def take_snapshot(
+    project_line: str,
+    fields: tuple,
+    layer_fields: tuple,
+    include_layers: bool,
+    connection: Connection = None,
+) -> ProjectSnapshot:
+    """Read every item and layer of the project in a single request"""
+    extend_fields = json.dumps([to_extend_name(field) for field in fields])
+    extend_layer_fields = json.dumps([to_extend_name(field) for field in layer_fields])
+    extend_include_layers = json.dumps(include_layers)
+    result = eval_script(
+        library.call(
+            "snapshot",
+            project_line,
+            extend_fields,
+            extend_layer_fields,
+            extend_include_layers,
+        ),
+        connection,
+    )
+    if not isinstance(result, dict) or result.get("error"):
+        raise RuntimeError(f"Unable to take a snapshot of the project: {result}")
+    return build_snapshot(result, fields, layer_fields)
+
+
+def build_snapshot(
+    payload: dict, fields: tuple, layer_fields: tuple
+) -> ProjectSnapshot:
+    """Build the tree of records from the payload returned by SNAPSHOT_FUNCTION"""
+    item_schema = {name: i for i, name in enumerate(ITEM_BASE_FIELDS + tuple(fields))}
+    layer_schema = {
+        name: i for i, name in enumerate(LAYER_BASE_FIELDS + tuple(layer_fields))
+    }
+    root_values = [payload["rootId"], "FolderItem", "Root", None]
+    root = FolderRecord(item_schema, root_values + [None] * len(fields))
+    items = {}
+    for values in payload["items"]:
+        object_type = values[1]
+        if object_type == "FolderItem":
+            items[values[0]] = FolderRecord(item_schema, values)
+        elif object_type == "CompItem":
+            items[values[0]] = CompRecord(item_schema, values)
+        else:
+            items[values[0]] = ItemRecord(item_schema, values)
+
+    # link items to their parent folder
+    children = {root.id: []}
+    for item in items.values():
+        children.setdefault(item.parent_id, []).append(item)
+    object.__setattr__(root, "parent", None)
+    for item in [root, *items.values()]:
+        if item is not root:
+            object.__setattr__(item, "parent", items.get(item.parent_id, root))
+        if isinstance(item, FolderRecord):
+            object.__setattr__(item, "children", tuple(children.get(item.id, ())))
+
+    # link layers to their composition
+    layers = {}
+    comp_layers = {}
+    for values in payload["layers"]:
+        layer = LayerRecord(layer_schema, values)
+        object.__setattr__(layer, "comp", items[layer.comp_id])
+        layers[(layer.comp_id, layer.index)] = layer
+        comp_layers.setdefault(layer.comp_id, []).append(layer)
+    for item in items.values():
+        if isinstance(item, CompRecord):
+            object.__setattr__(item, "layers", tuple(comp_layers.get(item.id, ())))
+
+    return ProjectSnapshot(payload["revision"], root, items, layers)
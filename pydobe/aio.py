@@ -0,0 +1,400 @@
+import asyncio
+import collections
+import json
+
+from pydobe.core import (
+    HOST,
+    PORT,
+    Connection,
+    PydobeBaseCollection,
+    PydobeBaseObject,
+    build_payload,
+    check_library_installed,
+    create_python_object,
+    decode_response,
+    get_connection,
+    decode_result,
+    deferred_script,
+    finish_round_trip,
+    is_assignment,
+    library_payload,
+    line_script,
+    record_call,
+    start_round_trip,
+)
+from pydobe.library import LIBRARY_MISSING
+
+
+class AsyncTransport(object):
+    """Keep-alive HTTP/1.1 connection to the panel for asyncio.
+
+    Requests are pipelined: each one is written as soon as it is sent, without waiting for
+    the responses to the previous ones, which the panel returns in order.
+    The connection is opened on first use, and again if it was lost"""
+
+    def __init__(
+        self,
+        host: str = HOST,
+        port: int = PORT,
+        connect_timeout: float = 5.0,
+        read_timeout: float = None,
+    ):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._loop = None
+        self._lock = None
+        self._writer = None
+        self._pending = None
+        self._read_task = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def post(self, payload: dict) -> str:
+        """Post the payload to the panel and return the raw response text"""
+        await self._connect()
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"POST / HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        )
+        # queue the response before writing, responses are matched to requests in order
+        future = self._loop.create_future()
+        self._pending.append(future)
+        self._writer.write(head.encode("ascii") + body)
+        await self._writer.drain()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.read_timeout)
+        except asyncio.TimeoutError:
+            # the late response would be matched to the next request, start afresh
+            self._disconnect(TimeoutError("The panel did not respond in time"))
+            raise
+
+    async def close(self):
+        """Close the connection, failing the requests still waiting for a response"""
+        writer = self._writer
+        self._disconnect(ConnectionError("The connection to the panel was closed"))
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _connect(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # streams belong to the loop they were opened in
+            self._disconnect(ConnectionError("The event loop changed"))
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        if self.connected:
+            return
+        async with self._lock:
+            if self.connected:
+                return
+            reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.connect_timeout
+            )
+            self._pending = collections.deque()
+            self._read_task = loop.create_task(
+                self._read_responses(reader, self._pending)
+            )
+
+    def _disconnect(self, error: Exception):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except RuntimeError:
+                # the loop it was opened in is closed
+                pass
+            self._writer = None
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._pending:
+            for future in self._pending:
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def _read_responses(
+        self, reader: asyncio.StreamReader, pending: collections.deque
+    ):
+        try:
+            while True:
+                status = await reader.readline()
+                if not status:
+                    raise ConnectionError("The panel closed the connection")
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await _read_body(reader, headers)
+                if not pending:
+                    raise ConnectionError("The panel sent a response to no request")
+                future = pending.popleft()
+                if not future.done():
+                    future.set_result(body.decode("utf-8"))
+                if headers.get("connection", "").lower() == "close":
+                    raise ConnectionError("The panel closed the connection")
+        except asyncio.CancelledError:
+            raise
+        except (OSError, ValueError, asyncio.IncompleteReadError) as error:
+            if self._pending is pending:
+                self._read_task = None
+                self._disconnect(ConnectionError(str(error)))
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict) -> bytes:
+    """Read the body of a response, sent with a length, in chunks, or up to the end of the connection"""
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                # skip the trailers
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    headers["connection"] = "close"
+    return await reader.read()
+
+
+# Asynchronous transports by connection
+_transports = {}
+
+
+def get_transport(connection: Connection = None) -> AsyncTransport:
+    """The asynchronous transport of the connection, or of the default one"""
+    connection = get_connection(connection)
+    transport = _transports.get(connection)
+    if transport is None:
+        transport = _transports[connection] = AsyncTransport(
+            connection.host, connection.port
+        )
+    return transport
+
+
+def configure_transport(
+    connection: Connection = None,
+    connect_timeout: float = 5.0,
+    read_timeout: float = None,
+) -> AsyncTransport:
+    """Replace the asynchronous transport of the connection. Close the previous one with `await transport.close()`"""
+    connection = get_connection(connection)
+    transport = _transports[connection] = AsyncTransport(
+        connection.host, connection.port, connect_timeout, read_timeout
+    )
+    return transport
+
+
+# EVALUATION
+
+
+async def eval_script(code: str, connection: Connection = None):
+    """Send ExtendScript code to adobe software, retrieve and decode the response"""
+    connection = get_connection(connection)
+    payload = build_payload(code, connection)
+    data = await _post(payload, connection)
+    if data == LIBRARY_MISSING:
+        check_library_installed(await _post(library_payload(), connection, "install"))
+        data = await _post(payload, connection)
+    connection.property_cache.expire()
+    return decode_response(data)
+
+
+async def _post(payload: dict, connection: Connection, kind: str = "script") -> str:
+    """Post the payload asynchronously, calling the round trip hooks around the request"""
+    trip = start_round_trip(payload, connection, kind)
+    try:
+        data = await get_transport(connection).post(payload)
+    except BaseException as error:
+        finish_round_trip(trip, error=error)
+        raise
+    finish_round_trip(trip, data)
+    return data
+
+
+async def eval_script_returning_object(line: str, connection: Connection = None):
+    """Eval the line as ExtendScript code, as pydobe.core.eval_script_returning_object does"""
+    script = line_script(line, expand_arrays=not is_assignment(line))
+    return decode_result(await eval_script(script, connection), connection)
+
+
+async def convert_to_list(line: str, connection: Connection = None) -> list:
+    """Materialise the ExtendScript array returned by the line in a single request"""
+    script = line_script(line, expand_arrays=True)
+    return decode_result(await eval_script(script, connection), connection)
+
+
+async def run(function):
+    """Run a function using pydobe objects, sending its scripts asynchronously.
+
+    The function is run until it sends a script, then run again once the result is back,
+    answering the scripts it already sent with their results, until it returns.
+    It must send the same scripts in the same order every time it is run"""
+    answers = []
+    while True:
+        entry, value = record_call(function, answers)
+        if entry is None:
+            return value
+        result = await eval_script(deferred_script(entry), entry[2])
+        answers.append((entry, result))
+
+
+async def get(obj: PydobeBaseObject, name: str):
+    """Read the attribute of a pydobe object"""
+    return await run(lambda: getattr(obj, name))
+
+
+async def set(obj: PydobeBaseObject, name: str, value):
+    """Set the attribute of a pydobe object"""
+    await run(lambda: setattr(obj, name, value))
+
+
+async def call(obj: PydobeBaseObject, name: str, *args, **kwargs):
+    """Call the method of a pydobe object"""
+    return await run(lambda: getattr(obj, name)(*args, **kwargs))
+
+
+async def eval_on_object(
+    obj: PydobeBaseObject, extend_property: str = "", index: int = None
+):
+    """Query property or execute function on the ExtendScript object, as _eval_on_object does"""
+    return await run(lambda: obj._eval_on_object(extend_property, index=index))
+
+
+async def application(connection: Connection = None):
+    """The application object"""
+    kwargs = await eval_script_returning_object("app", connection)
+    return wrap(create_python_object(kwargs["object_type"])(**kwargs))
+
+
+# OBJECTS
+
+
+def wrap(value):
+    """Wrap pydobe objects, including those within lists, in their asynchronous view"""
+    if isinstance(value, PydobeBaseCollection):
+        return AsyncCollection(value)
+    if isinstance(value, PydobeBaseObject):
+        return AsyncObject(value)
+    if isinstance(value, list):
+        return [wrap(item) for item in value]
+    return value
+
+
+def unwrap(value):
+    """The pydobe objects behind asynchronous views"""
+    if isinstance(value, AsyncObject):
+        return value.wrapped
+    if isinstance(value, list):
+        return [unwrap(item) for item in value]
+    return value
+
+
+class AsyncObject(object):
+    """Asynchronous view of a pydobe object. Properties are awaited, methods are coroutines.
+    Pydobe objects returned are wrapped in their own asynchronous view
+
+    comp = await project.active_item
+    width, height = await asyncio.gather(comp.width, comp.height)
+    await comp.set("name", "Main")
+    """
+
+    __slots__ = ("wrapped",)
+
+    def __init__(self, wrapped: PydobeBaseObject):
+        object.__setattr__(self, "wrapped", wrapped)
+
+    def __getattr__(self, name: str):
+        wrapped = self.wrapped
+        if isinstance(getattr(type(wrapped), name, None), property):
+            return self._get(name)
+        value = getattr(wrapped, name)
+        if callable(value):
+            return self._method(name)
+        return value
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"Set attributes with `await obj.set('{name}', value)`")
+
+    def __eq__(self, other):
+        return self.wrapped == unwrap(other)
+
+    def __hash__(self):
+        return hash(self.wrapped)
+
+    def __repr__(self) -> str:
+        wrapped = self.wrapped
+        return f"<{type(self).__name__} {wrapped.object_type} {wrapped.pydobe_id}>"
+
+    async def set(self, name: str, value):
+        """Set the attribute of the pydobe object"""
+        await set(self.wrapped, name, unwrap(value))
+
+    async def _get(self, name: str):
+        return wrap(await get(self.wrapped, name))
+
+    def _method(self, name: str):
+        async def method(*args, **kwargs):
+            args = [unwrap(arg) for arg in args]
+            kwargs = {key: unwrap(value) for key, value in kwargs.items()}
+            return wrap(await call(self.wrapped, name, *args, **kwargs))
+
+        method.__name__ = name
+        return method
+
+
+class AsyncCollection(AsyncObject):
+    """Asynchronous view of a pydobe collection
+
+    async for item in (await project.items):
+        print(await item.name)
+    last = await (await project.items)[-1]
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, index: int or slice):
+        return self.get(index)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def length(self) -> int:
+        """The number of elements in the collection"""
+        return await run(self.wrapped.__len__)
+
+    async def get(self, index: int or slice):
+        """The element at the index, or the elements within a slice in a single request"""
+        return wrap(await run(lambda: self.wrapped[index]))
+
+    async def _iterate(self):
+        collection = self.wrapped
+        length, elements = await run(
+            lambda: collection._get_slice(0, collection.chunk_size, 1, with_length=True)
+        )
+        for element in elements:
+            yield wrap(element)
+        for start in range(collection.chunk_size, length, collection.chunk_size):
+            stop = min(start + collection.chunk_size, length)
+            for element in await run(
+                lambda: collection._get_slice(start, stop, 1, length)
+            ):
+                yield wrap(element)
+        if length:
+            await run(lambda: collection._check_length(length))
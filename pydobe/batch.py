@@ -0,0 +1,205 @@
+from pydobe.core import (
+    Connection,
+    close_transaction,
+    eval_script_batch,
+    eval_script_returning_object,
+    format_to_extend,
+    get_connection,
+    open_transaction,
+    record_call,
+    replay_call,
+)
+
+REVISION_LINE = "app.project.revision;"
+
+
+class ScriptFuture(object):
+    """The pending result of a read or call queued in a Batch"""
+
+    def __init__(self, batch):
+        self._batch = batch
+        self._done = False
+        self._value = None
+        self._error = None
+
+    def done(self) -> bool:
+        """True once the batch holding this future has been flushed"""
+        return self._done
+
+    def result(self):
+        """The resulting value, flushing the batch first if it has not been sent yet"""
+        if not self._done:
+            self._batch.flush()
+        if not self._done:
+            raise RuntimeError("The batch holding this result was discarded")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def exception(self):
+        """The error raised by the read or call, None if it succeeded or has not been sent yet"""
+        return self._error
+
+    def _set_result(self, value):
+        self._value = value
+        self._done = True
+
+    def _set_error(self, error: BaseException):
+        self._error = error
+        self._done = True
+
+
+class Batch(object):
+    """Queue reads and calls on pydobe objects and send them to After Effects in one request.
+
+    with Batch() as batch:
+        width = batch.get(comp, "width")
+        height = batch.get(comp, "height")
+    print(width.result(), height.result())
+
+    Every object used in a batch must belong to the connection of the batch
+    """
+
+    def __init__(self, connection: Connection = None):
+        self.connection = get_connection(connection)
+        self._queue = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._queue = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    # FUNCTIONS
+
+    def get(self, obj, name: str) -> ScriptFuture:
+        """Queue reading the attribute of a pydobe object"""
+        return self.defer(lambda: getattr(obj, name))
+
+    def set(self, obj, name: str, value) -> ScriptFuture:
+        """Queue setting the attribute of a pydobe object"""
+        return self.defer(lambda: setattr(obj, name, value))
+
+    def call(self, obj, name: str, *args, **kwargs) -> ScriptFuture:
+        """Queue calling the method of a pydobe object"""
+        return self.defer(lambda: getattr(obj, name)(*args, **kwargs))
+
+    def eval(self, line: str) -> ScriptFuture:
+        """Queue a line of ExtendScript, as given to eval_script_returning_object"""
+        return self.defer(lambda: eval_script_returning_object(line, self.connection))
+
+    def defer(self, function) -> ScriptFuture:
+        """Queue any function talking to After Effects.
+        Only its first request is batched, any following request is sent when the batch is flushed
+        """
+        future = ScriptFuture(self)
+        entry, value = record_call(function)
+        if entry is None:
+            future._set_result(value)
+        elif entry[2] is not self.connection:
+            raise ValueError(f"The batch can only send scripts to {self.connection}")
+        else:
+            self._queue.append((future, function, entry))
+        return future
+
+    def flush(self):
+        """Send every queued script in a single request and resolve their futures"""
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        entries = [entry for future, function, entry in queue]
+        cache = self.connection.property_cache
+        # check the revision of the project along with the queued scripts, if anything is cached
+        check_revision = len(cache) > 0
+        if check_revision:
+            entries.insert(0, (REVISION_LINE, False, self.connection))
+        results = self._send(entries)
+        if check_revision:
+            cache.validate(results.pop(0))
+            # the revision was read before the queued scripts ran, which may have changed the project
+            cache.expire()
+        for (future, function, entry), result in zip(queue, results):
+            try:
+                future._set_result(replay_call(function, entry, result))
+            except Exception as error:
+                future._set_error(error)
+
+    def _send(self, entries: list) -> list:
+        return eval_script_batch(entries, self.connection)
+
+
+class TransactionOperation(object):
+    """A setter queued in a Transaction"""
+
+    def __init__(self, obj, extend_property: str, future: ScriptFuture):
+        self.object = obj
+        self.extend_property = extend_property
+        self.future = future
+
+    def __repr__(self) -> str:
+        return f"<TransactionOperation {type(self.object).__name__}.{self.extend_property}>"
+
+
+class Transaction(Batch):
+    """Queue the setters called on pydobe objects and apply them in a single request,
+    as a single undo step in After Effects.
+
+    with project.transaction("Rename shots") as transaction:
+        for index, item in enumerate(items):
+            item.name = f"shot_{index:03d}"
+    for operation, error in transaction.errors:
+        print(operation.object, operation.extend_property, error)
+
+    Setters of the project, its items and layers are applied when leaving the block,
+    while reads, method calls and the setters of other objects, such as ImportOptions, are sent straight away.
+    A failing setter does not stop the others, its error is listed in `errors`
+    """
+
+    def __init__(self, name: str = "pydobe", connection: Connection = None):
+        super().__init__(connection)
+        self.name = name
+        self.operations = []
+
+    def __enter__(self):
+        open_transaction(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        close_transaction(self)
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    @property
+    def errors(self) -> list:
+        """(operation, error) of every setter which failed once the transaction was applied,
+        the error being the exception raised or the error returned by ExtendScript"""
+        errors = []
+        for operation in self.operations:
+            future = operation.future
+            if not future.done():
+                continue
+            error = future.exception()
+            if error is None:
+                result = future.result()
+                if isinstance(result, dict) and result.get("error"):
+                    error = result
+            if error is not None:
+                errors.append((operation, error))
+        return errors
+
+    def queue_setter(self, obj, extend_property: str, line: str) -> ScriptFuture:
+        """Queue the assignment of the property of the object, `line` being the assignment"""
+        future = self.defer(lambda: obj._eval_on_object(line))
+        self.operations.append(TransactionOperation(obj, extend_property, future))
+        return future
+
+    def _send(self, entries: list) -> list:
+        begin = f"app.beginUndoGroup({format_to_extend(self.name)});"
+        entries = [(begin, True, self.connection)] + entries
+        entries.append(("app.endUndoGroup();", True, self.connection))
+        return eval_script_batch(entries, self.connection)[1:-1]
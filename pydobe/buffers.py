@@ -0,0 +1,35 @@
+"""Compact buffers of floats returned by bulk reads.
+
+Buffers are NumPy arrays when NumPy is installed, otherwise flat array.array of doubles,
+multi-dimensional buffers being stored row after row"""
+
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def float_buffer(values: list, shape: tuple = None):
+    """The floats as a NumPy array of the given shape when NumPy is installed,
+    otherwise as a flat array.array of doubles"""
+    if numpy is not None:
+        buffer = numpy.asarray(values, dtype=float)
+        return buffer.reshape(shape) if shape is not None else buffer
+    return array.array("d", values)
+
+
+def to_list(values) -> list:
+    """A buffer, NumPy array or sequence as nested lists, as passed to ExtendScript"""
+    if hasattr(values, "tolist"):
+        # NumPy arrays and array.array
+        return values.tolist()
+    return [
+        (
+            to_list(value)
+            if isinstance(value, (list, tuple)) or hasattr(value, "tolist")
+            else value
+        )
+        for value in values
+    ]
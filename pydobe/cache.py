@@ -0,0 +1,94 @@
+import threading
+import time
+
+MISSING = object()
+
+
+class PropertyCache(object):
+    """Property values read from ExtendScript objects, by pydobe id.
+
+    The values are only valid for the project revision they were read at,
+    every value is dropped as soon as a different revision is seen"""
+
+    def __init__(self, max_age: float = None):
+        self.max_age = max_age
+        self.revision = None
+        self.checked_at = None
+        self.hits = 0
+        self._scopes = 0
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(values) for values in self._values.values())
+
+    @property
+    def enabled(self) -> bool:
+        """True when reads on every object are cached"""
+        return self._scopes > 0
+
+    def enable(self):
+        with self._lock:
+            self._scopes += 1
+
+    def disable(self):
+        with self._lock:
+            self._scopes -= 1
+            if not self._scopes:
+                self._clear()
+
+    def needs_check(self) -> bool:
+        """True when the revision has never been checked, may have changed since,
+        or was checked longer than max_age ago"""
+        if self.revision is None or self.checked_at is None:
+            return True
+        if self.max_age is None:
+            return False
+        return time.monotonic() - self.checked_at > self.max_age
+
+    def validate(self, revision: int) -> bool:
+        """Record the current project revision. Returns True if cached values were dropped"""
+        with self._lock:
+            self.checked_at = time.monotonic()
+            if revision == self.revision:
+                return False
+            dropped = bool(self._values)
+            self.revision = revision
+            self._values = {}
+        return dropped
+
+    def expire(self):
+        """Have the revision checked again before the next cached read,
+        as a script which may have changed the project was run"""
+        self.checked_at = None
+
+    def lookup(self, pydobe_id: str, name: str):
+        """The cached value, or MISSING"""
+        value = self._values.get(pydobe_id, {}).get(name, MISSING)
+        if value is not MISSING:
+            self.hits += 1
+        return value
+
+    def store(self, pydobe_id: str, name: str, value):
+        with self._lock:
+            self._values.setdefault(pydobe_id, {})[name] = value
+
+    def write(self, pydobe_id: str, name: str, value=MISSING):
+        """Update the value set from Python.
+        Other values of the object are dropped, as they may be derived from the one set
+        """
+        with self._lock:
+            values = self._values[pydobe_id] = {}
+            if value is not MISSING:
+                values[name] = value
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._values = {}
+        self.revision = None
+
+
+property_cache = PropertyCache()
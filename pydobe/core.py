@@ -1,18 +1,242 @@
+import collections
 import json
+import re
 import requests
 import socket
+import threading
+import time
+import weakref
+from requests.adapters import HTTPAdapter
+
+from pydobe.cache import MISSING, PropertyCache, property_cache
+from pydobe.handles import HandleTracker, ObjectKwargs, release_script, tracker
+from pydobe.library import LIBRARY_MISSING, library
 
 HOST = "127.0.0.1"
 PORT = 2000
 PANEL_URL = f"http://{HOST}:{PORT}"
 
 
+class Transport(object):
+    """Persistent keep-alive connection pool used to send ExtendScript to the panel.
+
+    A single instance is safe to share between threads, requests are spread over at most
+    `pool_size` open connections and blocked until one is free."""
+
+    def __init__(
+        self,
+        url: str = PANEL_URL,
+        pool_size: int = 4,
+        connect_timeout: float = 5.0,
+        read_timeout: float = None,
+    ):
+        self.url = url
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> tuple:
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def session(self) -> requests.Session:
+        """The shared session, created on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    # the panel is local, skip the proxy lookups done for every request
+                    session.trust_env = False
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=self.pool_size, pool_block=True
+                    )
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def post(self, payload: dict) -> str:
+        """Post the payload to the panel and return the raw response text"""
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        return response.text
+
+    def ping(self, timeout: float = 1.0) -> bool:
+        """True if the panel answers"""
+        try:
+            response = self.session.get(self.url, timeout=timeout)
+        except requests.RequestException:
+            return False
+        return response.ok
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class Connection(object):
+    """Connection to the pydobe panel of one After Effects instance.
+
+    Holds the transport used to reach the panel, and the state of the ExtendScript objects
+    stored in that instance. Objects remember the connection they were returned by,
+    so objects of several instances can be used side by side"""
+
+    def __init__(
+        self,
+        host: str = HOST,
+        port: int = PORT,
+        pool_size: int = 4,
+        connect_timeout: float = 5.0,
+        read_timeout: float = None,
+        handle_tracker: HandleTracker = None,
+        read_cache: PropertyCache = None,
+    ):
+        self.host = host
+        self.port = port
+        self.url = f"http://{host}:{port}"
+        self.transport = Transport(self.url, pool_size, connect_timeout, read_timeout)
+        self.tracker = HandleTracker() if handle_tracker is None else handle_tracker
+        self.property_cache = PropertyCache() if read_cache is None else read_cache
+        self._checked = False
+
+    def __repr__(self) -> str:
+        return f"<Connection {self.host}:{self.port}>"
+
+    def is_alive(self, timeout: float = 1.0) -> bool:
+        """True if the panel of the instance answers"""
+        return self.transport.ping(timeout)
+
+    def check(self):
+        """Raise a ConnectionError if the panel cannot be reached, only checked once"""
+        if not self._checked:
+            is_port_open(self)
+            self._checked = True
+
+    def configure(
+        self,
+        pool_size: int = 4,
+        connect_timeout: float = 5.0,
+        read_timeout: float = None,
+    ) -> Transport:
+        """Replace the transport with one using the given pool size and timeouts"""
+        old_transport = self.transport
+        self.transport = Transport(self.url, pool_size, connect_timeout, read_timeout)
+        old_transport.close()
+        return self.transport
+
+    def close(self):
+        """Close every pooled connection to the panel"""
+        self.transport.close()
+
+
+# Connection used by objects created without one, to HOST and PORT
+_connection = Connection(HOST, PORT, handle_tracker=tracker, read_cache=property_cache)
+
+
+def get_connection(connection: Connection = None) -> Connection:
+    """The given connection, or the default one"""
+    return connection or _connection
+
+
+def get_transport() -> Transport:
+    """The transport used by the default connection"""
+    return _connection.transport
+
+
+def configure_transport(
+    pool_size: int = 4, connect_timeout: float = 5.0, read_timeout: float = None
+) -> Transport:
+    """Replace the transport of the default connection with one using the given pool size and timeouts"""
+    return _connection.configure(pool_size, connect_timeout, read_timeout)
+
+
+# Python objects already created for a pydobe id, by connection and class
+_mirrors = weakref.WeakValueDictionary()
+
+# Python classes by the name of the ExtendScript type they mirror, filled as classes are defined
+object_types = {}
+
+# Property reads and assignments which can go through the property cache
+_READ_PATTERN = re.compile(r"^\w+$")
+_ASSIGNMENT_PATTERN = re.compile(r"^(\w+)\s*=\s*(.*?);?$", re.DOTALL)
+# Lines assigning a value to a variable or attribute
+_ASSIGNMENT_LINE_PATTERN = re.compile(r"^\s*[\w$.\[\]'\"]+\s*=(?!=)")
+
+
 class PydobeBaseObject(object):
-    """Base object for every mirror object from ExtendScript"""
+    """Base object for every mirror object from ExtendScript.
+    The same ExtendScript object is always mirrored by the same Python object"""
 
-    def __init__(self, pydobe_id: str, object_type: str):
+    # When true, property reads are cached until the project revision changes.
+    # Can be set on an object, a class, or turned on for every object within a ReadCache
+    cache_reads = False
+
+    # When true, assignments within a transaction are queued until it is applied. Only set on the objects
+    # of the project, as options passed to a method, such as ImportOptions, must be set before the call
+    transaction_setters = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        object_types.setdefault(cls.__name__, cls)
+
+    def __new__(cls, pydobe_id: str = None, *args, **kwargs):
+        connection = kwargs.get("connection")
+        if connection is None:
+            connection = next(
+                (arg for arg in args if isinstance(arg, Connection)), None
+            )
+        connection = get_connection(connection)
+        if pydobe_id:
+            mirror = _mirrors.get((connection, pydobe_id, cls))
+            if mirror is not None:
+                return mirror
+        mirror = super(PydobeBaseObject, cls).__new__(cls)
+        mirror._hash = hash(pydobe_id) if pydobe_id else object.__hash__(mirror)
+        if pydobe_id:
+            _mirrors[(connection, pydobe_id, cls)] = mirror
+            # the ExtendScript object is released once this object is garbage collected
+            connection.tracker.track(pydobe_id, mirror)
+        return mirror
+
+    def __init__(self, pydobe_id: str, object_type: str, connection: Connection = None):
         self.pydobe_id = pydobe_id
         self.object_type = object_type
+        self.connection = get_connection(connection)
+
+    def __eq__(self, other):
+        if not isinstance(other, PydobeBaseObject):
+            return NotImplemented
+        if self.pydobe_id is None:
+            return self is other
+        return self.pydobe_id == other.pydobe_id and self.connection is other.connection
+
+    def __hash__(self):
+        return self._hash
+
+    def release(self):
+        """Release the ExtendScript object straight away. This object can not be used afterwards.
+        Within a call recorded by aio.run, a Batch or a Transaction, the object is released
+        once the call has returned, along with a later script"""
+        if not self.pydobe_id:
+            return
+        releases = getattr(_deferred, "releases", None)
+        if releases is not None:
+            # the call may be run again, and must send the same scripts every time
+            releases.append(self)
+            return
+        self._forget()
+        release_handles(self.connection)
+
+    def _forget(self):
+        """Drop the mirror, its ExtendScript object being released with the next scripts"""
+        if self.pydobe_id:
+            _mirrors.pop((self.connection, self.pydobe_id, type(self)), None)
+            self.connection.tracker.release([self.pydobe_id])
+            self.pydobe_id = None
 
     def _eval_on_object(
         self, extend_property: str = "", pydobe_id: str = None, index: int = None
@@ -20,7 +244,7 @@ class PydobeBaseObject(object):
         """Query property or execute function on ExtendScript object"""
         if extend_property:
             extend_property = f".{extend_property}"
-        if index:
+        if index is not None:
             index = f"[{index}]"
         else:
             index = ""
@@ -28,28 +252,115 @@ class PydobeBaseObject(object):
             line = f"$._pydobe['{pydobe_id}']{index}{extend_property};"
         else:
             line = f"$._pydobe['{self.pydobe_id}']{index}{extend_property};"
-        result = eval_script_returning_object(line)
+        if (
+            not (self.cache_reads or self.connection.property_cache.enabled)
+            or pydobe_id
+            or index != ""
+            or not self.pydobe_id
+        ):
+            return eval_script_returning_object(line, self.connection)
+        return self._eval_cached(extend_property[1:], line)
+
+    def _eval_cached(self, extend_property: str, line: str):
+        """Serve plain property reads from the property cache, and write assignments through"""
+        if _is_recording() or _is_replaying():
+            # a recorded function is run again with the results of its scripts, it must send the same scripts
+            # every time, whatever was cached in between
+            return eval_script_returning_object(line, self.connection)
+        cache = self.connection.property_cache
+        if _READ_PATTERN.match(extend_property):
+            if cache.needs_check():
+                refresh_cache(self.connection)
+            result = cache.lookup(self.pydobe_id, extend_property)
+            if result is MISSING:
+                checked_at = cache.checked_at
+                result = eval_script_returning_object(line, self.connection)
+                # reading a property leaves the project as it was
+                cache.checked_at = checked_at
+                cache.store(self.pydobe_id, extend_property, result)
+            return result
+        result = eval_script_returning_object(line, self.connection)
+        assignment = _ASSIGNMENT_PATTERN.match(extend_property)
+        if assignment:
+            name, value = assignment.groups()
+            cache.write(self.pydobe_id, name, _decode_literal(value))
         return result
 
+    def _set_property(self, extend_property: str, value):
+        """Assign the value, formatted with format_to_extend, to the property of the ExtendScript object.
+        Within a transaction, the assignment is queued until the transaction is applied
+        if the object has transaction_setters
+        """
+        line = f"{extend_property} = {format_to_extend(value)}"
+        transaction = current_transaction(self.connection)
+        if transaction is not None and self.transaction_setters and not _is_recording():
+            return transaction.queue_setter(self, extend_property, line)
+        return self._eval_on_object(line)
+
+    def _call_method(self, extend_method: str, *args):
+        """Call the method of the ExtendScript object, with the arguments formatted with format_to_extend"""
+        arguments = ", ".join([format_to_extend(arg) for arg in args])
+        return self._eval_on_object(f"{extend_method}({arguments})")
+
     def _execute_command(self, code: str):
-        eval_script(code)
+        eval_script(code, self.connection)
+
+
+# ExtendScript returning the elements of a collection within a range, following Python slice semantics.
+# The length of the collection is read within the same request, returning "changed" if it is not the one expected,
+# or returned before the elements if withLength is true
+SLICE_FUNCTION = """(function(collection, lengthProperty, offset, start, stop, step, expectedLength, withLength){
+    var length = collection[lengthProperty];
+    if(expectedLength !== null && length !== expectedLength){return 'changed'}
+    var bound = function(index, fallback, low, high){
+        if(index === null){return fallback}
+        if(index < 0){index += length}
+        return Math.max(low, Math.min(high, index));
+    };
+    if(step > 0){
+        start = bound(start, 0, 0, length);
+        stop = bound(stop, length, 0, length);
+    } else {
+        start = bound(start, length - 1, -1, length - 1);
+        stop = bound(stop, -1, -1, length - 1);
+    }
+    var result = withLength ? [length] : [];
+    for(var i = start; step > 0 ? i < stop : i > stop; i += step){result.push(collection[i + offset])}
+    return result;
+})"""
+library.register("slice", SLICE_FUNCTION)
 
 
 class PydobeBaseCollection(PydobeBaseObject):
-    def __init__(self, pydobe_id: str, object_type: str, len_property: str):
+    # number of elements fetched per request while iterating
+    chunk_size = 256
+    # index of the first element in ExtendScript, 1 for After Effects collections
+    index_offset = 0
+
+    def __init__(
+        self,
+        pydobe_id: str,
+        object_type: str,
+        len_property: str,
+        connection: Connection = None,
+    ):
         """Base Object for collections"""
 
         if pydobe_id is None:
             raise ValueError("Creating a collection from scratch is not supported")
         self.len_property = len_property
-        super(PydobeBaseCollection, self).__init__(pydobe_id, object_type)
+        super(PydobeBaseCollection, self).__init__(pydobe_id, object_type, connection)
 
-    def __getitem__(self, index: int) -> dict:
-        """Builtin method for getting the value at the specific index"""
+    def __getitem__(self, index: int or slice):
+        """Builtin method for getting the value at the specific index, or the values within a slice"""
 
+        if isinstance(index, slice):
+            return self._get_slice(index.start, index.stop, index.step)
         if index < 0:
-            index = str(self.__len__() + index)
-        return self._eval_on_object(index=index)
+            index = self.__len__() + index
+        return self._create_element(
+            self._eval_on_object(index=index + self.index_offset)
+        )
 
     def __len__(self) -> int:
         """Builtin method for length"""
@@ -57,64 +368,479 @@ class PydobeBaseCollection(PydobeBaseObject):
         return int(self._eval_on_object(self.len_property))
 
     def __iter__(self):
-        """Builtin method for iterating through items"""
+        """Builtin method for iterating through items, fetched in chunks of chunk_size.
+
+        Elements are fetched as the iteration goes, the number of elements being read with the first chunk.
+        Whatever the size of the collection, a RuntimeError is raised if this number changes while iterating,
+        when the next chunk is fetched or once the last element was reached. Adding and removing as many
+        elements goes unnoticed. Take a list of the collection first to add or remove elements while iterating
+        """
+
+        length, elements = self._get_slice(0, self.chunk_size, 1, with_length=True)
+        yield from elements
+        for start in range(self.chunk_size, length, self.chunk_size):
+            stop = min(start + self.chunk_size, length)
+            yield from self._get_slice(start, stop, 1, length)
+        if length:
+            self._check_length(length)
+
+    def _get_slice(
+        self,
+        start: int = None,
+        stop: int = None,
+        step: int = None,
+        length: int = None,
+        with_length: bool = False,
+    ) -> list or tuple:
+        """The elements within a slice, in a single request.
+        If a length is given, a RuntimeError is raised if the collection no longer has this length.
+        With `with_length`, the length of the collection and the elements are returned
+        """
+        if step is None:
+            step = 1
+        if step == 0:
+            raise ValueError("slice step cannot be zero")
+        arguments = ", ".join(
+            json.dumps(value)
+            for value in (
+                self.len_property,
+                self.index_offset,
+                start,
+                stop,
+                step,
+                length,
+                with_length,
+            )
+        )
+        collection = f"$._pydobe['{self.pydobe_id}']"
+        elements = eval_script_returning_object(
+            library.call("slice", collection, arguments) + ";", self.connection
+        )
+        if elements == "changed":
+            raise RuntimeError(f"{type(self).__name__} changed size during iteration")
+        if with_length:
+            return elements[0], [
+                self._create_element(element) for element in elements[1:]
+            ]
+        return [self._create_element(element) for element in elements]
 
-        value = iter([self.__getitem__(i) for i in range(len(self))])
-        return value
+    def _check_length(self, length: int):
+        """Raise a RuntimeError if the collection no longer has the length it had when iterated"""
+        if self.__len__() != length:
+            raise RuntimeError(f"{type(self).__name__} changed size during iteration")
+
+    def _create_element(self, kwargs):
+        """Convert the value returned for an element, returned as is unless overridden"""
+        return kwargs
 
 
-def is_port_open():
+def is_port_open(connection: Connection = None):
+    connection = get_connection(connection)
     a_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    location = (HOST, PORT)
+    location = (connection.host, connection.port)
     result_of_check = a_socket.connect_ex(location)
-    message = f"Connection to port {PORT} could not be established. Please ensure After Effects is running."
+    a_socket.close()
+    message = f"Connection to port {connection.port} could not be established. Please ensure After Effects is running."
     if result_of_check != 0:
         raise ConnectionError(message)
 
 
-def eval_script_returning_object(line: str):
-    """Eval the line as ExtendScript code.
-    If the code returns an object, it will be stored with an id for pydobe to handle"""
-    # Create ExtendScript to send
-    script = f"var tmp = {line}"
-    script += """\nif(typeof tmp === 'object' && tmp !== null){
-            var newPydobeId = $._pydobe.generateId();
-            $._pydobe[newPydobeId] = tmp;
-            tmp = ExtendJSON.stringify({"isObject": true, "objectType": tmp.reflect.name, "pydobeId": newPydobeId}, internal_variables_replacer, 0, 1);
+# ExtendScript functions registering objects for pydobe and serialising arrays in a single pass.
+# Items, layers and properties are identified by their id or path, so that the same object is
+# always registered under the same pydobe id as long as it has not been released.
+# Array elements are returned as JSON, other values are left for evalScript to convert to a string
+IS_LAYER_FUNCTION = """(function(name){
+    return name.indexOf('Layer') >= 0 && name !== 'LayerCollection';
+})"""
+
+IDENTITY_FUNCTION = """(function(tmp){
+    var lib = $._pydobe.lib;
+    var name = tmp.reflect.name;
+    if(name === 'CompItem' || name === 'FolderItem' || name === 'FootageItem'){
+        return 'item:' + tmp.id;
+    }
+    if(lib.isLayer(name)){
+        return 'layer:' + tmp.containingComp.id + ':' + (tmp.id === undefined ? '#' + tmp.index : tmp.id);
+    }
+    if(name === 'Property' || name === 'PropertyGroup' || name === 'MaskPropertyGroup'){
+        var path = [];
+        var property = tmp;
+        while(property.parentProperty !== null){
+            path.unshift(property.propertyIndex);
+            property = property.parentProperty;
         }
-        tmp"""
-    # Get the resulting data
-    result = eval_script(script)
-    # Extract pydobe ID if object is returned
-    if isinstance(result, dict) and result.get("isObject"):
-        if result["objectType"] == "Array" and "=" not in line:
-            data_list = convert_to_list(line)
-            return data_list
-        else:
-            kwargs = dict(
-                pydobe_id=result["pydobeId"], object_type=result["objectType"]
+        if(property === tmp || !lib.isLayer(property.reflect.name)){return null}
+        return lib.identity(property) + ':' + path.join('/');
+    }
+    return null;
+})"""
+
+REGISTER_FUNCTION = """(function(tmp){
+    if(!$._pydobe.hasOwnProperty('_identities')){
+        $._pydobe._identities = {};
+        $._pydobe._identityKeys = {};
+    }
+    var key = null;
+    try{key = $._pydobe.lib.identity(tmp)}catch(e){}
+    if(key !== null && $._pydobe._identities.hasOwnProperty(key)){
+        var knownId = $._pydobe._identities[key];
+        var same = false;
+        // make sure the registered object still exists and still is at the same place
+        try{same = $._pydobe.hasOwnProperty(knownId) && $._pydobe.lib.identity($._pydobe[knownId]) === key}catch(e){}
+        if(same){return knownId}
+    }
+    var newPydobeId = $._pydobe.generateId();
+    $._pydobe[newPydobeId] = tmp;
+    if(key !== null){
+        $._pydobe._identities[key] = newPydobeId;
+        $._pydobe._identityKeys[newPydobeId] = key;
+    }
+    return newPydobeId;
+})"""
+
+SERIALISE_FUNCTION = """(function(tmp, expand, element){
+    if(typeof tmp === 'object' && tmp !== null){
+        if(expand && tmp instanceof Array){
+            var items = [];
+            for(var i = 0; i < tmp.length; i++){items.push($._pydobe.lib.serialise(tmp[i], true, true))}
+            return '{"isArray": true, "items": [' + items.join(",") + ']}';
+        }
+        var pydobeId = $._pydobe.lib.register(tmp);
+        return ExtendJSON.stringify({"isObject": true, "objectType": tmp.reflect.name, "pydobeId": pydobeId}, internal_variables_replacer, 0, 1);
+    }
+    return element ? ExtendJSON.stringify(String(tmp)) : tmp;
+})"""
+
+# ExtendScript evaluating several pieces of code, returning the result of each one as JSON text.
+# Code with an expand flag of null is returned as is, otherwise it is serialised
+BATCH_FUNCTION = """(function(codes, expands){
+    var results = [];
+    for(var i = 0; i < codes.length; i++){
+        try{
+            var value = eval(codes[i]);
+            if(expands[i] !== null){value = $._pydobe.lib.serialise(value, expands[i], false)}
+            results.push(ExtendJSON.stringify(String(value)));
+        }
+        catch(e){e.error=true;results.push(ExtendJSON.stringify(ExtendJSON.stringify(e)))}
+    }
+    return "[" + results.join(",") + "]";
+})"""
+
+library.register("isLayer", IS_LAYER_FUNCTION)
+library.register("identity", IDENTITY_FUNCTION)
+library.register("register", REGISTER_FUNCTION)
+library.register("serialise", SERIALISE_FUNCTION)
+library.register("batch", BATCH_FUNCTION)
+
+
+def eval_script_returning_object(line: str, connection: Connection = None):
+    """Eval the line as ExtendScript code.
+    If the code returns an object, it will be stored with an id for pydobe to handle.
+    Arrays are returned as lists, unless the line is an assignment"""
+    return _eval_line(line, not is_assignment(line), connection)
+
+
+def is_assignment(line: str) -> bool:
+    """True if the line of ExtendScript assigns a value"""
+    return bool(_ASSIGNMENT_LINE_PATTERN.match(line))
+
+
+def _eval_line(line: str, expand_arrays: bool, connection: Connection = None):
+    connection = get_connection(connection)
+    # Use the result fetched by a batch, or hand the line over to the batch recording it
+    result = _intercept(line, False, connection)
+    if result is MISSING:
+        # Get the resulting data
+        result = eval_script(line_script(line, expand_arrays), connection)
+    return decode_result(result, connection)
+
+
+def line_script(line: str, expand_arrays: bool) -> str:
+    """ExtendScript evaluating the line, registering the object it returns for pydobe"""
+    serialise = library.call(
+        "serialise", "tmp", format_to_extend(expand_arrays), "false"
+    )
+    return f"var tmp = {line}\n{serialise}"
+
+
+def decode_result(result, connection: Connection = None):
+    """Convert objects returned by pydobeSerialise to pydobe ids and arrays to lists"""
+    if isinstance(result, dict):
+        connection = get_connection(connection)
+        # Extract pydobe ID if object is returned
+        if result.get("isObject"):
+            kwargs = ObjectKwargs(
+                pydobe_id=result["pydobeId"],
+                object_type=result["objectType"],
+                connection=connection,
             )
-        return kwargs
+            connection.tracker.track(result["pydobeId"], kwargs)
+            return kwargs
+        if result.get("isArray"):
+            return [
+                decode_result(
+                    decode_response(item) if isinstance(item, str) else item, connection
+                )
+                for item in result["items"]
+            ]
     return result
 
 
-def eval_script(code: str):
+def eval_script(code: str, connection: Connection = None):
     """Send ExtendScript code to adobe software, retrieve and decode the response"""
 
-    # send code to adobe software (adding try statement to prevent error popup message locking UI)
-    response = requests.post(
-        PANEL_URL,
-        json={
-            "to_eval": "try{\n"
-            + code
-            + "\n}catch(e){e.error=true;ExtendJSON.stringify(e)}"
-        },
+    connection = get_connection(connection)
+    result = _intercept(code, True, connection)
+    if result is not MISSING:
+        return result
+
+    payload = build_payload(code, connection)
+    data = post_payload(payload, connection)
+    if data == LIBRARY_MISSING:
+        install_library(connection)
+        data = post_payload(payload, connection)
+    # the code may have changed the project, cached reads check the revision again
+    connection.property_cache.expire()
+    return decode_response(data)
+
+
+def build_payload(code: str, connection: Connection = None) -> dict:
+    """The request sending the code to the panel"""
+    # release the objects no longer used by pydobe along with the code
+    pydobe_ids = get_connection(connection).tracker.take_pending()
+    if pydobe_ids:
+        code = release_script(pydobe_ids) + "\n" + code
+
+    # the code only runs once the library it relies on is installed
+    code = f'if({library.guard()}){{"{LIBRARY_MISSING}"}}else{{\n{code}\n}}'
+
+    # adding try statement to prevent error popup message locking UI
+    return {
+        "to_eval": "try{\n" + code + "\n}catch(e){e.error=true;ExtendJSON.stringify(e)}"
+    }
+
+
+def library_payload() -> dict:
+    """The request installing the library of ExtendScript functions"""
+    return {
+        "to_eval": "try{\n"
+        + library.install_script()
+        + "\n}catch(e){e.error=true;ExtendJSON.stringify(e)}"
+    }
+
+
+def install_library(connection: Connection = None):
+    """Install the library of ExtendScript functions used by pydobe in After Effects"""
+    connection = get_connection(connection)
+    check_library_installed(post_payload(library_payload(), connection, "install"))
+
+
+def check_library_installed(data: str):
+    """Raise an error if the response to library_payload() is not the version of the library"""
+    if data != library.version:
+        raise RuntimeError(f"The pydobe library could not be installed: {data}")
+
+
+# ROUND TRIPS
+
+# Ids of the objects within a response, batched results being JSON within JSON
+_HANDLE_PATTERN = re.compile(r'\\?"pydobeId\\?":\s*\\?"(\w+)')
+
+# Functions called with a RoundTrip before and after every request sent to the panel
+_before_hooks = []
+_after_hooks = []
+
+
+class RoundTrip(object):
+    """A request sent to the panel, given to the round trip hooks.
+    Response values are set once the response is back"""
+
+    __slots__ = (
+        "connection",
+        "kind",
+        "script_size",
+        "response_size",
+        "started",
+        "duration",
+        "handles_created",
+        "error",
+        "call_site",
+    )
+
+    def __init__(self, connection: Connection, kind: str, script_size: int):
+        self.connection = connection
+        # "script", "install" for the library, or "release" for released handles
+        self.kind = kind
+        # sizes in bytes
+        self.script_size = script_size
+        self.response_size = 0
+        self.started = time.perf_counter()
+        # seconds
+        self.duration = None
+        # number of objects newly stored in $._pydobe for pydobe
+        self.handles_created = 0
+        self.error = None
+        # set by the hooks, see pydobe.tracing
+        self.call_site = None
+
+    def __repr__(self) -> str:
+        return f"<RoundTrip {self.kind} {self.script_size}B from {self.call_site}>"
+
+
+def add_round_trip_hook(before=None, after=None):
+    """Call `before` with a RoundTrip ahead of every request sent to the panel,
+    and `after` with the same RoundTrip once the response is back or the request failed
+    """
+    if before is not None:
+        _before_hooks.append(before)
+    if after is not None:
+        _after_hooks.append(after)
+
+
+def remove_round_trip_hook(before=None, after=None):
+    if before is not None:
+        _before_hooks.remove(before)
+    if after is not None:
+        _after_hooks.remove(after)
+
+
+def start_round_trip(payload: dict, connection: Connection, kind: str = "script"):
+    """The RoundTrip of the request about to be sent, None when there are no hooks"""
+    if not (_before_hooks or _after_hooks):
+        return None
+    trip = RoundTrip(connection, kind, len(payload["to_eval"].encode("utf-8")))
+    for hook in tuple(_before_hooks):
+        hook(trip)
+    return trip
+
+
+def finish_round_trip(trip: RoundTrip, data: str = None, error: BaseException = None):
+    """Complete the RoundTrip with the response, or the error, and call the hooks"""
+    if trip is None:
+        return
+    trip.duration = time.perf_counter() - trip.started
+    trip.error = error
+    if data is not None:
+        trip.response_size = len(data.encode("utf-8"))
+        tracker = trip.connection.tracker
+        trip.handles_created = len(
+            {
+                pydobe_id
+                for pydobe_id in _HANDLE_PATTERN.findall(data)
+                if pydobe_id not in tracker
+            }
+        )
+    for hook in tuple(_after_hooks):
+        hook(trip)
+
+
+def post_payload(payload: dict, connection: Connection, kind: str = "script") -> str:
+    """Send the payload to the panel, calling the round trip hooks around the request"""
+    trip = start_round_trip(payload, connection, kind)
+    if trip is None:
+        return connection.transport.post(payload)
+    try:
+        data = connection.transport.post(payload)
+    except BaseException as error:
+        finish_round_trip(trip, error=error)
+        raise
+    finish_round_trip(trip, data)
+    return data
+
+
+def release_handles(connection: Connection = None):
+    """Release every unused ExtendScript object straight away, instead of with the next script"""
+    connection = get_connection(connection)
+    pydobe_ids = connection.tracker.take_pending(force=True)
+    if pydobe_ids:
+        # released before anything else, a missing library means these objects are already gone
+        payload = build_payload(release_script(pydobe_ids), connection)
+        post_payload(payload, connection, "release")
+
+
+def live_handles(connection: Connection = None) -> int:
+    """The number of ExtendScript objects stored in $._pydobe and used by pydobe"""
+    return len(get_connection(connection).tracker)
+
+
+class HandleArena(object):
+    """Release every ExtendScript object created within the context, when leaving it.
+
+    with HandleArena():
+        for item in project.items:
+            print(item.name)
+
+    Python objects created inside the arena can not be used once it has been left"""
+
+    def __init__(self, connection: Connection = None):
+        self.connection = get_connection(connection)
+        self.pydobe_ids = set()
+
+    def __enter__(self):
+        self.connection.tracker.push_arena(self.pydobe_ids)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        tracker = self.connection.tracker
+        tracker.pop_arena()
+        tracker.release(self.pydobe_ids)
+        self.pydobe_ids = set()
+        release_handles(self.connection)
+
+
+def refresh_cache(connection: Connection = None) -> bool:
+    """Check the project revision, dropping cached property values if it changed.
+    Returns True if values were dropped"""
+    connection = get_connection(connection)
+    return connection.property_cache.validate(
+        eval_script_returning_object("app.project.revision;", connection)
     )
 
-    # handle response
-    data = response.text
 
-    # Check if the data is an object. If it is - decode it. If not - return data as text
+class ReadCache(object):
+    """Cache property reads on every object within the context.
+
+    The project revision is checked when entering, when a Batch is flushed, with refresh_cache(),
+    before the first cached read following any other script, and once `max_age` seconds
+    have passed since the last check.
+    Any change to the project drops every cached value
+
+    with ReadCache():
+        for comp in project.compositions:
+            print(comp.name, comp.width, comp.height)"""
+
+    def __init__(self, max_age: float = None, connection: Connection = None):
+        self.max_age = max_age
+        self.connection = get_connection(connection)
+
+    def __enter__(self):
+        cache = self.connection.property_cache
+        cache.enable()
+        if self.max_age is not None:
+            cache.max_age = self.max_age
+        refresh_cache(self.connection)
+        return cache
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        cache = self.connection.property_cache
+        cache.disable()
+        if not cache.enabled:
+            cache.max_age = None
+
+
+def _decode_literal(value: str):
+    """The value a getter would receive after assigning the ExtendScript literal"""
+    try:
+        value = json.loads(value)
+    except json.decoder.JSONDecodeError:
+        return MISSING
+    if isinstance(value, str):
+        return decode_response(value)
+    return value
+
+
+def decode_response(data: str):
+    """Check if the data is an object. If it is - decode it. If not - return data as text"""
     try:
         decoded_data = json.loads(data)
     except json.decoder.JSONDecodeError:
@@ -122,32 +848,190 @@ def eval_script(code: str):
     return decoded_data
 
 
-def format_to_extend(obj):
-    """Format the argument to ExtendScript"""
+def eval_script_batch(entries: list, connection: Connection = None) -> list:
+    """Eval several pieces of ExtendScript code in a single request.
+
+    `entries` is a list of (code, raw, connection) tuples, all for the given connection.
+    Raw code is treated as eval_script would, otherwise the code is treated as a line
+    given to eval_script_returning_object.
+    The decoded result of each entry is returned in order, errors are returned per entry
+    """
+    codes = [code for code, raw, _ in entries]
+    expands = [None if raw else not is_assignment(code) for code, raw, _ in entries]
+    script = library.call("batch", json.dumps(codes), json.dumps(expands))
+    texts = eval_script(script, connection)
+    if not isinstance(texts, list):
+        raise RuntimeError(f"The batched ExtendScript could not be evaluated: {texts}")
+    return [decode_response(text) for text in texts]
+
+
+# DEFERRED EVALUATION
+
+
+class ScriptDeferred(BaseException):
+    """Raised while a call is being recorded, carrying the code it would have sent.
+    Derived from BaseException so it passes through the error handling of the objects"""
+
+    def __init__(self, code: str, raw: bool, connection: Connection):
+        super(ScriptDeferred, self).__init__(code)
+        self.code = code
+        self.raw = raw
+        self.connection = connection
+
+
+_deferred = threading.local()
+
+
+def _intercept(code: str, raw: bool, connection: Connection):
+    """Return the prefetched result for the code, raise ScriptDeferred if recording.
+    Returns MISSING when the code needs to be sent to the panel"""
+    prefetched = getattr(_deferred, "prefetched", None)
+    if prefetched and prefetched[0][0] == (code, raw, connection):
+        return prefetched.popleft()[1]
+    if _is_recording():
+        raise ScriptDeferred(code, raw, connection)
+    return MISSING
+
+
+def _is_recording() -> bool:
+    return getattr(_deferred, "recording", False)
+
+
+def _is_replaying() -> bool:
+    return bool(getattr(_deferred, "prefetched", None))
+
+
+def record_call(function, answers: list = ()) -> tuple:
+    """Run the function until it sends a script not answered yet.
+    `answers` are the (entry, result) pairs of the scripts it already sent, in order.
+    Returns the (code, raw, connection) entry that was about to be sent and None,
+    or None and the return value if the function did not need After Effects any further
+    """
+    previous = getattr(_deferred, "prefetched", None)
+    previous_releases = getattr(_deferred, "releases", None)
+    prefetched = _deferred.prefetched = collections.deque(answers)
+    releases = _deferred.releases = []
+    _deferred.recording = True
+    try:
+        value = function()
+    except ScriptDeferred as deferred:
+        if prefetched:
+            raise RuntimeError(
+                "The function sent different scripts when it was run again"
+            ) from None
+        return (deferred.code, deferred.raw, deferred.connection), None
+    finally:
+        _deferred.recording = False
+        _deferred.prefetched = previous
+        _deferred.releases = previous_releases
+    _release_deferred(releases)
+    return None, value
+
+
+def replay_call(function, entry: tuple, result):
+    """Run the function again, answering its first script with an already fetched result.
+    Any further script it sends is evaluated as usual"""
+    previous = getattr(_deferred, "prefetched", None)
+    previous_releases = getattr(_deferred, "releases", None)
+    _deferred.prefetched = collections.deque([(entry, result)])
+    releases = _deferred.releases = []
+    try:
+        value = function()
+    finally:
+        _deferred.prefetched = previous
+        _deferred.releases = previous_releases
+    _release_deferred(releases)
+    return value
+
+
+def _release_deferred(objects: list):
+    """Release the objects released by a recorded call once it has returned,
+    deferring them again if it was itself run within a recorded call"""
+    releases = getattr(_deferred, "releases", None)
+    for obj in objects:
+        if releases is not None:
+            releases.append(obj)
+        else:
+            obj._forget()
+
+
+def deferred_script(entry: tuple) -> str:
+    """The ExtendScript sent for a (code, raw, connection) entry returned by record_call"""
+    code, raw, connection = entry
+    if raw:
+        return code
+    return line_script(code, expand_arrays=not is_assignment(code))
+
+
+# TRANSACTIONS
+
+_transactions = threading.local()
+
+
+def current_transaction(connection: Connection = None):
+    """The innermost transaction open on this thread for the connection, None if there is none"""
+    connection = get_connection(connection)
+    for transaction in reversed(getattr(_transactions, "stack", [])):
+        if transaction.connection is connection:
+            return transaction
+    return None
+
+
+def open_transaction(transaction):
+    """Queue the setters called on this thread in the transaction until it is closed"""
+    if not hasattr(_transactions, "stack"):
+        _transactions.stack = []
+    _transactions.stack.append(transaction)
+
+
+def close_transaction(transaction):
+    stack = getattr(_transactions, "stack", [])
+    if transaction in stack:
+        stack.remove(transaction)
+
+
+def format_to_extend(obj) -> str:
+    """Format the argument to ExtendScript.
+
+    Values are written as JSON, which ExtendScript reads as literals, so strings need no escaping
+    of their own and are passed whatever their size. Pydobe objects, including those within lists
+    and dictionaries, are passed as the ExtendScript objects they mirror"""
     if isinstance(obj, PydobeBaseObject):
         return f'$._pydobe["{obj.pydobe_id}"]'
-    elif isinstance(obj, bool):
-        return str(obj).lower()
-    elif isinstance(obj, list):
+    try:
+        return json.dumps(obj)
+    except TypeError:
+        # pydobe objects within the value
+        pass
+    if isinstance(obj, (list, tuple)):
         return f"[{', '.join([format_to_extend(item) for item in obj])}]"
+    elif isinstance(obj, dict):
+        members = [
+            f"{json.dumps(str(key))}: {format_to_extend(value)}"
+            for key, value in obj.items()
+        ]
+        return f"{{{', '.join(members)}}}"
+    raise TypeError(f"Unable to pass {type(obj).__name__} to ExtendScript")
+
+
+def convert_to_list(line, connection: Connection = None):
+    """Materialise the ExtendScript array returned by the line in a single request"""
+    return _eval_line(line, True, connection)
 
 
-def convert_to_list(line):
-    data_list = []
-    count_line = f"{line[:-1]}.length;"
-    count = eval_script_returning_object(count_line)
-    for index in range(count):
-        value_line = f"{line[:-1]}[{index}];"
-        value = eval_script_returning_object(value_line)
-        data_list.append(value)
-    return data_list
+def create_python_object(object_type: str, default: type = None) -> type:
+    """The Python class mirroring the ExtendScript type.
+    ExtendScript types without a class of their own are mirrored by the default class,
+    PydobeBaseObject unless given"""
+    python_class = object_types.get(object_type)
+    if python_class is None:
+        return default or PydobeBaseObject
+    return python_class
 
 
-def create_python_object(object_type):
-    subclasses = get_all_subclasses(PydobeBaseObject)
-    for subclass in subclasses:
-        if subclass.__name__ == object_type:
-            return subclass
+def register_object_type(object_type: str, python_class: type):
+    """Mirror an ExtendScript type with an existing class, MaskPropertyGroup with PropertyGroup for example"""
+    object_types[object_type] = python_class
 
 
 def get_all_subclasses(cls):
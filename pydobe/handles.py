@@ -0,0 +1,115 @@
+import json
+import threading
+import weakref
+
+from pydobe.library import library
+
+
+class ObjectKwargs(dict):
+    """Keyword arguments describing an object stored in $._pydobe.
+    Holds a reference to the pydobe id until the dictionary is garbage collected"""
+
+    __slots__ = ("__weakref__",)
+
+
+class HandleTracker(object):
+    """Count the Python references to every pydobe id, and collect the ids no longer used.
+
+    Released ids are sent to After Effects along with the next script, once at least
+    `release_threshold` of them are waiting, or straight away with `pydobe.core.release_handles()`
+    """
+
+    def __init__(self, release_threshold: int = 64):
+        self.release_threshold = release_threshold
+        self._counts = {}
+        self._pending = {}
+        # finalizers can run on any thread while the lock is held, so it has to be re-entrant
+        self._lock = threading.RLock()
+        self._arenas = threading.local()
+
+    def __len__(self) -> int:
+        """The number of pydobe ids alive in After Effects and referenced from Python"""
+        return len(self._counts)
+
+    def __contains__(self, pydobe_id: str) -> bool:
+        """True if the pydobe id is referenced from Python, or waiting to be released"""
+        return pydobe_id in self._counts or pydobe_id in self._pending
+
+    @property
+    def pending_count(self) -> int:
+        """The number of unused pydobe ids waiting to be released in After Effects"""
+        return len(self._pending)
+
+    def track(self, pydobe_id: str, owner: object):
+        """Keep the pydobe id alive for as long as the owner is"""
+        with self._lock:
+            if pydobe_id not in self._counts:
+                # the id came back before its release was sent, it is still valid
+                self._pending.pop(pydobe_id, None)
+                arenas = getattr(self._arenas, "stack", None)
+                if arenas:
+                    arenas[-1].add(pydobe_id)
+            self._counts[pydobe_id] = self._counts.get(pydobe_id, 0) + 1
+        finalizer = weakref.finalize(owner, self._untrack, pydobe_id)
+        finalizer.atexit = False
+
+    def _untrack(self, pydobe_id: str):
+        with self._lock:
+            count = self._counts.get(pydobe_id)
+            if count is None:
+                return
+            if count > 1:
+                self._counts[pydobe_id] = count - 1
+            else:
+                del self._counts[pydobe_id]
+                self._pending[pydobe_id] = None
+
+    def release(self, pydobe_ids: list):
+        """Release the ids even though Python objects still refer to them"""
+        with self._lock:
+            for pydobe_id in pydobe_ids:
+                self._counts.pop(pydobe_id, None)
+                self._pending[pydobe_id] = None
+
+    def take_pending(self, force: bool = False) -> list:
+        """Return the ids to release in After Effects, if there are enough of them to bother"""
+        with self._lock:
+            if not self._pending or (
+                not force and len(self._pending) < self.release_threshold
+            ):
+                return []
+            pydobe_ids = list(self._pending)
+            self._pending.clear()
+        return pydobe_ids
+
+    def push_arena(self, arena: set):
+        stack = getattr(self._arenas, "stack", None)
+        if stack is None:
+            stack = self._arenas.stack = []
+        stack.append(arena)
+
+    def pop_arena(self):
+        self._arenas.stack.pop()
+
+
+RELEASE_FUNCTION = """(function(ids){
+    var keys = $._pydobe._identityKeys || {};
+    for(var i = 0; i < ids.length; i++){
+        delete $._pydobe[ids[i]];
+        if(keys.hasOwnProperty(ids[i])){
+            delete $._pydobe._identities[keys[ids[i]]];
+            delete keys[ids[i]];
+        }
+    }
+})"""
+
+
+library.register("release", RELEASE_FUNCTION)
+
+
+def release_script(pydobe_ids: list) -> str:
+    """ExtendScript deleting the ids from $._pydobe"""
+    return library.call("release", json.dumps(pydobe_ids)) + ";"
+
+
+tracker = HandleTracker()
@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+# Returned by the panel in place of the result when the library is missing or out of date
+LIBRARY_MISSING = "pydobe:library-missing"
+
+
+class ScriptLibrary(object):
+    """ExtendScript functions installed once in After Effects, then called by name.
+
+    Functions are stored in $._pydobe.lib along with the version of the library.
+    Every script sent to the panel checks the version first, answering LIBRARY_MISSING
+    when After Effects was restarted or the library changed, for pydobe to install it and send the script again
+    """
+
+    def __init__(self):
+        self._functions = {}
+        self._version = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._functions
+
+    @property
+    def version(self) -> str:
+        """Hash of every function of the library"""
+        if self._version is None:
+            sources = json.dumps(sorted(self._functions.items()))
+            self._version = hashlib.sha1(sources.encode("utf-8")).hexdigest()[:12]
+        return self._version
+
+    def register(self, name: str, source: str):
+        """Add an ExtendScript function to the library, given as an expression, `(function(a, b){...})`"""
+        self._functions[name] = source
+        self._version = None
+
+    def call(self, name: str, *arguments: str) -> str:
+        """ExtendScript calling a function of the library, with arguments given as ExtendScript"""
+        if name not in self._functions:
+            raise KeyError(f"There is no function named '{name}' in the library")
+        return f"$._pydobe.lib.{name}({', '.join(arguments)})"
+
+    def guard(self) -> str:
+        """ExtendScript condition, true when the installed library is missing or out of date"""
+        return (
+            f"$._pydobe.lib === undefined || $._pydobe.lib.version !== '{self.version}'"
+        )
+
+    def install_script(self) -> str:
+        """ExtendScript installing the library, returning its version"""
+        functions = ",\n".join(
+            f"{json.dumps(name)}: {source}" for name, source in self._functions.items()
+        )
+        return f"$._pydobe.lib = {{\n{functions},\n\"version\": '{self.version}'\n}};\n$._pydobe.lib.version"
+
+
+library = ScriptLibrary()
@@ -0,0 +1,270 @@
+import concurrent.futures
+import queue
+import threading
+import time
+
+import requests
+
+from pydobe.after_effects.objects.root import Root
+from pydobe.core import HOST, PORT, Connection
+
+# Errors meaning the instance could not be reached, rather than the job failing
+CONNECTION_ERRORS = (ConnectionError, requests.ConnectionError, requests.Timeout)
+
+
+def discover_connections(
+    host: str = HOST, ports: range = range(PORT, PORT + 10), timeout: float = 0.5
+) -> list:
+    """Connections to every panel answering on the given ports.
+    Panels started by several instances use the ports following the first one,
+    the connections probing the other ports are closed"""
+    connections = []
+    for port in ports:
+        connection = Connection(host, port)
+        if connection.is_alive(timeout):
+            connections.append(connection)
+        else:
+            # the probe opened a session of its own
+            connection.close()
+    return connections
+
+
+class InstanceStats(object):
+    """Jobs run by one After Effects instance of a ConnectionPool"""
+
+    __slots__ = (
+        "submitted",
+        "completed",
+        "failed",
+        "retried",
+        "busy_time",
+        "started_at",
+    )
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.busy_time = 0.0
+        self.started_at = time.monotonic()
+
+    @property
+    def throughput(self) -> float:
+        """Jobs completed per second since the pool started"""
+        elapsed = time.monotonic() - self.started_at
+        return self.completed / elapsed if elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        values = {name: getattr(self, name) for name in self.__slots__}
+        del values["started_at"]
+        values["throughput"] = self.throughput
+        return values
+
+
+class _Job(object):
+    __slots__ = ("function", "args", "kwargs", "future", "attempts")
+
+    def __init__(self, function, args: tuple, kwargs: dict):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.future = concurrent.futures.Future()
+        self.attempts = 0
+
+
+class PoolInstance(object):
+    """An After Effects instance of a ConnectionPool, with its own queue of jobs and worker thread"""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.root = Root(connection)
+        self.queue = queue.Queue()
+        self.healthy = True
+        self.busy = False
+        self.stats = InstanceStats()
+        self.thread = None
+
+    def __repr__(self) -> str:
+        state = "healthy" if self.healthy else "unreachable"
+        return f"<PoolInstance {self.connection.host}:{self.connection.port} {state}>"
+
+    @property
+    def load(self) -> int:
+        """The number of jobs queued or running"""
+        return self.queue.qsize() + self.busy
+
+
+class ConnectionPool(object):
+    """Spread jobs across several After Effects instances, each one running a job at a time.
+
+    A job is a function called with the Root of the instance it runs on, followed by its arguments.
+    Jobs go to the queue of the healthy instance with the least work. When an instance cannot be
+    reached its jobs move to the other instances, and it is checked again every `health_interval`
+
+    def relink(root, path):
+        root.app.open(path)
+        ...
+        root.app.project.save()
+
+    with ConnectionPool(ports=[2000, 2001, 2002]) as pool:
+        futures = [pool.submit(relink, path) for path in paths]
+    """
+
+    def __init__(
+        self,
+        connections: list = None,
+        ports: list = None,
+        host: str = HOST,
+        retries: int = 1,
+        health_interval: float = 5.0,
+    ):
+        if connections is None:
+            if ports is None:
+                connections = discover_connections(host)
+            else:
+                connections = [Connection(host, port) for port in ports]
+        if not connections:
+            raise ConnectionError("No After Effects instance to connect to")
+        self.retries = retries
+        self.health_interval = health_interval
+        self.instances = [PoolInstance(connection) for connection in connections]
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        for instance in self.instances:
+            instance.thread = threading.Thread(
+                target=self._work,
+                args=(instance,),
+                name=f"pydobe-{instance.connection.port}",
+                daemon=True,
+            )
+            instance.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    # FUNCTIONS
+
+    def submit(self, function, *args, **kwargs) -> concurrent.futures.Future:
+        """Queue the job, called with the Root of the instance it runs on followed by the arguments"""
+        if self._closed.is_set():
+            raise RuntimeError("The pool has been shut down")
+        job = _Job(function, args, kwargs)
+        self._schedule(job)
+        return job.future
+
+    def map(self, function, *iterables) -> list:
+        """Run the job for every set of arguments, returning the results in order"""
+        futures = [self.submit(function, *args) for args in zip(*iterables)]
+        return [future.result() for future in futures]
+
+    def health_check(self) -> dict:
+        """Ping every instance, returning whether it answered by port"""
+        for instance in self.instances:
+            instance.healthy = instance.connection.is_alive()
+        return {
+            instance.connection.port: instance.healthy for instance in self.instances
+        }
+
+    def stats(self) -> dict:
+        """Jobs run by each instance, by port"""
+        return {
+            instance.connection.port: dict(
+                instance.stats.as_dict(),
+                healthy=instance.healthy,
+                queued=instance.queue.qsize(),
+            )
+            for instance in self.instances
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers once the queued jobs are done"""
+        self._closed.set()
+        for instance in self.instances:
+            instance.queue.put(None)
+        if wait:
+            for instance in self.instances:
+                instance.thread.join()
+        for instance in self.instances:
+            instance.connection.close()
+
+    def _schedule(self, job: _Job, exclude: PoolInstance = None):
+        with self._lock:
+            candidates = [
+                instance
+                for instance in self.instances
+                if instance.healthy and instance is not exclude
+            ]
+            if not candidates:
+                self.health_check()
+                candidates = [
+                    instance for instance in self.instances if instance.healthy
+                ]
+            if not candidates:
+                job.future.set_exception(
+                    ConnectionError("No After Effects instance is available")
+                )
+                return
+            instance = min(candidates, key=lambda candidate: candidate.load)
+            instance.stats.submitted += 1
+            instance.queue.put(job)
+
+    def _reschedule_queued(self, instance: PoolInstance):
+        """Move the jobs waiting on an unreachable instance to the other ones"""
+        while True:
+            try:
+                job = instance.queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is None:
+                # keep the shutdown request for the worker
+                instance.queue.put(None)
+                return
+            self._schedule(job, exclude=instance)
+
+    def _work(self, instance: PoolInstance):
+        while True:
+            if not instance.healthy:
+                self._reschedule_queued(instance)
+                if self._closed.wait(self.health_interval):
+                    return
+                instance.healthy = instance.connection.is_alive()
+                continue
+            job = instance.queue.get()
+            if job is None:
+                if instance.queue.empty():
+                    return
+                # jobs moved from another instance after the shutdown request, run them first
+                instance.queue.put(None)
+                continue
+            # retried jobs are already running
+            if not job.attempts and not job.future.set_running_or_notify_cancel():
+                continue
+            self._run(instance, job)
+
+    def _run(self, instance: PoolInstance, job: _Job):
+        instance.busy = True
+        started = time.monotonic()
+        try:
+            result = job.function(instance.root, *job.args, **job.kwargs)
+        except CONNECTION_ERRORS as error:
+            instance.healthy = False
+            job.attempts += 1
+            if job.attempts <= self.retries:
+                instance.stats.retried += 1
+                self._schedule(job, exclude=instance)
+            else:
+                instance.stats.failed += 1
+                job.future.set_exception(error)
+        except Exception as error:
+            instance.stats.failed += 1
+            job.future.set_exception(error)
+        else:
+            instance.stats.completed += 1
+            job.future.set_result(result)
+        finally:
+            instance.stats.busy_time += time.monotonic() - started
+            instance.busy = False
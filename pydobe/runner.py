@@ -0,0 +1,239 @@
+import multiprocessing
+import pickle
+import queue
+import time
+import traceback
+
+from pydobe.core import HOST, Connection
+from pydobe.pool import CONNECTION_ERRORS, discover_connections
+
+
+class ProjectResult(object):
+    """Outcome of running a function on one project file"""
+
+    __slots__ = (
+        "path",
+        "port",
+        "value",
+        "error",
+        "traceback",
+        "duration",
+        "attempts",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        port: int = None,
+        value=None,
+        error: str = None,
+        traceback: str = None,
+        duration: float = 0.0,
+        attempts: int = 0,
+    ):
+        self.path = path
+        self.port = port
+        self.value = value
+        self.error = error
+        self.traceback = traceback
+        self.duration = duration
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        outcome = "ok" if self.ok else f"failed: {self.error}"
+        return f"<ProjectResult '{self.path}' {outcome} in {self.duration:.2f}s>"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_projects(
+    paths: list,
+    function,
+    ports: list = None,
+    host: str = HOST,
+    save: bool = True,
+    retries: int = 1,
+    health_interval: float = 5.0,
+    restart_timeout: float = 300.0,
+) -> list:
+    """Open every project, call the function with it, then save and close it.
+
+    The projects are spread across one worker process per After Effects instance, each one talking
+    to the panel on its own port, every instance found when no ports are given. The function is
+    called with the Project and its return value is kept in the result, both have to be picklable,
+    the function being defined at the top level of a module.
+
+    When an instance cannot be reached its project is handed to another worker, up to `retries` times,
+    and the worker waits up to `restart_timeout` seconds for the instance to come back.
+    Returns a ProjectResult for every path, in order"""
+    paths = [str(path) for path in paths]
+    if ports is None:
+        ports = [connection.port for connection in discover_connections(host)]
+    if not ports:
+        raise ConnectionError("No After Effects instance to connect to")
+
+    jobs = multiprocessing.Queue()
+    messages = multiprocessing.Queue()
+    for index, path in enumerate(paths):
+        jobs.put((index, path, 0))
+    workers = {}
+    for port in ports:
+        worker = multiprocessing.Process(
+            target=_work,
+            args=(
+                host,
+                port,
+                function,
+                save,
+                retries,
+                health_interval,
+                restart_timeout,
+                jobs,
+                messages,
+            ),
+            name=f"pydobe-runner-{port}",
+            daemon=True,
+        )
+        worker.start()
+        workers[port] = worker
+
+    results = [None] * len(paths)
+    running = {}
+    remaining = len(paths)
+    while remaining:
+        try:
+            message = messages.get(timeout=1.0)
+        except queue.Empty:
+            remaining -= _recover_crashed(
+                workers, running, jobs, results, paths, retries
+            )
+            if not any(worker.is_alive() for worker in workers.values()):
+                break
+            continue
+        kind, port, *values = message
+        if kind == "started":
+            running[port] = values
+        elif kind == "retried":
+            running.pop(port, None)
+        elif kind == "finished":
+            running.pop(port, None)
+            index, value, error, trace, duration, attempts = values
+            results[index] = ProjectResult(
+                paths[index], port, value, error, trace, duration, attempts
+            )
+            remaining -= 1
+
+    for _ in workers:
+        jobs.put(None)
+    for worker in workers.values():
+        worker.join(timeout=health_interval)
+        if worker.is_alive():
+            worker.terminate()
+
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = ProjectResult(
+                paths[index], error="No After Effects instance was available"
+            )
+    return results
+
+
+def _recover_crashed(
+    workers: dict, running: dict, jobs, results: list, paths: list, retries: int
+) -> int:
+    """Hand the projects of crashed worker processes over to the others.
+    Returns the number of projects given up on"""
+    failed = 0
+    for port, worker in workers.items():
+        if worker.is_alive() or port not in running:
+            continue
+        index, attempts = running.pop(port)
+        attempts += 1
+        if attempts <= retries:
+            jobs.put((index, paths[index], attempts))
+        else:
+            results[index] = ProjectResult(
+                paths[index],
+                port,
+                error="The worker process stopped",
+                attempts=attempts,
+            )
+            failed += 1
+    return failed
+
+
+def _work(
+    host: str,
+    port: int,
+    function,
+    save: bool,
+    retries: int,
+    health_interval: float,
+    restart_timeout: float,
+    jobs,
+    messages,
+):
+    """Worker process running projects on the instance listening on the port"""
+    from pydobe.after_effects.objects.root import Root
+
+    connection = Connection(host, port)
+    root = Root(connection)
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        index, path, attempts = job
+        messages.put(("started", port, index, attempts))
+        started = time.monotonic()
+        attempts += 1
+        try:
+            value = _run_project(root, path, function, save)
+            # results are sent to the main process, check they can be before they get lost
+            pickle.dumps(value)
+        except CONNECTION_ERRORS as error:
+            if attempts <= retries:
+                jobs.put((index, path, attempts))
+                messages.put(("retried", port))
+            else:
+                messages.put(_failure(port, index, error, started, attempts))
+            if not _wait_for_instance(connection, health_interval, restart_timeout):
+                return
+        except Exception as error:
+            messages.put(_failure(port, index, error, started, attempts))
+        else:
+            duration = time.monotonic() - started
+            messages.put(
+                ("finished", port, index, value, None, None, duration, attempts)
+            )
+
+
+def _failure(port: int, index: int, error: Exception, started: float, attempts: int):
+    """The message reporting a project which failed, sent from within the except block"""
+    duration = time.monotonic() - started
+    trace = traceback.format_exc()
+    return "finished", port, index, None, repr(error), trace, duration, attempts
+
+
+def _run_project(root, path: str, function, save: bool):
+    project = root.app.open(path, save=False)
+    if project is None:
+        raise RuntimeError(f"The project {path} could not be opened")
+    try:
+        value = function(project)
+        if save:
+            project.save()
+    finally:
+        project.close(save=False)
+    return value
+
+
+def _wait_for_instance(connection: Connection, interval: float, timeout: float) -> bool:
+    """Wait for the instance to answer again. Returns False if it did not within the timeout"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if connection.is_alive():
+            return True
+        time.sleep(interval)
+    return False
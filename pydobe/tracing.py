@@ -0,0 +1,158 @@
+import json
+import math
+import sys
+import threading
+
+from pydobe.core import (
+    Connection,
+    RoundTrip,
+    add_round_trip_hook,
+    remove_round_trip_hook,
+)
+
+
+def find_call_site(frame=None) -> str:
+    """Name of the pydobe method a request is sent for, `CompItem.width getter` for example.
+
+    This is the innermost public method of a pydobe object on the stack, or the function
+    calling pydobe when the request was not sent by a method"""
+    if frame is None:
+        frame = sys._getframe(1)
+    caller = None
+    while frame is not None:
+        code = frame.f_code
+        name = code.co_name
+        module = frame.f_globals.get("__name__", "")
+        if not name.startswith("_") or (name.startswith("__") and name.endswith("__")):
+            owner = frame.f_locals.get("self")
+            if owner is not None and type(owner).__module__.startswith("pydobe."):
+                return _method_name(owner, code)
+        if caller is None and not module.startswith("pydobe"):
+            caller = f"{module}.{name}"
+        frame = frame.f_back
+    return caller or "<unknown>"
+
+
+def _method_name(owner, code) -> str:
+    cls = type(owner)
+    name = code.co_name
+    attribute = getattr(cls, name, None)
+    if isinstance(attribute, property):
+        if getattr(attribute.fset, "__code__", None) is code:
+            return f"{cls.__name__}.{name} setter"
+        return f"{cls.__name__}.{name} getter"
+    return f"{cls.__name__}.{name}"
+
+
+def percentile(values: list, percent: float) -> float:
+    """The percentile of the values, interpolated between the closest ones"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * percent / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Tracer(object):
+    """Record every round trip to the panel while active, along with the pydobe method sending it.
+    Only the round trips of the given connection are recorded, if one is given
+
+    with Tracer() as tracer:
+        for layer in comp.layers:
+            print(layer.name)
+    tracer.dump("trace.json")
+    """
+
+    def __init__(self, connection: Connection = None):
+        self.connection = connection
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        add_round_trip_hook(self._before, self._after)
+
+    def stop(self):
+        remove_round_trip_hook(self._before, self._after)
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    def _before(self, trip: RoundTrip):
+        if self.connection is None or trip.connection is self.connection:
+            trip.call_site = find_call_site(sys._getframe(1))
+
+    def _after(self, trip: RoundTrip):
+        if self.connection is None or trip.connection is self.connection:
+            with self._lock:
+                self.records.append(trip)
+
+    # REPORTS
+
+    def report(self) -> dict:
+        """Round trips aggregated by call site, the busiest first.
+        Times are in seconds, sizes in bytes"""
+        with self._lock:
+            records = list(self.records)
+        sites = {}
+        for trip in records:
+            sites.setdefault(trip.call_site, []).append(trip)
+        call_sites = [_summary(call_site, trips) for call_site, trips in sites.items()]
+        call_sites.sort(key=lambda summary: (-summary["count"], -summary["total_time"]))
+        total = _summary(None, records)
+        del total["call_site"]
+        total["call_sites"] = call_sites
+        return total
+
+    def dump(self, path: str = None, indent: int = 2) -> str:
+        """The report as JSON, written to the path if one is given"""
+        text = json.dumps(self.report(), indent=indent)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+    def format_report(self, limit: int = 20) -> str:
+        """The busiest call sites as a table, latencies in milliseconds"""
+        report = self.report()
+        lines = [
+            f"{report['count']} round trips in {report['total_time'] * 1000:.1f}ms",
+            f"{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'sent KB':>10}{'handles':>9}  call site",
+        ]
+        for summary in report["call_sites"][:limit]:
+            lines.append(
+                f"{summary['count']:>7}"
+                f"{summary['p50'] * 1000:>9.2f}"
+                f"{summary['p95'] * 1000:>9.2f}"
+                f"{summary['p99'] * 1000:>9.2f}"
+                f"{summary['script_bytes'] / 1024:>10.1f}"
+                f"{summary['handles_created']:>9}"
+                f"  {summary['call_site']}"
+            )
+        return "\n".join(lines)
+
+
+def _summary(call_site: str, trips: list) -> dict:
+    durations = [trip.duration for trip in trips]
+    return {
+        "call_site": call_site,
+        "count": len(trips),
+        "errors": sum(1 for trip in trips if trip.error is not None),
+        "total_time": sum(durations),
+        "p50": percentile(durations, 50),
+        "p95": percentile(durations, 95),
+        "p99": percentile(durations, 99),
+        "script_bytes": sum(trip.script_size for trip in trips),
+        "response_bytes": sum(trip.response_size for trip in trips),
+        "handles_created": sum(trip.handles_created for trip in trips),
+        "kinds": sorted({trip.kind for trip in trips}),
+    }
@@ -1,3 +1,4 @@
+import re
 from collections import UserDict
 
 
@@ -26,3 +27,28 @@ def hex_to_rgb(hex_value):
     hex_value = hex_value.lstrip("#")
     color_value_list = list(int(hex_value[i : i + 2], 16) for i in (0, 2, 4))
     return color_value_list
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Convert a glob pattern to a regular expression source usable in ExtendScript"""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        character = pattern[i]
+        if character == "*":
+            regex += ".*"
+        elif character == "?":
+            regex += "."
+        elif character == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            characters = pattern[i + 1 : end].replace("\\", "\\\\")
+            if characters.startswith("!"):
+                characters = "^" + characters[1:]
+            # a closing bracket first in the set is part of it
+            characters = characters.replace("]", "\\]")
+            regex += f"[{characters}]"
+            i = end
+        else:
+            regex += re.escape(character)
+        i += 1
+    return f"^{regex}$"
@@ -0,0 +1,41 @@
+import pytest
+
+import pydobe.buffers
+from benchmarks.mock_panel import MockPanel
+from benchmarks.model import build_project
+from pydobe.after_effects.objects.root import Root
+from pydobe.core import Connection
+
+
+@pytest.fixture
+def panel():
+    """A mock panel serving a small project: 2 folders holding 9 compositions of 5 layers and 9 footages"""
+    with MockPanel(build_project(items=20, layers=5, properties=2, folders=2)) as panel:
+        yield panel
+
+
+@pytest.fixture
+def connection(panel):
+    connection = Connection(port=panel.port)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def project(connection):
+    return Root(connection).app.project
+
+
+@pytest.fixture
+def comp(project):
+    return project.item_by_name("Comp 0001")
+
+
+@pytest.fixture(params=["numpy", "array"])
+def buffers(request, monkeypatch):
+    """Run the test with NumPy buffers, if NumPy is installed, and with array.array buffers"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pydobe.buffers, "numpy", None)
+    return request.param
@@ -0,0 +1,19 @@
+def test_transaction_queues_setters(panel, project, comp):
+    with project.transaction("Rename") as transaction:
+        comp.name = "Main"
+        requests = panel.stats.requests
+        project.bits_per_channel = 16
+        assert panel.stats.requests == requests
+    assert transaction.errors == []
+    assert comp.name == "Main"
+    assert panel.project._undo_steps[-1] == "Rename"
+
+
+def test_import_file_in_transaction(panel, project):
+    with project.transaction("Import") as transaction:
+        item = project.import_file("/footage/plate.mov")
+        item.name = "Plate"
+        assert item.name == "plate.mov"
+    assert transaction.errors == []
+    assert item.name == "Plate"
+    assert project.item_by_name("Plate") == item
@@ -0,0 +1,50 @@
+import asyncio
+
+from pydobe import aio
+from pydobe.batch import Batch
+from pydobe.core import ReadCache
+
+
+def test_read_cache_serves_repeated_reads(panel, connection, comp):
+    with ReadCache(connection=connection):
+        name = comp.name
+        requests = panel.stats.requests
+        assert comp.name == name
+        assert panel.stats.requests == requests
+
+
+def test_read_cache_drops_values_after_method_calls(connection, comp):
+    with ReadCache(connection=connection):
+        count = comp.num_layers
+        comp.layers.add_text("Title")
+        assert comp.num_layers == count + 1
+
+
+def test_read_cache_drops_values_after_assignments(connection, project, comp):
+    other = project.item_by_name("Comp 0002")
+    with ReadCache(connection=connection):
+        assert comp.name == "Comp 0001"
+        other.name = "Renamed"
+        assert other.name == "Renamed"
+        assert comp.name == "Comp 0001"
+
+
+def test_read_cache_drops_values_after_batches(connection, comp):
+    with ReadCache(connection=connection):
+        count = comp.num_layers
+        with Batch(connection) as batch:
+            batch.call(comp.layers, "add_shape")
+        assert comp.num_layers == count + 1
+
+
+def test_cache_reads_objects_check_the_revision(monkeypatch, comp):
+    monkeypatch.setattr(type(comp), "cache_reads", True)
+    count = comp.num_layers
+    comp.layers.add_null(1, duration_in_current_format=False)
+    assert comp.num_layers == count + 1
+
+
+def test_read_cache_within_aio_run(connection, comp):
+    with ReadCache(connection=connection):
+        name, width = asyncio.run(aio.run(lambda: (comp.name, comp.width)))
+        assert (name, width) == (comp.name, comp.width)
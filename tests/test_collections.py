@@ -0,0 +1,43 @@
+import pytest
+
+
+@pytest.fixture
+def small_chunks(monkeypatch, comp):
+    monkeypatch.setattr(type(comp.layers), "chunk_size", 2)
+
+
+def test_iteration_in_chunks(panel, comp, small_chunks):
+    requests = panel.stats.requests
+    names = [layer.name for layer in comp.layers]
+    assert len(names) == 5
+    # the collection, 3 chunks and the final length check, then the name of each layer
+    assert panel.stats.requests - requests == 5 + 5
+
+
+def test_iteration_stops_early(panel, comp, small_chunks):
+    layers = comp.layers
+    requests = panel.stats.requests
+    next(iter(layers))
+    # the length is read with the first chunk
+    assert panel.stats.requests - requests == 1
+
+
+def test_slices(comp):
+    names = [layer.name for layer in comp.layers]
+    assert [layer.name for layer in comp.layers[1:4]] == names[1:4]
+    assert [layer.name for layer in comp.layers[::-2]] == names[::-2]
+    assert comp.layers[-1].name == names[-1]
+
+
+@pytest.mark.parametrize("chunk_size", [2, 256])
+def test_collection_changing_size_while_iterated(monkeypatch, comp, chunk_size):
+    monkeypatch.setattr(type(comp.layers), "chunk_size", chunk_size)
+    with pytest.raises(RuntimeError, match="changed size"):
+        for layer in comp.layers:
+            comp.layers.add_text("Title")
+    with pytest.raises(RuntimeError, match="changed size"):
+        for layer in comp.layers:
+            layer.remove()
+    for layer in list(comp.layers):
+        layer.remove()
+    assert comp.num_layers == 0
@@ -0,0 +1,82 @@
+import asyncio
+import gc
+
+from pydobe import aio
+from pydobe.batch import Batch
+from pydobe.core import HandleArena, live_handles, release_handles
+from pydobe.handles import HandleTracker
+
+
+class Owner(object):
+    pass
+
+
+def test_handle_tracker():
+    tracker = HandleTracker(release_threshold=2)
+    first, second = Owner(), Owner()
+    tracker.track("a", first)
+    tracker.track("a", second)
+    tracker.track("b", first)
+    assert len(tracker) == 2
+    del first
+    gc.collect()
+    # "a" is still referenced by the second owner
+    assert len(tracker) == 1 and tracker.pending_count == 1
+    assert tracker.take_pending() == []
+    assert tracker.take_pending(force=True) == ["b"]
+    tracker.release(["a"])
+    assert len(tracker) == 0
+    assert tracker.take_pending(force=True) == ["a"]
+
+
+def test_handle_tracker_keeps_ids_coming_back():
+    tracker = HandleTracker()
+    tracker.track("a", Owner())
+    gc.collect()
+    assert tracker.pending_count == 1
+    owner = Owner()
+    tracker.track("a", owner)
+    assert tracker.pending_count == 0 and len(tracker) == 1
+
+
+def test_release_handles(panel, connection, project):
+    items = list(project.items)
+    assert len(panel.handles) >= len(items)
+    del items
+    gc.collect()
+    release_handles(connection)
+    assert set(panel.handles) == {project.pydobe_id}
+    assert live_handles(connection) == 1
+
+
+def test_handle_arena(panel, connection, project):
+    with HandleArena(connection):
+        names = [item.name for item in project.items]
+    assert len(names) == 20
+    assert project.pydobe_id in panel.handles
+    assert len(panel.handles) == 1
+
+
+def read_and_release(obj):
+    name = obj.name
+    obj.release()
+    return name
+
+
+def test_release_within_aio_run(panel, project):
+    comp = project.item_by_name("Comp 0001")
+    requests = panel.stats.requests
+    name = asyncio.run(aio.run(lambda: read_and_release(comp)))
+    assert name == "Comp 0001"
+    assert panel.stats.requests - requests == 1
+    assert comp.pydobe_id is None
+
+
+def test_release_within_batch(panel, connection, project):
+    comp = project.item_by_name("Comp 0001")
+    requests = panel.stats.requests
+    with Batch(connection) as batch:
+        name = batch.defer(lambda: read_and_release(comp))
+    assert name.result() == "Comp 0001"
+    assert panel.stats.requests - requests == 1
+    assert comp.pydobe_id is None
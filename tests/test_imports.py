@@ -0,0 +1,31 @@
+from pydobe.after_effects.imports import check_import_paths, is_sequence
+
+
+def test_import_files(tmp_path, project):
+    plate = tmp_path / "plate.mov"
+    plate.write_bytes(b"")
+    results = project.import_files([plate, tmp_path / "missing.mov"])
+    assert results[0].ok and results[0].item.name == "plate.mov"
+    assert type(results[0].item).__name__ == "FootageItem"
+    assert not results[1].ok and results[1].item is None
+
+
+def test_check_import_paths(tmp_path):
+    for name in ("shot.0001.exr", "shot.0002.exr", "shot.01.exr", "plate.0001.exr"):
+        (tmp_path / name).write_bytes(b"")
+    paths = [
+        str(tmp_path / name)
+        for name in ("shot.0001.exr", "shot.01.exr", "plate.0001.exr", "missing.exr")
+    ]
+    results = check_import_paths(paths)
+    assert [result.sequence for result in results[:3]] == [True, False, False]
+    assert not results[3].ok
+    assert all(result.sequence for result in check_import_paths(paths[:3], True))
+
+
+def test_is_sequence():
+    names = ["shot.0001.exr", "shot.0002.exr", "shot.01.exr"]
+    assert is_sequence("shot.0001.exr", names)
+    assert not is_sequence("shot.01.exr", names)
+    assert is_sequence("shot.0003.exr", names)
+    assert not is_sequence("plate.mov", names)
@@ -0,0 +1,54 @@
+import array
+
+import pytest
+
+from pydobe.buffers import to_list
+
+TIMES = [0.0, 1.0, 2.0]
+POSITIONS = [[0.0, 0.0, 0.0], [10.0, 20.0, 0.0], [30.0, 40.0, 0.0]]
+
+
+@pytest.fixture
+def position(comp):
+    return comp.layers[0].position
+
+
+def test_keyframes_round_trip(buffers, position):
+    assert position.set_keyframes(TIMES, POSITIONS) == 3
+    keyframes = position.get_keyframes()
+    assert keyframes.dimensions == 3
+    assert isinstance(keyframes.values, array.array) == (buffers == "array")
+    assert [(time, list(value)) for time, value in keyframes] == list(
+        zip(TIMES, POSITIONS)
+    )
+
+
+def test_keyframes_written_back(buffers, position):
+    position.set_keyframes(TIMES, POSITIONS)
+    keyframes = position.get_keyframes()
+    assert position.set_keyframes(keyframes.times, keyframes.values) == 3
+    assert [list(value) for _, value in position.get_keyframes()] == POSITIONS
+
+
+def test_one_dimensional_keyframes(buffers, comp):
+    opacity = comp.layers[0].opacity
+    opacity.set_keyframes(TIMES, [0, 50, 100])
+    assert list(opacity.get_keyframes()) == [(0.0, 0.0), (1.0, 50.0), (2.0, 100.0)]
+
+
+def test_keyframes_count_mismatch(position):
+    with pytest.raises(ValueError):
+        position.set_keyframes(TIMES, POSITIONS[:2])
+
+
+def test_nested_numpy_arrays():
+    numpy = pytest.importorskip("numpy")
+    values = [numpy.array([1.0, 2.0]), (numpy.float64(3.0), 4.0)]
+    assert to_list(values) == [[1.0, 2.0], [3.0, 4.0]]
+    assert to_list(numpy.array(TIMES)) == TIMES
+
+
+def test_numpy_keyframes_written(position):
+    numpy = pytest.importorskip("numpy")
+    position.set_keyframes(numpy.array(TIMES), [numpy.array(row) for row in POSITIONS])
+    assert [list(value) for _, value in position.get_keyframes()] == POSITIONS
@@ -0,0 +1,49 @@
+import pytest
+
+from pydobe.after_effects.layer_specs import layer_spec_entry
+
+
+def test_layer_spec_entry():
+    entry = layer_spec_entry(
+        {"solid": "Background", "color": "#ff0000", "in_point": 1, "start_time": 2}
+    )
+    assert entry["kind"] == "solid"
+    assert entry["color"] == [255, 0, 0]
+    assert entry["attributes"] == [["startTime", 2], ["inPoint", 1]]
+    with pytest.raises(ValueError):
+        layer_spec_entry({"null": True, "text": "Title"})
+    with pytest.raises(ValueError):
+        layer_spec_entry({"null": True, "colour": "#ff0000"})
+
+
+def test_add_many(comp):
+    count = comp.num_layers
+    layers = comp.layers.add_many(
+        [{"null": True, "name": "Controller"}, {"text": "Title"}, {"shape": True}]
+    )
+    assert [type(layer).__name__ for layer in layers] == [
+        "AVLayer",
+        "TextLayer",
+        "ShapeLayer",
+    ]
+    assert layers[0].name == "Controller"
+    assert comp.num_layers == count + 3
+
+
+def test_add_many_keeps_in_and_out_points(panel, comp):
+    comp.layers.add_many(
+        [{"null": True, "in_point": 2, "out_point": 5, "start_time": 1, "stretch": 200}]
+    )
+    # new layers are added at the top of the composition
+    model = panel.project.activeItem._layers[0]
+    assert (model.inPoint, model.outPoint) == (2, 5)
+    assert (model.startTime, model.stretch) == (1, 200)
+
+
+def test_add_many_adds_nothing_when_a_spec_fails(comp):
+    count = comp.num_layers
+    with pytest.raises(RuntimeError, match="spec 2"):
+        comp.layers.add_many(
+            [{"null": True}, {"text": "Title"}, {"shape": True, "audio_enabled": True}]
+        )
+    assert comp.num_layers == count
@@ -0,0 +1,37 @@
+import shutil
+import subprocess
+
+import pytest
+
+import pydobe.after_effects.imports
+import pydobe.after_effects.keyframes
+import pydobe.after_effects.layer_specs
+import pydobe.after_effects.property_tree
+import pydobe.after_effects.queries
+import pydobe.after_effects.sampling
+import pydobe.after_effects.snapshot
+import pydobe.handles
+from pydobe.library import library
+
+# the mock panel answers the library with Python rewrites, node checks the syntax of the ExtendScript
+NODE = shutil.which("node")
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+
+def check_syntax(tmp_path, script: str):
+    path = tmp_path / "script.js"
+    path.write_text(script, encoding="utf-8")
+    result = subprocess.run(
+        [NODE, "--check", str(path)], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("name", sorted(library._functions))
+def test_library_function_syntax(tmp_path, name):
+    check_syntax(tmp_path, f"var function_ = {library._functions[name]};")
+
+
+def test_install_script_syntax(tmp_path):
+    check_syntax(tmp_path, library.install_script())
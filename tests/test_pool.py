@@ -0,0 +1,22 @@
+import socket
+
+from pydobe.core import Transport
+from pydobe.pool import discover_connections
+
+
+def test_discover_connections_closes_the_others(monkeypatch, panel):
+    closed = []
+    close = Transport.close
+
+    def record_close(transport):
+        closed.append(transport)
+        close(transport)
+
+    monkeypatch.setattr(Transport, "close", record_close)
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        free_port = unused.getsockname()[1]
+    connections = discover_connections("127.0.0.1", [panel.port, free_port], 0.5)
+    assert [connection.port for connection in connections] == [panel.port]
+    assert len(closed) == 1
+    connections[0].close()
@@ -0,0 +1,63 @@
+import pytest
+
+from pydobe.after_effects.property_tree import build_property_tree
+
+BLUR = "ADBE Effect Parade/ADBE Gaussian Blur 2"
+
+
+def row(parent, index, is_group, match_name, value=None):
+    return [parent, index, is_group, match_name, match_name, True, 0, "", False, value]
+
+
+def test_build_property_tree():
+    tree = build_property_tree(
+        [
+            row(-1, 1, True, "ADBE Effect Parade"),
+            row(0, 1, True, "ADBE Gaussian Blur 2"),
+            row(1, 1, False, "ADBE Gaussian Blur 2-0001", 5.0),
+            row(0, 2, True, "ADBE Gaussian Blur 2"),
+            row(3, 1, False, "ADBE Gaussian Blur 2-0001", 8.0),
+        ]
+    )
+    assert len(tree) == 5
+    assert "ADBE Gaussian Blur 2#2" in tree
+    assert tree["ADBE Gaussian Blur 2/ADBE Gaussian Blur 2-0001"].value == 5.0
+    second = tree["/ADBE Gaussian Blur 2#2/ADBE Gaussian Blur 2-0001"]
+    assert second.value == 8.0
+    assert second.parent.parent is tree.root
+    assert [record.value for record in tree.properties()] == [5.0, 8.0]
+    assert [record.index for record in tree.root] == [1, 2]
+
+
+def test_dump(comp):
+    tree = comp.layers[0].dump()
+    position = tree["ADBE Transform Group/ADBE Position"]
+    assert not position.is_group
+    assert position.name == "Position"
+    assert position.value == [960, 540, 0]
+    assert tree[f"{BLUR}/ADBE Gaussian Blur 2-0002"].value == 2
+    assert len(tree.properties()) == 7
+
+
+def test_dump_depth_and_values(comp):
+    tree = comp.layers[0].dump(depth=1, include_values=False)
+    assert sorted(tree.paths) == ["", "ADBE Effect Parade", "ADBE Transform Group"]
+    position = comp.layers[0].dump(include_values=False)[
+        "ADBE Transform Group/ADBE Position"
+    ]
+    assert position.value is None
+
+
+def test_property_at(panel, comp):
+    layer = comp.layers[0]
+    prop = layer.property_at(f"{BLUR}/ADBE Gaussian Blur 2-0001")
+    assert prop.value == 1
+    assert layer.property_at("Transform/Opacity").value == 100
+    requests = panel.stats.requests
+    assert layer.property_at(f"/{BLUR}/ADBE Gaussian Blur 2-0001/") is prop
+    assert panel.stats.requests == requests
+
+
+def test_property_at_missing(comp):
+    with pytest.raises(LookupError, match="ADBE Effect Parade/Missing"):
+        comp.layers[0].property_at("ADBE Effect Parade/Missing/Other")
@@ -0,0 +1,78 @@
+import pytest
+
+from benchmarks.model import build_project
+from pydobe.after_effects.objects.root import Root
+from pydobe.after_effects.queries import ItemIndex
+
+ROOT = 1
+ROWS = [
+    [2, "Footage", ROOT, "FolderItem"],
+    [3, "Plates", 2, "FolderItem"],
+    [4, "shot_010", 3, "FootageItem"],
+    [5, "shot_010", ROOT, "CompItem"],
+    [6, "shot_020", 3, "FootageItem"],
+]
+
+
+def test_item_index():
+    index = ItemIndex(7, ROOT, ROWS)
+    assert len(index) == 5
+    assert 4 in index and ROOT not in index
+    assert index.ids_by_name("shot_010") == [4, 5]
+    assert index.ids_by_name("shot_010", 3) == [4]
+    assert index.ids_by_name("missing") == []
+    assert index.path(6) == "Footage/Plates/shot_020"
+    assert index.id_by_path("/Footage/Plates/shot_010") == 4
+    assert index.id_by_path("shot_010") == 5
+    assert index.id_by_path("Footage/missing") is None
+
+
+def test_item_by_name(project):
+    item = project.item_by_name("Footage 0003")
+    assert item.name == "Footage 0003"
+    assert item.object_type == "FootageItem"
+    with pytest.raises(LookupError):
+        project.item_by_name("missing")
+
+
+def test_item_by_path_and_folder(project):
+    item = project.item_by_path("Folder 01/Comp 0001")
+    assert item.name == "Comp 0001"
+    assert project.items_by_name("Comp 0001", "Folder 02") == []
+    assert project.items_by_name("Comp 0001", "Folder 01") == [item]
+
+
+def test_item_index_shared_by_project_objects(panel, connection):
+    app = Root(connection).app
+    app.project.item_by_name("Comp 0001")
+    requests = panel.stats.requests
+    app.project.item_by_name("Comp 0002")
+    # reading app.project, then looking the item up, without building the index again
+    assert panel.stats.requests - requests == 2
+
+
+def test_item_index_rebuilt_for_another_project(panel, connection, project):
+    project.item_by_name("Comp 0001")
+    other = build_project(items=20, layers=5, properties=2, folders=0)
+    other.revision = panel.project.revision
+    panel.open_project(other)
+    project = Root(connection).app.project
+    assert project.item_by_name("Comp 0001").id == other._items[0].id
+    with pytest.raises(LookupError):
+        project.item_by_path("Folder 01/Comp 0001")
+
+
+def test_item_index_rebuilt_after_changes(project):
+    project.item_by_name("Comp 0001").name = "Main"
+    assert project.item_by_name("Main").name == "Main"
+    with pytest.raises(LookupError):
+        project.item_by_name("Comp 0001")
+
+
+def test_item_by_id(panel, project):
+    item = project.item_by_name("Comp 0003")
+    requests = panel.stats.requests
+    assert project.item_by_id(item.id) == item
+    assert panel.stats.requests - requests == 2
+    with pytest.raises(LookupError):
+        project.item_by_id(123456)
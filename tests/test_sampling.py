@@ -0,0 +1,19 @@
+import pytest
+
+
+def test_sample(buffers, comp):
+    layer = comp.layers[0]
+    layer.opacity.set_keyframes([0, 1], [0, 100])
+    samples = layer.sample(0, 1, 0.5, properties=("position", "opacity"))
+    assert samples.shape == (3, 2, 3)
+    assert samples.value(1, "opacity") == 50
+    assert samples.value(2, "position") == (960, 540, 0)
+    samples = comp.sample(0, 1, 1, properties=("opacity",))
+    assert samples.shape == (2, 5, 1)
+    assert samples.properties[0] == (1, "opacity")
+    assert samples.properties[-1] == (5, "opacity")
+
+
+def test_sample_without_properties(comp):
+    with pytest.raises(ValueError):
+        comp.sample(0, 1, 0.5, properties=())
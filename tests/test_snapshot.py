@@ -0,0 +1,60 @@
+import pytest
+
+from pydobe.after_effects.snapshot import build_snapshot, to_extend_name
+
+PAYLOAD = {
+    "revision": 12,
+    "rootId": 1,
+    "items": [
+        [2, "FolderItem", "Footage", 1, None],
+        [3, "FootageItem", "plate", 2, 1920],
+        [4, "CompItem", "Main", 1, 1280],
+    ],
+    "layers": [[4, 1, "AVLayer", "plate", 3], [4, 2, "TextLayer", "Title", None]],
+}
+
+
+def test_build_snapshot():
+    snapshot = build_snapshot(PAYLOAD, ("width",), ("source",))
+    assert snapshot.revision == 12
+    assert len(snapshot) == 3
+    footage, plate, main = snapshot.folders[0], snapshot.items[3], snapshot.items[4]
+    assert snapshot.root.children == (footage, main)
+    assert footage.children == (plate,)
+    assert plate.parent is footage and main.parent is snapshot.root
+    assert plate.width == 1920
+    assert [layer.name for layer in main.layers] == ["plate", "Title"]
+    assert snapshot.layers[(4, 1)].source == 3
+    assert snapshot.layers[(4, 2)].comp is main
+    assert snapshot.items_by_name("plate") == [plate]
+    assert main.as_dict() == {
+        "id": 4,
+        "object_type": "CompItem",
+        "name": "Main",
+        "parent_id": 1,
+        "width": 1280,
+    }
+
+
+def test_snapshot_records_are_read_only():
+    plate = build_snapshot(PAYLOAD, ("width",), ()).items[3]
+    with pytest.raises(AttributeError):
+        plate.name = "other"
+    with pytest.raises(AttributeError):
+        plate.height
+
+
+def test_to_extend_name():
+    assert to_extend_name("frame_rate") == "frameRate"
+    assert to_extend_name("three_d_layer") == "threeDLayer"
+    assert to_extend_name("name") == "name"
+
+
+def test_project_snapshot(project):
+    snapshot = project.snapshot(fields=("width",), layer_fields=("enabled",))
+    assert len(snapshot) == 20
+    assert len(snapshot.compositions) == 9
+    assert len(snapshot.folders) == 2
+    main = snapshot.items_by_name("Comp 0001")[0]
+    assert main.parent.name == "Folder 01"
+    assert len(main.layers) == 5
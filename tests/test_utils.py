@@ -0,0 +1,22 @@
+import re
+
+import pytest
+
+from pydobe.utils import glob_to_regex
+
+
+@pytest.mark.parametrize(
+    "pattern, matching, other",
+    [
+        ("shot_*", "shot_010", "plate_010"),
+        ("shot_0?0", "shot_010", "shot_0100"),
+        ("shot_[0-1]10", "shot_110", "shot_210"),
+        ("shot_[!0]10", "shot_110", "shot_010"),
+        ("a.b+c", "a.b+c", "aXbbc"),
+        ("[]]", "]", "["),
+    ],
+)
+def test_glob_to_regex(pattern, matching, other):
+    regex = re.compile(glob_to_regex(pattern))
+    assert regex.match(matching)
+    assert not regex.match(other)